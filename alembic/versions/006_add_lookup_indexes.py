@@ -0,0 +1,29 @@
+"""Add composite indexes for per-project / per-scene ordered lookups.
+
+Revision ID: 006_lookup_indexes
+Revises: 005_caption_position
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "006_lookup_indexes"
+down_revision: Union[str, None] = "005_caption_position"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_scenes_project_order", "scenes", ["project_id", "order"], unique=False)
+    op.create_index("ix_images_scene_created", "images", ["scene_id", "created_at"], unique=False)
+    op.create_index("ix_videos_project_created", "videos", ["project_id", "created_at"], unique=False)
+    op.create_index("ix_voiceovers_project_created", "voiceovers", ["project_id", "created_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_voiceovers_project_created", table_name="voiceovers")
+    op.drop_index("ix_videos_project_created", table_name="videos")
+    op.drop_index("ix_images_scene_created", table_name="images")
+    op.drop_index("ix_scenes_project_order", table_name="scenes")
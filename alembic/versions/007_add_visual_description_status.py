@@ -0,0 +1,24 @@
+"""Add status to visual_descriptions (descriptions are now generated by a Celery worker).
+
+Revision ID: 007_visual_description_status
+Revises: 006_lookup_indexes
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "007_visual_description_status"
+down_revision: Union[str, None] = "006_lookup_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("visual_descriptions", sa.Column("status", sa.String(), server_default="ready", nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("visual_descriptions", "status")
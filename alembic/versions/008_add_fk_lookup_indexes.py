@@ -0,0 +1,29 @@
+"""Add indexes for script iteration / visual description history and style foreign keys.
+
+Revision ID: 008_fk_lookup_indexes
+Revises: 007_visual_description_status
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "008_fk_lookup_indexes"
+down_revision: Union[str, None] = "007_visual_description_status"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_script_iterations_project_round", "script_iterations", ["project_id", "round_number"], unique=False)
+    op.create_index("ix_visual_descriptions_scene_created", "visual_descriptions", ["scene_id", "created_at"], unique=False)
+    op.create_index("ix_scenes_scene_style_id", "scenes", ["scene_style_id"], unique=False)
+    op.create_index("ix_images_visual_style_id", "images", ["visual_style_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_images_visual_style_id", table_name="images")
+    op.drop_index("ix_scenes_scene_style_id", table_name="scenes")
+    op.drop_index("ix_visual_descriptions_scene_created", table_name="visual_descriptions")
+    op.drop_index("ix_script_iterations_project_round", table_name="script_iterations")
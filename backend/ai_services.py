@@ -4,12 +4,21 @@ AI service integrations for script segmentation, image generation, and video cre
 
 import os
 import json
+import functools
+import logging
+import shutil
+import subprocess
+import tempfile
 from openai import OpenAI
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional, Sequence
 import requests
 from dotenv import load_dotenv
+from .fs_fast import fast_copy
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Script generation/iteration: supported models (id is API model id)
 SCRIPT_AI_MODELS = [
     # Latest GPT (frontier)
@@ -77,17 +86,18 @@ def generate_script(
     Returns the generated script text. model: e.g. gpt-4, gpt-4o, claude-opus-4-6.
     """
     model_id = (model or "gpt-4").strip()
-    prompt = f"""You are a professional scriptwriter. Generate a complete video script based on the following.
-
-Project title: {title or 'Untitled'}
-
-Short description of what the script should be about:
-{description or 'No specific description provided.'}
+    # The script prompt's instructions are shared by every project that uses it: send them first, as
+    # the system message, so providers' prompt caches can reuse that prefix across requests
+    system_content = f"""You are a professional scriptwriter. Generate a complete video script from the project the user describes.
 
 Style and instructions for the script (tone, structure, format):
 {script_prompt_instructions}
 
 Write a full script that is ready for video production. Use clear scene descriptions and dialogue where appropriate. Output only the script text, no meta-commentary."""
+    user_content = f"""Project title: {title or 'Untitled'}
+
+Short description of what the script should be about:
+{description or 'No specific description provided.'}"""
 
     try:
         if _is_claude_model(model_id):
@@ -95,19 +105,24 @@ Write a full script that is ready for video production. Use clear scene descript
             response = client.messages.create(
                 model=model_id,
                 max_tokens=8192,
-                messages=[{"role": "user", "content": prompt}],
+                # Anthropic only caches blocks marked explicitly (and only from ~1024 tokens up)
+                system=[{"type": "text", "text": system_content, "cache_control": {"type": "ephemeral"}}],
+                messages=[{"role": "user", "content": user_content}],
             )
             text = response.content[0].text if response.content else ""
             return text.strip()
         client = get_openai_client()
         response = client.chat.completions.create(
             model=model_id,
-            messages=[{"role": "user", "content": prompt}],
+            messages=[
+                {"role": "system", "content": system_content},
+                {"role": "user", "content": user_content},
+            ],
             temperature=0.7,
         )
         return (response.choices[0].message.content or "").strip()
     except Exception as e:
-        print(f"Error generating script: {e}")
+        logger.error("Error generating script: %s", e)
         raise
 
 
@@ -167,7 +182,7 @@ Revise the script according to the new feedback. Output only the full revised sc
         )
         return (response.choices[0].message.content or "").strip()
     except Exception as e:
-        print(f"Error revising script: {e}")
+        logger.error("Error revising script: %s", e)
         raise
 
 
@@ -242,13 +257,13 @@ def segment_script(script_content: str) -> List[Dict[str, str]]:
         
         return scenes
     except json.JSONDecodeError as e:
-        print(f"Error parsing JSON from OpenAI response: {e}")
-        print(f"Response content: {content[:500] if 'content' in locals() else 'N/A'}")
+        logger.error("Error parsing JSON from OpenAI response: %s", e)
+        logger.error("Response content: %s", content[:500] if 'content' in locals() else 'N/A')
         # Fallback: split by paragraphs
         paragraphs = [p.strip() for p in script_content.split("\n\n") if p.strip()]
         return [{"text": p, "order": i + 1} for i, p in enumerate(paragraphs)]
     except Exception as e:
-        print(f"Error segmenting script: {e}")
+        logger.error("Error segmenting script: %s", e)
         # Fallback: split by paragraphs
         paragraphs = [p.strip() for p in script_content.split("\n\n") if p.strip()]
         return [{"text": p, "order": i + 1} for i, p in enumerate(paragraphs)]
@@ -301,13 +316,9 @@ Use the previous scene description as context. The new scene should feel like a
     if instruction:
         instruction_block = f"\n\nAdditional instruction (follow this):\n{instruction}"
     
+    # Fixed instructions and the scene style (the same for every scene in a project) come first, so the
+    # prompt shares a stable prefix across scenes; the per-scene text follows
     prompt = f"""CRITICAL: Your response MUST be under 800 characters. Be concise—prioritize the most important visual elements.
-{previous_instruction}
-
-New scene text:
-{scene_text}
-{style_instruction if style_instruction else ''}
-{instruction_block}
 
 Generate a vivid scene description with these labels (keep each section brief):
 - Characters: Who is in the scene and key actions/expressions
@@ -316,18 +327,17 @@ Generate a vivid scene description with these labels (keep each section brief):
 - Main emotion / atmosphere: Mood in a few words
 - Lighting and mood: Brief lighting note
 - Camera angle/perspective: One phrase
+{style_instruction if style_instruction else ''}
+{previous_instruction}
+
+New scene text:
+{scene_text}
+{instruction_block}
 
 Return ONLY the scene description, no explanation. Stay under 800 characters."""
 
     try:
-        print("\n" + "=" * 60)
-        print("SCENE DESCRIPTION GENERATION PROMPT:")
-        print("=" * 60)
-        print("System:", "You are a visual director. Generate a concise scene description. STRICT LIMIT: under 800 characters.")
-        print("-" * 60)
-        print("User prompt:")
-        print(prompt)
-        print("=" * 60 + "\n")
+        logger.debug("Scene description generation prompt:\n%s", prompt)
 
         client = get_openai_client()
         response = client.chat.completions.create(
@@ -347,11 +357,11 @@ Return ONLY the scene description, no explanation. Stay under 800 characters."""
         if len(result) > SCENE_DESCRIPTION_MAX_CHARS:
             orig_len = len(result)
             result = result[:SCENE_DESCRIPTION_MAX_CHARS - 3] + "..."
-            print(f"[WORKFLOW] Scene description truncated from {orig_len} to {SCENE_DESCRIPTION_MAX_CHARS} chars")
-        print(result)
+            logger.info("[WORKFLOW] Scene description truncated from %d to %d chars", orig_len, SCENE_DESCRIPTION_MAX_CHARS)
+        logger.debug("Scene description: %s", result)
         return result
     except Exception as e:
-        print(f"Error generating scene description: {e}")
+        logger.error("Error generating scene description: %s", e)
         # Fallback: return a simple description
         return f"Visual scene based on: {scene_text[:100]}..."
 
@@ -386,10 +396,10 @@ Generate an updated scene description that incorporates the feedback. Keep the s
         if len(result) > SCENE_DESCRIPTION_MAX_CHARS:
             orig_len = len(result)
             result = result[:SCENE_DESCRIPTION_MAX_CHARS - 3] + "..."
-            print(f"[WORKFLOW] Iterated description truncated from {orig_len} to {SCENE_DESCRIPTION_MAX_CHARS} chars")
+            logger.info("[WORKFLOW] Iterated description truncated from %d to %d chars", orig_len, SCENE_DESCRIPTION_MAX_CHARS)
         return result
     except Exception as e:
-        print(f"Error iterating scene description: {e}")
+        logger.error("Error iterating scene description: %s", e)
         raise
 
 
@@ -397,7 +407,10 @@ def generate_image_prompt(scene_description: str, visual_style_description: str
     """
     Combines scene description and visual style into an image generation prompt. No LLM call.
     """
-    print(f"[WORKFLOW] 18. prompt: scene_description len={len(scene_description or '')} visual_style_description={visual_style_description is not None} visual_style_params={visual_style_params is not None}")
+    logger.info(
+        "[WORKFLOW] 18. prompt: scene_description len=%d visual_style_description=%s visual_style_params=%s",
+        len(scene_description or ''), visual_style_description is not None, visual_style_params is not None,
+    )
     parts = [(scene_description or "").strip()]
     if visual_style_description:
         parts.append(visual_style_description.strip())
@@ -425,7 +438,7 @@ def generate_image_prompt(scene_description: str, visual_style_description: str
         except Exception:
             parts.append(str(visual_style_params))
     result = " ".join(p for p in parts if p)
-    print(f"[WORKFLOW] 19. prompt: result len={len(result)} first 200 chars: {result[:200] if result else 'empty'}...")
+    logger.info("[WORKFLOW] 19. prompt: result len=%d first 200 chars: %s...", len(result), result[:200] if result else 'empty')
     return result if result else "Cinematic scene"
 
 def generate_image_with_leonardo(prompt: str, output_path: str, reference_image_path: Optional[str] = None, model_id: Optional[str] = None) -> str:
@@ -435,7 +448,7 @@ def generate_image_with_leonardo(prompt: str, output_path: str, reference_image_
     If model_id is provided, uses that model instead of the default.
     Returns file path to the saved image.
     """
-    print(f"[WORKFLOW] 20. Leonardo: starting prompt len={len(prompt)} model_id={model_id} ref_image={reference_image_path}")
+    logger.info("[WORKFLOW] 20. Leonardo: starting prompt len=%d model_id=%s ref_image=%s", len(prompt), model_id, reference_image_path)
     import time
     api_key = os.getenv("LEONARDO_API_KEY")
     if not api_key:
@@ -475,7 +488,7 @@ def generate_image_with_leonardo(prompt: str, output_path: str, reference_image_
         with open(reference_image_path, "rb") as f:
             files = {"file": (os.path.basename(reference_image_path), f)}
             upload_resp = requests.post(upload_url, data=fields, files=files, timeout=60)
-        print("Leonardo: Reference image uploaded: %s" % upload_resp.status_code)
+        logger.info("Leonardo: Reference image uploaded: %s", upload_resp.status_code)
 
     # Determine the model and which API version to use
     effective_model = model_id or os.getenv("LEONARDO_MODEL_ID", "6bef9f1b-6297-4702-9b67-0be5ca70c96f")
@@ -521,8 +534,8 @@ def generate_image_with_leonardo(prompt: str, output_path: str, reference_image_
             payload["init_strength"] = 0.5
         api_url = "https://cloud.leonardo.ai/api/rest/v1/generations"
 
-    print("Leonardo: Using %s API with model: %s" % ("v2" if is_v2 else "v1", effective_model))
-    print("Leonardo: Prompt (first 200 chars): %s" % prompt[:200])
+    logger.info("Leonardo: Using %s API with model: %s", "v2" if is_v2 else "v1", effective_model)
+    logger.info("Leonardo: Prompt (first 200 chars): %s", prompt[:200])
 
     gen_resp = requests.post(
         api_url,
@@ -532,8 +545,8 @@ def generate_image_with_leonardo(prompt: str, output_path: str, reference_image_
     )
 
     # Log the full response before raising
-    print("Leonardo: Generation response status: %s" % gen_resp.status_code)
-    print("Leonardo: Generation response body: %s" % gen_resp.text[:1000])
+    logger.info("Leonardo: Generation response status: %s", gen_resp.status_code)
+    logger.debug("Leonardo: Generation response body: %s", gen_resp.text[:1000])
 
     if gen_resp.status_code != 200:
         raise ValueError("Leonardo API returned %s: %s" % (gen_resp.status_code, gen_resp.text[:500]))
@@ -605,11 +618,11 @@ def generate_image_with_leonardo(prompt: str, output_path: str, reference_image_
                 if isinstance(gen_obj, list):
                     gen_obj = gen_obj[0] if gen_obj else {}
                 generated_images = gen_obj.get("generated_images", []) if isinstance(gen_obj, dict) else []
-        except Exception as e:
-            import traceback
-            print("Leonardo: Error parsing status response. Raw type: %s" % type(raw_data))
-            print("Leonardo: Raw response (truncated): %s" % str(raw_data)[:800])
-            print("Leonardo: Traceback: %s" % traceback.format_exc())
+        except Exception:
+            logger.exception(
+                "Leonardo: Error parsing status response. Raw type: %s, raw response (truncated): %s",
+                type(raw_data), str(raw_data)[:800],
+            )
             raise
 
         if generated_images:
@@ -626,7 +639,7 @@ def generate_image_with_leonardo(prompt: str, output_path: str, reference_image_
                 os.makedirs(os.path.dirname(output_path), exist_ok=True)
                 with open(output_path, "wb") as f:
                     f.write(img_resp.content)
-                print("Leonardo: Image saved to %s" % output_path)
+                logger.info("Leonardo: Image saved to %s", output_path)
                 return output_path
 
         status = None
@@ -647,7 +660,7 @@ def generate_image_with_leonardo(prompt: str, output_path: str, reference_image_
                 err = status_data.get("error", "Unknown error")
             raise Exception("Leonardo generation failed: %s" % err)
         if attempt % 6 == 0:
-            print("Leonardo: Waiting for generation... (%ss)" % (attempt * 5))
+            logger.info("Leonardo: Waiting for generation... (%ss)", attempt * 5)
 
     raise TimeoutError("Leonardo image generation timed out. Generation ID: %s" % generation_id)
 
@@ -726,8 +739,10 @@ def generate_full_script_speech(
     if language_code:
         payload["language_code"] = language_code
 
-    print(f"[TTS] Calling ElevenLabs with-timestamps, voice={voice_id}, model={model_id}, "
-          f"speed={speed}, stability={stability}, text length={len(full_text)}")
+    logger.info(
+        "[TTS] Calling ElevenLabs with-timestamps, voice=%s, model=%s, speed=%s, stability=%s, text length=%d",
+        voice_id, model_id, speed, stability, len(full_text),
+    )
     resp = requests.post(url, json=payload, headers=headers, timeout=300)
     if resp.status_code != 200:
         raise ValueError(f"ElevenLabs API error {resp.status_code}: {resp.text[:500]}")
@@ -746,13 +761,13 @@ def generate_full_script_speech(
     with open(output_audio_path, "wb") as f:
         f.write(audio_bytes)
 
-    print(f"[TTS] Audio saved to {output_audio_path} ({len(audio_bytes)} bytes)")
-    print(f"[TTS] Alignment: {len(alignment.get('characters', []))} characters")
+    logger.info("[TTS] Audio saved to %s (%d bytes)", output_audio_path, len(audio_bytes))
+    logger.info("[TTS] Alignment: %d characters", len(alignment.get('characters', [])))
 
     return alignment
 
 
-def compute_scene_timings(scene_texts: List[str], scene_ids: List[int], alignment: dict) -> List[dict]:
+def compute_scene_timings(scene_texts: Sequence[str], scene_ids: Sequence[int], alignment: dict) -> List[dict]:
     """
     Map scene text boundaries to audio timestamps using character offsets.
     Returns list of timing dicts: [{scene_id, start_time, end_time, transition_type, transition_duration}, ...]
@@ -760,32 +775,31 @@ def compute_scene_timings(scene_texts: List[str], scene_ids: List[int], alignmen
     char_start_times = alignment["character_start_times_seconds"]
     char_end_times = alignment["character_end_times_seconds"]
 
-    full_text = ""
-    scene_char_ranges = []
-    for text in scene_texts:
-        start = len(full_text)
-        full_text += text
-        end_idx = len(full_text) - 1
-        scene_char_ranges.append((start, end_idx))
-        full_text += " "
-
+    # Scenes are joined with one space (as in the TTS input); only the offsets are needed, not the text
     scene_timings = []
-    for i, (char_start, char_end) in enumerate(scene_char_ranges):
+    offset = 0
+    for scene_id, text in zip(scene_ids, scene_texts):
+        char_start, char_end = offset, offset + len(text) - 1
+        offset += len(text) + 1
         clamped_start = min(char_start, len(char_start_times) - 1)
         clamped_end = min(char_end, len(char_end_times) - 1)
         start_time = char_start_times[clamped_start]
         end_time = char_end_times[clamped_end]
         scene_timings.append({
-            "scene_id": scene_ids[i],
+            "scene_id": scene_id,
             "start_time": round(start_time, 3),
             "end_time": round(end_time, 3),
             "transition_type": "cut",
             "transition_duration": 0.0,
         })
 
-    print(f"[TTS] Computed timings for {len(scene_timings)} scenes")
-    for t in scene_timings:
-        print(f"  Scene {t['scene_id']}: {t['start_time']:.2f}s - {t['end_time']:.2f}s ({t['end_time']-t['start_time']:.2f}s)")
+    logger.info("[TTS] Computed timings for %d scenes", len(scene_timings))
+    if logger.isEnabledFor(logging.DEBUG):
+        for t in scene_timings:
+            logger.debug(
+                "  Scene %s: %.2fs - %.2fs (%.2fs)",
+                t['scene_id'], t['start_time'], t['end_time'], t['end_time'] - t['start_time'],
+            )
 
     return scene_timings
 
@@ -862,19 +876,25 @@ Words: {numbered}"""
             if token.isdigit():
                 boundaries.append(int(token))
         boundaries = sorted(set(b for b in boundaries if 0 < b < len(words)))
-        print(f"[AUTO-GROUP] LLM returned {len(boundaries)} boundaries for {len(words)} words")
+        logger.info("[AUTO-GROUP] LLM returned %d boundaries for %d words", len(boundaries), len(words))
         return boundaries
     except Exception as e:
-        print(f"[AUTO-GROUP] LLM error, falling back to default: {e}")
+        logger.warning("[AUTO-GROUP] LLM error, falling back to default: %s", e)
         return list(range(5, len(words), 5))
 
 
+@functools.lru_cache(maxsize=8192)
+def _format_ass_time_cs(centiseconds: int) -> str:
+    """Format integer centiseconds to ASS timestamp H:MM:SS.cc (cached: caption boundaries repeat)"""
+    h, rem = divmod(centiseconds, 360000)
+    m, rem = divmod(rem, 6000)
+    s, cs = divmod(rem, 100)
+    return f"{h}:{m:02d}:{s:02d}.{cs:02d}"
+
+
 def _format_ass_time(seconds: float) -> str:
     """Format seconds to ASS timestamp H:MM:SS.cc"""
-    h = int(seconds // 3600)
-    m = int((seconds % 3600) // 60)
-    s = seconds % 60
-    return f"{h}:{m:02d}:{s:05.2f}"
+    return _format_ass_time_cs(int(round(seconds * 100)))
 
 
 def generate_captions_ass(
@@ -924,15 +944,14 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
         for chunk_start in range(0, len(words), chunk_size):
             chunk = words[chunk_start:chunk_start + chunk_size]
             chunk_end = chunk[-1]["end"]
+            # Build each token once; per line only the highlighted slot is swapped in and back out
+            dim_tokens = [r"{\rDim}" + w["word"] + r"{\rDefault}" for w in chunk]
+            line_parts = dim_tokens[:]
 
             for wi, w in enumerate(chunk):
-                line_parts = []
-                for wj, w2 in enumerate(chunk):
-                    if wj == wi:
-                        line_parts.append(r"{\rHighlight}" + w2["word"] + r"{\rDefault}")
-                    else:
-                        line_parts.append(r"{\rDim}" + w2["word"] + r"{\rDefault}")
+                line_parts[wi] = r"{\rHighlight}" + w["word"] + r"{\rDefault}"
                 text = " ".join(line_parts)
+                line_parts[wi] = dim_tokens[wi]
 
                 display_start = w["start"]
                 if wi < len(chunk) - 1:
@@ -953,12 +972,12 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
             end_t = _format_ass_time(chunk[-1]["end"])
             events.append(f"Dialogue: 0,{start_t},{end_t},Default,,0,0,0,,{text}")
 
-    content = header + "\n".join(events) + "\n"
     os.makedirs(os.path.dirname(output_ass_path), exist_ok=True)
-    with open(output_ass_path, "w", encoding="utf-8") as f:
-        f.write(content)
+    with open(output_ass_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        f.write(header)
+        f.writelines(e + "\n" for e in events)
 
-    print(f"[CAPTIONS] Generated {len(events)} subtitle events ({caption_style}) -> {output_ass_path}")
+    logger.info("[CAPTIONS] Generated %d subtitle events (%s) -> %s", len(events), caption_style, output_ass_path)
     return output_ass_path
 
 
@@ -1017,13 +1036,14 @@ def create_video_with_transitions(
     audio_path: str,
     output_path: str,
     ass_path: Optional[str] = None,
+    progress: Optional[Callable[[str, float], None]] = None,
 ) -> str:
     """
     Create video from images with per-scene durations, transitions, and audio.
     scene_entries: list of {image_path, duration, transition_type, transition_duration}
+    progress: called as progress(stage, pct) as each ffmpeg step finishes
     """
-    import subprocess
-    import tempfile
+    progress = progress or (lambda stage, pct: None)
 
     if not scene_entries:
         raise ValueError("No scene entries provided")
@@ -1051,8 +1071,12 @@ def create_video_with_transitions(
                 "-r", "30",
                 seg_path,
             ]
-            print(f"[VIDEO] Creating segment {i}: {dur:.2f}s from {os.path.basename(img_abs)} (animation={entry.get('image_animation')}, effect={entry.get('image_effect')})")
+            logger.info(
+                "[VIDEO] Creating segment %d: %.2fs from %s (animation=%s, effect=%s)",
+                i, dur, os.path.basename(img_abs), entry.get('image_animation'), entry.get('image_effect'),
+            )
             subprocess.run(cmd, check=True, capture_output=True)
+            progress("segments", round(70 * (i + 1) / len(scene_entries), 1))
 
         has_transitions = any(
             e.get("transition_duration", 0) > 0 and e.get("transition_type", "cut") != "cut"
@@ -1065,6 +1089,7 @@ def create_video_with_transitions(
         else:
             video_no_audio = os.path.join(temp_dir, "video_no_audio.mp4")
             _build_concat_video(segment_paths, video_no_audio)
+        progress("assembled", 80)
 
         if ass_path and os.path.isfile(ass_path):
             video_with_subs = os.path.join(temp_dir, "video_subs.mp4")
@@ -1078,9 +1103,10 @@ def create_video_with_transitions(
                 "-c:a", "copy",
                 video_with_subs,
             ]
-            print(f"[VIDEO] Burning in captions from {ass_path}")
+            logger.info("[VIDEO] Burning in captions from %s", ass_path)
             subprocess.run(cmd, check=True, capture_output=True)
             video_no_audio = video_with_subs
+            progress("captions", 90)
 
         audio_abs = os.path.abspath(audio_path)
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
@@ -1094,26 +1120,23 @@ def create_video_with_transitions(
             "-shortest",
             output_path,
         ]
-        print(f"[VIDEO] Muxing audio + video -> {output_path}")
+        logger.info("[VIDEO] Muxing audio + video -> %s", output_path)
         subprocess.run(cmd, check=True, capture_output=True)
 
         return output_path
 
     except subprocess.CalledProcessError as e:
         stderr = e.stderr.decode() if e.stderr else "unknown"
-        print(f"[VIDEO] FFmpeg error: {stderr}")
+        logger.error("[VIDEO] FFmpeg error: %s", stderr)
         raise
     except FileNotFoundError:
         raise Exception("FFmpeg not found. Please install FFmpeg to create videos.")
     finally:
-        import shutil
         shutil.rmtree(temp_dir, ignore_errors=True)
 
 
 def _build_concat_video(segment_paths: List[str], output_path: str):
     """Simple concat of video segments (no transitions)."""
-    import subprocess
-    import tempfile
 
     with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
         for seg in segment_paths:
@@ -1136,11 +1159,9 @@ def _build_concat_video(segment_paths: List[str], output_path: str):
 
 def _build_xfade_chain(segment_paths: List[str], scene_entries: List[dict], output_path: str):
     """Build video with xfade transitions between segments."""
-    import subprocess
 
     if len(segment_paths) == 1:
-        import shutil
-        shutil.copy2(segment_paths[0], output_path)
+        fast_copy(segment_paths[0], output_path)
         return
 
     inputs = []
@@ -1193,7 +1214,7 @@ def _build_xfade_chain(segment_paths: List[str], scene_entries: List[dict], outp
         output_path,
     ]
 
-    print(f"[VIDEO] xfade filter: {filter_complex[:200]}...")
+    logger.debug("[VIDEO] xfade filter: %s...", filter_complex[:200])
     subprocess.run(cmd, check=True, capture_output=True)
 
 
@@ -1203,8 +1224,6 @@ def create_video_from_images(
     """
     Legacy: Create video from sequence of images using FFmpeg (fixed duration, no audio).
     """
-    import subprocess
-    import tempfile
 
     with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
         for img_path in image_paths:
@@ -1226,7 +1245,7 @@ def create_video_from_images(
         subprocess.run(cmd, check=True, capture_output=True)
         return output_path
     except subprocess.CalledProcessError as e:
-        print(f"FFmpeg error: {e.stderr.decode()}")
+        logger.error("FFmpeg error: %s", e.stderr.decode())
         raise
     except FileNotFoundError:
         raise Exception("FFmpeg not found. Please install FFmpeg to create videos.")
@@ -0,0 +1,290 @@
+"""
+Response cache for read-heavy GET endpoints.
+
+Each cached endpoint declares the tables it reads. Entries live in a small in-process LRU,
+keyed on (endpoint, arguments, current version of each table). Table versions are tokens
+kept in Redis, so API workers and Celery workers share them. Every committed write through
+a SQLAlchemy Session replaces the version of each table it touched, which makes older
+entries unreachable; nothing has to be deleted explicitly. AsyncSession writes commit through
+acommit(), which does that Redis write off the event loop.
+
+Entries hold the already-rendered JSON body, so a hit skips validation and serialization and
+only wraps the bytes in a fresh Response (responses are per-request: middleware mutates headers).
+Each body gets an ETag (hashed once, when the entry is stored) and "Cache-Control: no-cache", so
+browsers revalidate with If-None-Match; NotModifiedMiddleware answers a matching request with an
+empty 304 instead of the body.
+
+If Redis is unreachable the decorator calls through to the endpoint and renders its result.
+"""
+import functools
+import hashlib
+import inspect
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import List
+
+import redis
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import TypeAdapter
+from sqlalchemy import event
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from .database import ASYNC_SESSION
+
+logger = logging.getLogger(__name__)
+
+CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+_VERSION_KEY = "respcache:version:{}"
+_DIRTY_TABLES = "respcache_dirty_tables"
+_COMMITTED_TABLES = "respcache_committed_tables"  # committed by an AsyncSession, bumped by acommit()
+_RETRY_AFTER_SECONDS = 5.0
+
+_redis = redis.Redis.from_url(
+    os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+    socket_timeout=0.25,
+    socket_connect_timeout=0.25,
+)
+_redis_down_until = 0.0
+_pending_bumps: set = set()  # tables written while Redis was unreachable; bumped once it's back
+
+_entries: "OrderedDict[tuple, tuple]" = OrderedDict()  # key -> (rendered body, etag)
+_lock = threading.Lock()
+
+
+def _redis_available() -> bool:
+    return time.monotonic() >= _redis_down_until
+
+
+def _mark_redis_down(exc: Exception):
+    """Back off from Redis for a few seconds and drop local entries: versions may move without us seeing it."""
+    global _redis_down_until
+    _redis_down_until = time.monotonic() + _RETRY_AFTER_SECONDS
+    clear()
+    logger.warning("Response cache disabled for %.0fs, Redis unavailable: %s", _RETRY_AFTER_SECONDS, exc)
+
+
+def table_versions(tables):
+    """Current version token per table, or None if Redis can't be reached."""
+    if not _redis_available():
+        return None
+    if _pending_bumps:
+        bump()
+        if not _redis_available():
+            return None
+    keys = [_VERSION_KEY.format(t) for t in tables]
+    try:
+        versions = _redis.mget(keys)
+        if None in versions:
+            # First read (or Redis lost its data): seed fresh tokens so old local entries can't match
+            pipe = _redis.pipeline()
+            for key, version in zip(keys, versions):
+                if version is None:
+                    pipe.set(key, uuid.uuid4().hex, nx=True)
+            pipe.execute()
+            versions = _redis.mget(keys)
+        return tuple(versions)
+    except redis.RedisError as e:
+        _mark_redis_down(e)
+        return None
+
+
+def bump(*tables: str):
+    """Invalidate every cached response that reads any of `tables` (deferred while Redis is unreachable)."""
+    with _lock:
+        _pending_bumps.update(tables)
+        tables = tuple(_pending_bumps)
+    if not tables or not _redis_available():
+        return
+    try:
+        pipe = _redis.pipeline()
+        for table in tables:
+            pipe.set(_VERSION_KEY.format(table), uuid.uuid4().hex)
+        pipe.execute()
+    except redis.RedisError as e:
+        _mark_redis_down(e)
+        return
+    with _lock:
+        _pending_bumps.difference_update(tables)
+
+
+def clear():
+    with _lock:
+        _entries.clear()
+
+
+@functools.lru_cache(maxsize=None)
+def list_adapter(schema) -> TypeAdapter:
+    """TypeAdapter(List[schema]), built once per schema (its validator/serializer are compiled at construction)."""
+    return TypeAdapter(List[schema])
+
+
+def _render(result, schema) -> bytes:
+    """Serialize an endpoint result (ORM objects or dicts) through `schema` straight to JSON bytes."""
+    if schema is None:
+        return ORJSONResponse(result).body
+    # Validate and dump in pydantic-core: no intermediate dicts for a second JSON encoder to walk.
+    # None-valued fields are left out, like on every other response_model route (see main.CompactRoute)
+    if isinstance(result, list):
+        adapter = list_adapter(schema)
+        return adapter.dump_json(adapter.validate_python(result, from_attributes=True), exclude_none=True)
+    return schema.model_validate(result).model_dump_json(exclude_none=True).encode("utf-8")
+
+
+def _etag(body: bytes) -> str:
+    return '"%s"' % hashlib.sha1(body).hexdigest()
+
+
+def _json(body: bytes, etag: str = None) -> Response:
+    headers = {"ETag": etag or _etag(body), "Cache-Control": "no-cache"}
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def cached(*models, schema=None):
+    """
+    Cache a FastAPI endpoint's rendered JSON per (arguments, versions of the models' tables).
+    schema: Pydantic response model the result is validated against before rendering. The wrapper
+    returns a Response, so FastAPI's own response_model pass is skipped; keep response_model= on
+    the route for the OpenAPI docs. Works on sync and async endpoints (for async ones the Redis
+    version lookup runs in the threadpool, off the event loop).
+    """
+    tables = tuple(m.__tablename__ for m in models)
+
+    def decorator(fn):
+        def key_for(args, kwargs, versions):
+            return (fn.__qualname__, args, tuple(sorted((k, v) for k, v in kwargs.items() if k != "db")), versions)
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                versions = await run_in_threadpool(table_versions, tables)
+                if versions is None:
+                    return _json(_render(await fn(*args, **kwargs), schema))
+                key = key_for(args, kwargs, versions)
+                entry = _lookup(key)
+                if entry is None:
+                    entry = _store(key, _render(await fn(*args, **kwargs), schema))
+                return _json(*entry)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            versions = table_versions(tables)
+            if versions is None:
+                return _json(_render(fn(*args, **kwargs), schema))
+            key = key_for(args, kwargs, versions)
+            entry = _lookup(key)
+            if entry is None:
+                entry = _store(key, _render(fn(*args, **kwargs), schema))
+            return _json(*entry)
+
+        return wrapper
+
+    return decorator
+
+
+def _lookup(key):
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None:
+            _entries.move_to_end(key)
+        return entry
+
+
+def _store(key, body: bytes) -> tuple:
+    entry = (body, _etag(body))
+    with _lock:
+        _entries[key] = entry
+        if len(_entries) > CACHE_MAX_ENTRIES:
+            _entries.popitem(last=False)
+    return entry
+
+
+class NotModifiedMiddleware:
+    """
+    Turn a 200 GET response whose ETag is listed in the request's If-None-Match into an empty 304.
+    Plain ASGI (no BaseHTTPMiddleware): it only looks at the response start message and drops the body.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            return await self.app(scope, receive, send)
+        if_none_match = next((v for k, v in scope["headers"] if k == b"if-none-match"), None)
+        if if_none_match is None:
+            return await self.app(scope, receive, send)
+        wanted = {tag.strip().removeprefix(b"W/") for tag in if_none_match.split(b",")}
+        not_modified = False
+
+        async def send_wrapper(message):
+            nonlocal not_modified
+            if message["type"] == "http.response.start":
+                etag = next((v for k, v in message["headers"] if k == b"etag"), None)
+                if message["status"] == 200 and etag is not None and (etag in wanted or b"*" in wanted):
+                    not_modified = True
+                    headers = [(k, v) for k, v in message["headers"] if k in (b"etag", b"cache-control", b"vary")]
+                    message = {"type": "http.response.start", "status": 304, "headers": headers}
+            elif message["type"] == "http.response.body" and not_modified:
+                if message.get("more_body"):
+                    return
+                message = {"type": "http.response.body", "body": b""}
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+# Track which tables each transaction writes, and bump them once it commits
+
+def _dirty_tables(session) -> set:
+    return session.info.setdefault(_DIRTY_TABLES, set())
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_tables(session, flush_context):
+    tables = _dirty_tables(session)
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table:
+            tables.add(table)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_executed_tables(orm_execute_state):
+    # Bulk UPDATE/DELETE/INSERT statements bypass the unit of work, so after_flush never sees them
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None:
+            _dirty_tables(orm_execute_state.session).add(table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_committed_tables(session):
+    tables = session.info.pop(_DIRTY_TABLES, None)
+    if not tables:
+        return
+    if session.info.get(ASYNC_SESSION):
+        # Inside AsyncSession.commit() this runs on the event loop, where the blocking Redis call would
+        # stall every request; acommit() bumps them from a worker thread once the commit has returned
+        session.info.setdefault(_COMMITTED_TABLES, set()).update(tables)
+        return
+    bump(*tables)
+
+
+async def acommit(session):
+    """Commit an AsyncSession, then invalidate the tables it wrote without blocking the event loop."""
+    await session.commit()
+    tables = session.info.pop(_COMMITTED_TABLES, None)
+    if tables:
+        await run_in_threadpool(bump, *tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_tables(session):
+    session.info.pop(_DIRTY_TABLES, None)
@@ -1,6 +1,6 @@
 """
 Celery worker entry point
-Run with: celery -A backend.celery_worker worker --loglevel=info --concurrency=2
+Run with: celery -A backend.celery_worker worker -Q celery,render --loglevel=info --concurrency=2
 """
 
 from .tasks import celery_app
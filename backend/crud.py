@@ -1,84 +1,245 @@
 """
 CRUD operations for database models
 """
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from . import models, schemas
+import os
+from sqlalchemy.orm import Session, joinedload, selectinload, raiseload
+from sqlalchemy import bindparam, delete, desc, literal, select, update, case, insert, exists as sa_exists
+from typing import TYPE_CHECKING, Dict, List, Optional
+from . import cache, models, schemas
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# Dev aid: set SQLALCHEMY_RAISELOAD=1 to make un-eager-loaded relationship access raise instead of issuing N+1 queries
+_RAISELOAD = os.getenv("SQLALCHEMY_RAISELOAD", "").lower() in ("1", "true", "yes")
+
+
+def _strict(query):
+    """Apply raiseload('*') to list queries when SQLALCHEMY_RAISELOAD is enabled."""
+    return query.options(raiseload("*")) if _RAISELOAD else query
+
+
+def _save(db: Session, commit: bool):
+    """Commit, or only flush when the caller owns the surrounding transaction."""
+    if commit:
+        db.commit()
+    else:
+        db.flush()
+
+
+# Hot per-request SELECTs built once at import; SQLAlchemy's compiled cache then hits on the same
+# construct every call instead of re-building it and computing its cache key from scratch
+_SCENES_BY_PROJECT = (
+    select(models.Scene).where(models.Scene.project_id == bindparam("project_id")).order_by(models.Scene.order)
+)
+_SCENE_TEXTS_BY_PROJECT = (
+    select(models.Scene.text).where(models.Scene.project_id == bindparam("project_id")).order_by(models.Scene.order)
+)
+_SCENE_IDS_AND_TEXTS_BY_PROJECT = (
+    select(models.Scene.id, models.Scene.text)
+    .where(models.Scene.project_id == bindparam("project_id"))
+    .order_by(models.Scene.order)
+)
+_IMAGES_BY_SCENE = (
+    select(models.Image).where(models.Image.scene_id == bindparam("scene_id")).order_by(desc(models.Image.created_at))
+)
+_VISUAL_DESCRIPTIONS_BY_SCENE = (
+    select(models.VisualDescription)
+    .where(models.VisualDescription.scene_id == bindparam("scene_id"))
+    .order_by(models.VisualDescription.created_at)
+)
+_LATEST_VIDEO_BY_PROJECT = (
+    select(models.Video).where(models.Video.project_id == bindparam("project_id"))
+    .order_by(desc(models.Video.created_at)).limit(1)
+)
+_LATEST_VOICEOVER_BY_PROJECT = (
+    select(models.Voiceover).where(models.Voiceover.project_id == bindparam("project_id"))
+    .order_by(desc(models.Voiceover.created_at)).limit(1)
+)
+
+
+def _page(stmt, model, skip: int, limit: int, before_id: Optional[int]):
+    """
+    Newest-first page ordered by primary key. Pass before_id (last id of the previous page) to seek
+    with WHERE id < before_id instead of OFFSET, which has to scan every skipped row.
+    """
+    stmt = stmt.order_by(desc(model.id))
+    if before_id is not None:
+        return stmt.where(model.id < before_id).limit(limit)
+    return stmt.offset(skip).limit(limit)
+
+
+def _schema_columns(model, schema):
+    """The model's columns that `schema` actually returns (list endpoints SELECT only those, as plain rows)."""
+    return [col for name, col in model.__table__.columns.items() if name in schema.model_fields]
+
+
+def _update_by_id(db: Session, model, pk: int, values: dict, commit: bool):
+    """
+    Apply `values` to one row with a single UPDATE ... RETURNING and return the refreshed instance
+    (None if the id doesn't exist). Replaces SELECT -> mutate -> flush -> refresh.
+    """
+    if not values:
+        return db.get(model, pk)
+    result = db.execute(
+        update(model).where(model.id == pk).values(**values).returning(model),
+        execution_options={"synchronize_session": False, "populate_existing": True},
+    )
+    obj = result.scalar_one_or_none()
+    _save(db, commit)
+    return obj
+
+
+def exists(db: Session, model, pk: int) -> bool:
+    """True if a row with this id exists; for 404 checks that don't need the row's columns."""
+    return db.execute(select(sa_exists().where(model.id == pk))).scalar()
+
+
+def missing_ids(db: Session, model, ids) -> List[int]:
+    """The ids with no row in `model`'s table, checked with one SELECT ... WHERE id IN (...)."""
+    wanted = set(ids)
+    if not wanted:
+        return []
+    found = set(db.scalars(select(model.id).where(model.id.in_(wanted))))
+    return sorted(wanted - found)
 
 
 # Project CRUD
-def create_project(db: Session, project: schemas.ProjectCreate):
-    db_project = models.Project(**project.dict())
+def create_project(db: Session, project: schemas.ProjectCreate, commit: bool = True):
+    db_project = models.Project(**project.model_dump())
     db.add(db_project)
-    db.commit()
-    db.refresh(db_project)
+    _save(db, commit)
     return db_project
 
 
 def get_project(db: Session, project_id: int):
-    return db.query(models.Project).filter(models.Project.id == project_id).first()
+    return db.get(models.Project, project_id)
 
 
-def get_projects(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Project).order_by(desc(models.Project.created_at)).offset(skip).limit(limit).all()
+def get_projects(db: Session, skip: int = 0, limit: int = 100, before_id: Optional[int] = None):
+    return db.scalars(_page(select(models.Project), models.Project, skip, limit, before_id)).all()
 
 
-def update_project(db: Session, project_id: int, project: schemas.ProjectUpdate):
-    db_project = db.query(models.Project).filter(models.Project.id == project_id).first()
-    if not db_project:
-        return None
-    
-    update_data = project.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_project, field, value)
-    
-    db.commit()
-    db.refresh(db_project)
-    return db_project
+def get_project_full(db: Session, project_id: int):
+    """Project with its scenes (in order) and each scene's images, loaded with two extra IN queries."""
+    return db.execute(
+        select(models.Project)
+        .options(selectinload(models.Project.scenes).selectinload(models.Scene.images))
+        .where(models.Project.id == project_id)
+    ).scalar_one_or_none()
+
+
+def update_project(db: Session, project_id: int, project: schemas.ProjectUpdate, commit: bool = True):
+    return _update_by_id(db, models.Project, project_id, project.model_dump(exclude_unset=True), commit)
 
 
-def delete_project(db: Session, project_id: int):
+def delete_project(db: Session, project_id: int, commit: bool = True):
     db_project = db.query(models.Project).filter(models.Project.id == project_id).first()
     if not db_project:
         return False
     
     db.delete(db_project)
-    db.commit()
+    _save(db, commit)
     return True
 
 
 # Scene CRUD
-def create_scene(db: Session, scene: schemas.SceneCreate):
-    db_scene = models.Scene(**scene.dict())
+def create_scene(db: Session, scene: schemas.SceneCreate, commit: bool = True):
+    db_scene = models.Scene(**scene.model_dump())
     db.add(db_scene)
-    db.commit()
-    db.refresh(db_scene)
+    _save(db, commit)
     return db_scene
 
 
+def bulk_create_scenes(db: Session, scenes: List[schemas.SceneCreate], commit: bool = True) -> List[models.Scene]:
+    """Insert many scenes with one executemany INSERT ... RETURNING (batched by insertmanyvalues) instead of add+refresh each."""
+    if not scenes:
+        return []
+    result = db.execute(
+        insert(models.Scene).returning(models.Scene, sort_by_parameter_order=True),
+        [scene.model_dump() for scene in scenes],
+    )
+    db_scenes = list(result.scalars())
+    _save(db, commit)
+    return db_scenes
+
+
 def get_scene(db: Session, scene_id: int):
-    return db.query(models.Scene).filter(models.Scene.id == scene_id).first()
+    return db.get(models.Scene, scene_id)
+
+
+def get_scene_with_style(db: Session, scene_id: int):
+    """Scene with scene_style joined into the same SELECT."""
+    return db.get(models.Scene, scene_id, options=[joinedload(models.Scene.scene_style)])
+
+
+def get_scene_by_order(db: Session, project_id: int, order: int):
+    """The project's scene at position `order` (e.g. the previous scene), or None."""
+    return db.scalar(
+        select(models.Scene).where(models.Scene.project_id == project_id, models.Scene.order == order).limit(1)
+    )
 
 
 def get_scenes_by_project(db: Session, project_id: int):
-    return db.query(models.Scene).filter(models.Scene.project_id == project_id).order_by(models.Scene.order).all()
+    return db.scalars(_strict(_SCENES_BY_PROJECT), {"project_id": project_id}).all()
+
+
+def get_scene_texts(db: Session, project_id: int) -> List[str]:
+    """Scene texts in order, as plain strings (no ORM rows)."""
+    return db.scalars(_SCENE_TEXTS_BY_PROJECT, {"project_id": project_id}).all()
 
 
-def delete_scenes_by_project(db: Session, project_id: int):
+def get_scene_ids_and_texts(db: Session, project_id: int):
+    """(id, text) of each scene in order, as plain rows (no ORM objects)."""
+    return db.execute(_SCENE_IDS_AND_TEXTS_BY_PROJECT, {"project_id": project_id}).all()
+
+
+def get_latest_image_paths(db: Session, project_id: int) -> List[Optional[str]]:
+    """
+    file_path of each scene's newest image, in scene order (None for a scene without one / whose newest
+    image has no file yet). One SELECT with a correlated LIMIT 1 per scene on (scene_id, created_at).
+    """
+    latest_path = (
+        select(models.Image.file_path)
+        .where(models.Image.scene_id == models.Scene.id)
+        .order_by(desc(models.Image.created_at))
+        .limit(1)
+        .correlate(models.Scene)
+        .scalar_subquery()
+    )
+    return db.scalars(
+        select(latest_path).where(models.Scene.project_id == project_id).order_by(models.Scene.order)
+    ).all()
+
+
+def get_scenes_with_images_by_project(db: Session, project_id: int):
+    """Scenes in order with Scene.images (newest first) loaded by one extra IN query instead of one per scene."""
+    return (
+        _strict(db.query(models.Scene))
+        .options(selectinload(models.Scene.images))
+        .filter(models.Scene.project_id == project_id)
+        .order_by(models.Scene.order)
+        .all()
+    )
+
+
+def delete_scenes_by_project(db: Session, project_id: int, commit: bool = True):
     """Delete all scenes for a project (e.g. before re-segmenting).
     Clears approved_image_id and current_visual_description_id first to avoid circular FK errors,
-    then cascades to visual_descriptions and images."""
-    scenes = db.query(models.Scene).filter(models.Scene.project_id == project_id).all()
-    for scene in scenes:
-        scene.approved_image_id = None
-        scene.current_visual_description_id = None
-    db.flush()
-    for scene in scenes:
-        db.delete(scene)
-    db.commit()
+    then deletes the scenes' visual_descriptions and images. Four statements however many scenes there are."""
+    scene_ids = select(models.Scene.id).where(models.Scene.project_id == project_id).scalar_subquery()
+    db.execute(
+        update(models.Scene)
+        .where(models.Scene.project_id == project_id)
+        .values(approved_image_id=None, current_visual_description_id=None)
+    )
+    db.execute(delete(models.Image).where(models.Image.scene_id.in_(scene_ids)))
+    db.execute(delete(models.VisualDescription).where(models.VisualDescription.scene_id.in_(scene_ids)))
+    db.execute(delete(models.Scene).where(models.Scene.project_id == project_id))
+    _save(db, commit)
 
 
-def insert_scene_at(db: Session, project_id: int, after_order: int, text: str = ""):
+def insert_scene_at(db: Session, project_id: int, after_order: int, text: str = "", commit: bool = True):
     """Insert a new scene after the given order position.
     after_order=0 inserts at the beginning. Shifts all subsequent scenes' order +1."""
     db.query(models.Scene).filter(
@@ -92,12 +253,11 @@ def insert_scene_at(db: Session, project_id: int, after_order: int, text: str =
         order=after_order + 1,
     )
     db.add(new_scene)
-    db.commit()
-    db.refresh(new_scene)
+    _save(db, commit)
     return new_scene
 
 
-def delete_scene(db: Session, scene_id: int):
+def delete_scene(db: Session, scene_id: int, commit: bool = True):
     """Delete a single scene. Clears circular FK refs first, then deletes and renumbers remaining scenes."""
     scene = db.query(models.Scene).filter(models.Scene.id == scene_id).first()
     if not scene:
@@ -117,105 +277,26 @@ def delete_scene(db: Session, scene_id: int):
     for idx, s in enumerate(remaining, start=1):
         if s.order != idx:
             s.order = idx
-    db.commit()
+    _save(db, commit)
     return True
 
 
-def update_scene(db: Session, scene_id: int, scene: schemas.SceneUpdate):
-    db_scene = db.query(models.Scene).filter(models.Scene.id == scene_id).first()
-    if not db_scene:
-        return None
-    
-    update_data = scene.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_scene, field, value)
-    
-    db.commit()
-    db.refresh(db_scene)
-    return db_scene
+def update_scene(db: Session, scene_id: int, scene: schemas.SceneUpdate, commit: bool = True):
+    return _update_by_id(db, models.Scene, scene_id, scene.model_dump(exclude_unset=True), commit)
 
 
 # Visual Style CRUD
-def create_visual_style(db: Session, visual_style: schemas.VisualStyleCreate):
-    db_style = models.VisualStyle(**visual_style.dict())
-    db.add(db_style)
-    db.commit()
-    db.refresh(db_style)
-    return db_style
-
-
 def get_visual_style(db: Session, style_id: int):
-    return db.query(models.VisualStyle).filter(models.VisualStyle.id == style_id).first()
-
-
-def get_visual_styles(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.VisualStyle).order_by(desc(models.VisualStyle.created_at)).offset(skip).limit(limit).all()
-
-
-def update_visual_style(db: Session, style_id: int, visual_style: schemas.VisualStyleUpdate):
-    db_style = db.query(models.VisualStyle).filter(models.VisualStyle.id == style_id).first()
-    if not db_style:
-        return None
-    
-    update_data = visual_style.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_style, field, value)
-    
-    db.commit()
-    db.refresh(db_style)
-    return db_style
-
-
-def delete_visual_style(db: Session, style_id: int):
-    db_style = db.query(models.VisualStyle).filter(models.VisualStyle.id == style_id).first()
-    if not db_style:
-        return False
-    
-    db.delete(db_style)
-    db.commit()
-    return True
+    return db.get(models.VisualStyle, style_id)
 
 
 # Script Prompt CRUD
-def create_script_prompt(db: Session, script_prompt: schemas.ScriptPromptCreate):
-    db_prompt = models.ScriptPrompt(**script_prompt.dict())
-    db.add(db_prompt)
-    db.commit()
-    db.refresh(db_prompt)
-    return db_prompt
-
-
 def get_script_prompt(db: Session, prompt_id: int):
-    return db.query(models.ScriptPrompt).filter(models.ScriptPrompt.id == prompt_id).first()
-
-
-def get_script_prompts(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.ScriptPrompt).order_by(desc(models.ScriptPrompt.created_at)).offset(skip).limit(limit).all()
-
-
-def update_script_prompt(db: Session, prompt_id: int, script_prompt: schemas.ScriptPromptUpdate):
-    db_prompt = db.query(models.ScriptPrompt).filter(models.ScriptPrompt.id == prompt_id).first()
-    if not db_prompt:
-        return None
-    update_data = script_prompt.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_prompt, field, value)
-    db.commit()
-    db.refresh(db_prompt)
-    return db_prompt
-
-
-def delete_script_prompt(db: Session, prompt_id: int):
-    db_prompt = db.query(models.ScriptPrompt).filter(models.ScriptPrompt.id == prompt_id).first()
-    if not db_prompt:
-        return False
-    db.delete(db_prompt)
-    db.commit()
-    return True
+    return db.get(models.ScriptPrompt, prompt_id)
 
 
 # Script Iteration CRUD (sliding window: store all, send only last K feedbacks to API)
-def create_script_iteration(db: Session, project_id: int, user_feedback: str, revised_script: str):
+def create_script_iteration(db: Session, project_id: int, user_feedback: str, revised_script: str, commit: bool = True):
     count = db.query(models.ScriptIteration).filter(models.ScriptIteration.project_id == project_id).count()
     round_number = count + 1
     iteration = models.ScriptIteration(
@@ -225,8 +306,7 @@ def create_script_iteration(db: Session, project_id: int, user_feedback: str, re
         revised_script=revised_script,
     )
     db.add(iteration)
-    db.commit()
-    db.refresh(iteration)
+    _save(db, commit)
     return iteration
 
 
@@ -244,190 +324,288 @@ def get_last_script_iterations_feedback(db: Session, project_id: int, k: int):
 
 
 # Scene Style CRUD
-def create_scene_style(db: Session, scene_style: schemas.SceneStyleCreate):
-    db_style = models.SceneStyle(**scene_style.dict())
-    db.add(db_style)
-    db.commit()
-    db.refresh(db_style)
-    return db_style
-
-
 def get_scene_style(db: Session, style_id: int):
-    return db.query(models.SceneStyle).filter(models.SceneStyle.id == style_id).first()
-
-
-def get_scene_styles(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.SceneStyle).order_by(desc(models.SceneStyle.created_at)).offset(skip).limit(limit).all()
-
-
-def update_scene_style(db: Session, style_id: int, scene_style: schemas.SceneStyleUpdate):
-    db_style = db.query(models.SceneStyle).filter(models.SceneStyle.id == style_id).first()
-    if not db_style:
-        return None
-    
-    update_data = scene_style.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_style, field, value)
-    
-    db.commit()
-    db.refresh(db_style)
-    return db_style
-
-
-def delete_scene_style(db: Session, style_id: int):
-    db_style = db.query(models.SceneStyle).filter(models.SceneStyle.id == style_id).first()
-    if not db_style:
-        return False
-    
-    db.delete(db_style)
-    db.commit()
-    return True
+    return db.get(models.SceneStyle, style_id)
 
 
 # Voice CRUD (predefined ElevenLabs voices)
-def create_voice(db: Session, voice: schemas.VoiceCreate):
-    db_voice = models.Voice(**voice.dict())
+def create_voice(db: Session, voice: schemas.VoiceCreate, commit: bool = True):
+    db_voice = models.Voice(**voice.model_dump())
     db.add(db_voice)
-    db.commit()
-    db.refresh(db_voice)
+    _save(db, commit)
     return db_voice
 
 
 def get_voice(db: Session, voice_id: int):
-    return db.query(models.Voice).filter(models.Voice.id == voice_id).first()
+    return db.get(models.Voice, voice_id)
 
 
 def get_voices(db: Session, skip: int = 0, limit: int = 100):
     return db.query(models.Voice).order_by(desc(models.Voice.created_at)).offset(skip).limit(limit).all()
 
 
-def update_voice(db: Session, voice_id: int, voice: schemas.VoiceUpdate):
-    db_voice = db.query(models.Voice).filter(models.Voice.id == voice_id).first()
-    if not db_voice:
-        return None
-    update_data = voice.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_voice, field, value)
-    db.commit()
-    db.refresh(db_voice)
-    return db_voice
+def update_voice(db: Session, voice_id: int, voice: schemas.VoiceUpdate, commit: bool = True):
+    return _update_by_id(db, models.Voice, voice_id, voice.model_dump(exclude_unset=True), commit)
 
 
-def delete_voice(db: Session, voice_id: int):
+def delete_voice(db: Session, voice_id: int, commit: bool = True):
     db_voice = db.query(models.Voice).filter(models.Voice.id == voice_id).first()
     if not db_voice:
         return False
     db.delete(db_voice)
-    db.commit()
+    _save(db, commit)
     return True
 
 
 # Image CRUD
-def create_image(db: Session, image: schemas.ImageCreate):
-    db_image = models.Image(**image.dict())
-    db.add(db_image)
-    db.commit()
-    db.refresh(db_image)
+def create_image(db: Session, image: schemas.ImageCreate, commit: bool = True, **values):
+    """
+    One INSERT ... RETURNING: the row comes back with its id and server defaults (created_at) loaded.
+    values: columns not on ImageCreate, e.g. file_path when the file already exists.
+    """
+    db_image = db.scalar(insert(models.Image).values(**image.model_dump(), **values).returning(models.Image))
+    _save(db, commit)
     return db_image
 
 
+def bulk_create_images(db: Session, images: List[schemas.ImageCreate], commit: bool = True) -> List[models.Image]:
+    """Insert many image rows with one executemany INSERT ... RETURNING (see bulk_create_scenes)."""
+    if not images:
+        return []
+    result = db.execute(
+        insert(models.Image).returning(models.Image, sort_by_parameter_order=True),
+        [image.model_dump() for image in images],
+    )
+    db_images = list(result.scalars())
+    _save(db, commit)
+    return db_images
+
+
 def get_image(db: Session, image_id: int):
-    return db.query(models.Image).filter(models.Image.id == image_id).first()
+    return db.get(models.Image, image_id)
+
+
+def get_images_by_ids(db: Session, image_ids: List[int]) -> List[models.Image]:
+    """Images with the given ids in one IN query (missing ids are skipped)."""
+    if not image_ids:
+        return []
+    return db.scalars(select(models.Image).where(models.Image.id.in_(image_ids))).all()
 
 
 def get_images_by_scene(db: Session, scene_id: int):
-    return db.query(models.Image).filter(models.Image.scene_id == scene_id).order_by(desc(models.Image.created_at)).all()
+    return db.scalars(_IMAGES_BY_SCENE, {"scene_id": scene_id}).all()
 
 
-def get_images_by_project(db: Session, project_id: int):
-    """Get all images from all scenes in a project. Returns images with file_path or url."""
+def images_by_project_stmt(project_id: int):
+    """SELECT for all images from all scenes in a project, newest first (shared by the list and streaming paths)."""
     return (
-        db.query(models.Image)
+        select(models.Image)
         .join(models.Scene, models.Image.scene_id == models.Scene.id)
-        .filter(models.Scene.project_id == project_id)
+        .where(models.Scene.project_id == project_id)
         .order_by(desc(models.Image.created_at))
-        .all()
     )
 
 
-def update_image(db: Session, image_id: int, **kwargs):
-    db_image = db.query(models.Image).filter(models.Image.id == image_id).first()
-    if not db_image:
-        return None
-    
-    for field, value in kwargs.items():
-        setattr(db_image, field, value)
-    
-    db.commit()
-    db.refresh(db_image)
-    return db_image
+def get_images_by_project(db: Session, project_id: int):
+    """Get all images from all scenes in a project. Returns images with file_path or url."""
+    return db.scalars(images_by_project_stmt(project_id)).all()
+
+
+def update_image(db: Session, image_id: int, commit: bool = True, **kwargs):
+    return _update_by_id(db, models.Image, image_id, kwargs, commit)
+
+
+def set_status(db: Session, model, pk: int, status: str, *columns, commit: bool = True):
+    """
+    Set one row's status with a single UPDATE ... RETURNING (no prior SELECT).
+    Returns the row of `columns` (default: id), or None if no row has that id.
+    """
+    result = db.execute(
+        update(model)
+        .where(model.id == pk)
+        .values(status=status)
+        .returning(*(columns or (model.id,))),
+        execution_options={"synchronize_session": False},
+    )
+    row = result.first()
+    _save(db, commit)
+    return row
+
+
+def bulk_update_status(db: Session, model, statuses: Dict[int, str], commit: bool = True) -> List[int]:
+    """
+    Set status on many rows of `model` in a single UPDATE.
+    Mixed batches use SET status = CASE id WHEN ... THEN ... END. Returns the ids that matched.
+    """
+    if not statuses:
+        return []
+    distinct = set(statuses.values())
+    value = distinct.pop() if len(distinct) == 1 else case(statuses, value=model.id)
+    result = db.execute(
+        update(model)
+        .where(model.id.in_(list(statuses)))
+        .values(status=value)
+        .returning(model.id),
+        execution_options={"synchronize_session": False},
+    )
+    updated_ids = list(result.scalars())
+    _save(db, commit)
+    return updated_ids
+
+
+def bulk_update_image_status(db: Session, image_ids: List[int], status: str, commit: bool = True) -> List[int]:
+    return bulk_update_status(db, models.Image, {image_id: status for image_id in image_ids}, commit=commit)
+
+
+def bulk_approve_images(db: Session, image_ids: List[int], commit: bool = True) -> List[int]:
+    """
+    Approve images and point each affected scene's approved_image_id at them, in two UPDATEs.
+    If several images of one scene are approved, the last one in image_ids wins.
+    """
+    if not image_ids:
+        return []
+    scene_by_image = dict(
+        db.execute(
+            select(models.Image.id, models.Image.scene_id).where(models.Image.id.in_(image_ids))
+        ).all()
+    )
+    if not scene_by_image:
+        return []
+    approved_by_scene = {scene_by_image[i]: i for i in image_ids if i in scene_by_image}
+
+    bulk_update_status(db, models.Image, {i: models.Status.APPROVED.value for i in scene_by_image}, commit=False)
+    db.execute(
+        update(models.Scene)
+        .where(models.Scene.id.in_(list(approved_by_scene)))
+        .values(approved_image_id=case(approved_by_scene, value=models.Scene.id)),
+        execution_options={"synchronize_session": False},
+    )
+    _save(db, commit)
+    return list(scene_by_image)
+
+
+def bulk_reject_images(db: Session, image_ids: List[int], commit: bool = True):
+    """Mark images rejected in one UPDATE. Returns (id, scene_id, visual_style_id) rows for regeneration."""
+    if not image_ids:
+        return []
+    rows = db.execute(
+        update(models.Image)
+        .where(models.Image.id.in_(image_ids))
+        .values(status=models.Status.REJECTED.value)
+        .returning(models.Image.id, models.Image.scene_id, models.Image.visual_style_id),
+        execution_options={"synchronize_session": False},
+    ).all()
+    _save(db, commit)
+    return rows
+
+
+def approve_project_scenes(db: Session, project_id: int, commit: bool = True):
+    """Approve every scene of a project in one UPDATE. Returns (id, approved_image_id) rows in scene order."""
+    rows = db.execute(
+        update(models.Scene)
+        .where(models.Scene.project_id == project_id)
+        .values(status=models.Status.APPROVED.value)
+        .returning(models.Scene.id, models.Scene.order, models.Scene.approved_image_id),
+        execution_options={"synchronize_session": False},
+    ).all()
+    _save(db, commit)
+    return [(row.id, row.approved_image_id) for row in sorted(rows, key=lambda r: r.order)]
 
 
 # Video CRUD
-def create_video(db: Session, project_id: int, voiceover_id: int = None):
+def create_video(db: Session, project_id: int, voiceover_id: int = None, commit: bool = True):
     db_video = models.Video(project_id=project_id, voiceover_id=voiceover_id)
     db.add(db_video)
-    db.commit()
-    db.refresh(db_video)
+    _save(db, commit)
     return db_video
 
 
 def get_video(db: Session, video_id: int):
-    return db.query(models.Video).filter(models.Video.id == video_id).first()
+    return db.get(models.Video, video_id)
 
 
 def get_video_by_project(db: Session, project_id: int):
-    return db.query(models.Video).filter(models.Video.project_id == project_id).order_by(desc(models.Video.created_at)).first()
+    return db.scalar(_LATEST_VIDEO_BY_PROJECT, {"project_id": project_id})
 
 
 # Voiceover CRUD
-def create_voiceover(db: Session, project_id: int, voice_id: int = None, tts_settings: str = None):
+def create_voiceover(db: Session, project_id: int, voice_id: int = None, tts_settings: str = None, commit: bool = True):
     db_vo = models.Voiceover(project_id=project_id, voice_id=voice_id, tts_settings=tts_settings)
     db.add(db_vo)
-    db.commit()
-    db.refresh(db_vo)
+    _save(db, commit)
     return db_vo
 
 
 def get_voiceover(db: Session, voiceover_id: int):
-    return db.query(models.Voiceover).filter(models.Voiceover.id == voiceover_id).first()
+    return db.get(models.Voiceover, voiceover_id)
+
+
+def voiceover_belongs_to_project(db: Session, project_id: int, voiceover_id: int) -> bool:
+    """True if the voiceover exists and is the project's (which also means the project exists): one SELECT."""
+    return db.execute(
+        select(sa_exists().where(models.Voiceover.id == voiceover_id, models.Voiceover.project_id == project_id))
+    ).scalar()
 
 
 def get_voiceover_by_project(db: Session, project_id: int):
-    return db.query(models.Voiceover).filter(
-        models.Voiceover.project_id == project_id
-    ).order_by(desc(models.Voiceover.created_at)).first()
+    return db.scalar(_LATEST_VOICEOVER_BY_PROJECT, {"project_id": project_id})
 
 
-def update_voiceover(db: Session, voiceover_id: int, **kwargs):
-    db_vo = db.query(models.Voiceover).filter(models.Voiceover.id == voiceover_id).first()
-    if not db_vo:
-        return None
-    for field, value in kwargs.items():
-        setattr(db_vo, field, value)
-    db.commit()
-    db.refresh(db_vo)
-    return db_vo
+def update_voiceover(db: Session, voiceover_id: int, commit: bool = True, **kwargs):
+    return _update_by_id(db, models.Voiceover, voiceover_id, kwargs, commit)
+
+
+def update_latest_voiceover(db: Session, project_id: int, commit: bool = True, **values) -> Optional[int]:
+    """
+    Update the project's latest voiceover in one UPDATE ... WHERE id = (latest id subquery) RETURNING id,
+    instead of SELECTing it first. Returns its id, or None if the project has no voiceover.
+    """
+    latest_id = (
+        select(models.Voiceover.id).where(models.Voiceover.project_id == project_id)
+        .order_by(desc(models.Voiceover.created_at)).limit(1).scalar_subquery()
+    )
+    voiceover_id = db.scalar(
+        update(models.Voiceover).where(models.Voiceover.id == latest_id).values(**values).returning(models.Voiceover.id),
+        execution_options={"synchronize_session": False},
+    )
+    _save(db, commit)
+    return voiceover_id
 
 
 # Visual Description CRUD
-def create_visual_description(db: Session, visual_description: schemas.VisualDescriptionCreate):
-    db_desc = models.VisualDescription(**visual_description.dict())
+def create_visual_description(db: Session, visual_description: schemas.VisualDescriptionCreate, commit: bool = True):
+    db_desc = models.VisualDescription(**visual_description.model_dump())
     db.add(db_desc)
-    db.commit()
-    db.refresh(db_desc)
+    _save(db, commit)
     return db_desc
 
 
+def create_pending_visual_descriptions(db: Session, project_id: int, commit: bool = True) -> List[models.VisualDescription]:
+    """One pending visual description per scene of the project, in a single INSERT ... SELECT ... RETURNING."""
+    scenes = (
+        select(models.Scene.id, models.Scene.scene_style_id, literal(""), literal("pending"))
+        .where(models.Scene.project_id == project_id)
+        .order_by(models.Scene.order)
+    )
+    result = db.execute(
+        insert(models.VisualDescription)
+        .from_select(["scene_id", "scene_style_id", "description", "status"], scenes)
+        .returning(models.VisualDescription)
+    )
+    descs = list(result.scalars())
+    _save(db, commit)
+    return descs
+
+
 def get_visual_description(db: Session, desc_id: int):
-    return db.query(models.VisualDescription).filter(models.VisualDescription.id == desc_id).first()
+    return db.get(models.VisualDescription, desc_id)
 
 
 def get_visual_descriptions_by_scene(db: Session, scene_id: int):
-    return db.query(models.VisualDescription).filter(models.VisualDescription.scene_id == scene_id).order_by(models.VisualDescription.created_at).all()
+    return db.scalars(_VISUAL_DESCRIPTIONS_BY_SCENE, {"scene_id": scene_id}).all()
 
 
-def update_visual_description(db: Session, scene_id: int, visual_description_id: int, description: str):
+def update_visual_description(db: Session, scene_id: int, visual_description_id: int, description: str, commit: bool = True):
     """Update a visual description's text. Verifies it belongs to the scene."""
     desc = db.query(models.VisualDescription).filter(
         models.VisualDescription.id == visual_description_id,
@@ -436,17 +614,31 @@ def update_visual_description(db: Session, scene_id: int, visual_description_id:
     if not desc:
         return None
     desc.description = description
-    db.commit()
-    db.refresh(desc)
-    # Also update scene.visual_description if this is the current one
+    # Also update scene.visual_description if this is the current one (same transaction)
     scene = db.query(models.Scene).filter(models.Scene.id == scene_id).first()
     if scene and scene.current_visual_description_id == visual_description_id:
         scene.visual_description = description
-        db.commit()
+    _save(db, commit)
+    db.refresh(desc)
+    return desc
+
+
+def complete_visual_description(db: Session, visual_description_id: int, description: str, commit: bool = True):
+    """Fill in a pending visual description and make it its scene's current one (one transaction)."""
+    desc = _update_by_id(db, models.VisualDescription, visual_description_id, {"description": description, "status": "ready"}, commit=False)
+    if not desc:
+        return None
+    db.execute(
+        update(models.Scene)
+        .where(models.Scene.id == desc.scene_id)
+        .values(current_visual_description_id=desc.id, visual_description=description),
+        execution_options={"synchronize_session": False},
+    )
+    _save(db, commit)
     return desc
 
 
-def update_scene_current_description(db: Session, scene_id: int, visual_description_id: int):
+def update_scene_current_description(db: Session, scene_id: int, visual_description_id: int, commit: bool = True):
     """Set the current visual description for a scene"""
     scene = db.query(models.Scene).filter(models.Scene.id == scene_id).first()
     if not scene:
@@ -463,45 +655,90 @@ def update_scene_current_description(db: Session, scene_id: int, visual_descript
     
     scene.current_visual_description_id = visual_description_id
     scene.visual_description = desc.description  # Keep backward compatibility
-    db.commit()
+    _save(db, commit)
     db.refresh(scene)
     return scene
 
 
 # Image Reference CRUD
-def create_image_reference(db: Session, name: str, image_path: str, description: str = None):
+def create_image_reference(db: Session, name: str, image_path: str, description: str = None, commit: bool = True):
     ref = models.ImageReference(name=name, image_path=image_path, description=description)
     db.add(ref)
-    db.commit()
-    db.refresh(ref)
+    _save(db, commit)
     return ref
 
 
 def get_image_reference(db: Session, ref_id: int):
-    return db.query(models.ImageReference).filter(models.ImageReference.id == ref_id).first()
+    return db.get(models.ImageReference, ref_id)
 
 
-def get_image_references(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.ImageReference).order_by(desc(models.ImageReference.created_at)).offset(skip).limit(limit).all()
+def image_references_stmt(skip: int = 0, limit: int = 100, before_id: Optional[int] = None):
+    columns = _schema_columns(models.ImageReference, schemas.ImageReference)
+    return _page(select(*columns), models.ImageReference, skip, limit, before_id)
 
 
-def update_image_reference(db: Session, ref_id: int, update: schemas.ImageReferenceUpdate):
-    ref = db.query(models.ImageReference).filter(models.ImageReference.id == ref_id).first()
-    if not ref:
-        return None
-    update_data = update.model_dump(exclude_unset=True) if hasattr(update, 'model_dump') else update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(ref, field, value)
-    db.commit()
-    db.refresh(ref)
-    return ref
+def get_image_references(db: Session, skip: int = 0, limit: int = 100, before_id: Optional[int] = None):
+    """Rows as mappings of the ImageReference schema's columns, not ORM instances."""
+    return db.execute(image_references_stmt(skip, limit, before_id)).mappings().all()
+
+
+def update_image_reference(db: Session, ref_id: int, update: schemas.ImageReferenceUpdate, commit: bool = True):
+    update_data = update.model_dump(exclude_unset=True)
+    return _update_by_id(db, models.ImageReference, ref_id, update_data, commit)
 
 
-def delete_image_reference(db: Session, ref_id: int):
-    ref = db.query(models.ImageReference).filter(models.ImageReference.id == ref_id).first()
+def delete_image_reference(db: Session, ref_id: int, commit: bool = True):
+    ref = db.get(models.ImageReference, ref_id)
     if not ref:
         return False
     db.delete(ref)
-    db.commit()
+    _save(db, commit)
+    return True
+
+
+# Async helpers (AsyncSession, used by the async endpoints)
+async def aget(db: "AsyncSession", model, pk: int):
+    return await db.get(model, pk)
+
+
+async def aget_latest_by_project(db: "AsyncSession", model, project_id: int):
+    """Newest row of `model` (Video, Voiceover) for a project, or None."""
+    return await db.scalar(
+        select(model).where(model.project_id == project_id).order_by(desc(model.created_at)).limit(1)
+    )
+
+
+async def alist(db: "AsyncSession", model, schema, skip: int = 0, limit: int = 100, before_id: Optional[int] = None):
+    """Newest-first page of `model` rows (see _page), as mappings of only the columns `schema` returns."""
+    stmt = _page(select(*_schema_columns(model, schema)), model, skip, limit, before_id)
+    return (await db.execute(stmt)).mappings().all()
+
+
+async def acreate(db: "AsyncSession", model, values: dict):
+    """INSERT ... RETURNING and commit; the row comes back with server defaults (created_at) loaded."""
+    obj = await db.scalar(insert(model).values(**values).returning(model))
+    await cache.acommit(db)
+    return obj
+
+
+async def aupdate(db: "AsyncSession", model, pk: int, values: dict):
+    """Async _update_by_id: one UPDATE ... RETURNING, then commit. None if the id doesn't exist."""
+    if not values:
+        return await db.get(model, pk)
+    obj = await db.scalar(
+        update(model).where(model.id == pk).values(**values).returning(model),
+        execution_options={"synchronize_session": False, "populate_existing": True},
+    )
+    await cache.acommit(db)
+    return obj
+
+
+async def adelete(db: "AsyncSession", model, pk: int) -> bool:
+    """ORM delete (so relationship FKs pointing at the row are cleared like the sync helpers do), then commit."""
+    obj = await db.get(model, pk)
+    if not obj:
+        return False
+    await db.delete(obj)
+    await cache.acommit(db)
     return True
 
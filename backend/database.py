@@ -1,7 +1,9 @@
 """
 Database configuration and session management
 """
+import functools
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
@@ -12,14 +14,89 @@ load_dotenv()
 # Use SQLite for development, PostgreSQL for production
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./video_creator.db")
 
+# Compiled-statement cache entries per engine (SQLAlchemy default is 500). Sized so every distinct
+# statement the API and workers issue (incl. per-model UPDATE ... RETURNING variants) stays cached
+QUERY_CACHE_SIZE = int(os.getenv("SQLALCHEMY_QUERY_CACHE_SIZE", "1200"))
+# Rows per multi-row INSERT ... RETURNING batch for bulk inserts (e.g. scenes from segmentation)
+INSERTMANYVALUES_PAGE_SIZE = 1000
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "40"))
+# The async engine (a few small GETs, see get_async_sessionmaker) gets its own, smaller pool. One API
+# process can hold up to DB_POOL_SIZE + DB_MAX_OVERFLOW + ASYNC_DB_POOL_SIZE + ASYNC_DB_MAX_OVERFLOW
+ASYNC_DB_POOL_SIZE = int(os.getenv("ASYNC_DB_POOL_SIZE", "5"))
+ASYNC_DB_MAX_OVERFLOW = int(os.getenv("ASYNC_DB_MAX_OVERFLOW", "5"))
+# Seconds a request waits for a free pooled connection before failing (SQLAlchemy default is 30)
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "20"))
+# Replace pooled connections older than this, before server/proxy idle timeouts silently drop them
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
 if DATABASE_URL.startswith("sqlite"):
     engine = create_engine(
-        DATABASE_URL, connect_args={"check_same_thread": False}
+        DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        query_cache_size=QUERY_CACHE_SIZE,
+        insertmanyvalues_page_size=INSERTMANYVALUES_PAGE_SIZE,
     )
 else:
-    engine = create_engine(DATABASE_URL)
+    engine_kwargs = {}
+    if make_url(DATABASE_URL).get_driver_name() == "psycopg2":
+        # Also batch executemany UPDATE/DELETE (INSERTs already use insertmanyvalues)
+        engine_kwargs["executemany_mode"] = "values_plus_batch"
+    engine = create_engine(
+        DATABASE_URL,
+        query_cache_size=QUERY_CACHE_SIZE,
+        insertmanyvalues_page_size=INSERTMANYVALUES_PAGE_SIZE,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_pre_ping=True,
+        pool_recycle=DB_POOL_RECYCLE,
+        **engine_kwargs,
+    )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False: objects returned from create helpers stay loaded after commit (id and
+# server defaults such as created_at come back in the INSERT's RETURNING), so serializing them
+# doesn't cost a reload SELECT
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 Base = declarative_base()
 
+
+def _async_url(url: str):
+    """Same database as DATABASE_URL, through its asyncio driver (aiosqlite / asyncpg)."""
+    u = make_url(url)
+    if u.get_backend_name() == "sqlite":
+        return u.set(drivername="sqlite+aiosqlite")
+    if u.get_backend_name() == "postgresql":
+        return u.set(drivername="postgresql+asyncpg")
+    return u
+
+
+# Session.info flag set on the sync Session behind every AsyncSession: its event listeners run on the
+# event loop, so they must not block (see cache._bump_committed_tables)
+ASYNC_SESSION = "async_session"
+
+
+@functools.lru_cache(maxsize=None)
+def get_async_sessionmaker():
+    """
+    AsyncSession factory for the async API endpoints. Built on first use so processes that only use
+    the sync engine (Celery workers, reset_db) don't need greenlet or the asyncio drivers.
+    """
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    url = _async_url(DATABASE_URL)
+    if url.get_backend_name() == "sqlite":
+        async_engine = create_async_engine(url, query_cache_size=QUERY_CACHE_SIZE)
+    else:
+        async_engine = create_async_engine(
+            url,
+            query_cache_size=QUERY_CACHE_SIZE,
+            pool_size=ASYNC_DB_POOL_SIZE,
+            max_overflow=ASYNC_DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_pre_ping=True,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+    return async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False, info={ASYNC_SESSION: True})
+
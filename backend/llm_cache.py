@@ -0,0 +1,105 @@
+"""
+Cache for LLM text generations (scripts, script revisions, scene descriptions).
+
+Keys are the SHA-256 of the ai_services function name and its arguments, so the same title/prompt,
+or the same scene text/style/instruction, maps to the same entry whatever the model is asked
+next. Values are the generated text. Entries live in an in-process LRU and, when reachable, in
+Redis with a TTL so all API workers share them.
+
+Every generation samples with temperature > 0 and the UI's "regenerate" buttons expect a new
+variant, so the cache is off unless LLM_CACHE_TTL is set to a positive number of seconds.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", "0"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "512"))
+_KEY = "llmcache:{}"
+
+_redis = redis.Redis.from_url(
+    os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+    socket_timeout=0.25,
+    socket_connect_timeout=0.25,
+)
+
+_entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, text)
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def enabled() -> bool:
+    return LLM_CACHE_TTL > 0
+
+
+def make_key(fn_name: str, *args, **kwargs) -> str:
+    payload = json.dumps({"fn": fn_name, "args": args, "kwargs": kwargs}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get(key: str) -> Optional[str]:
+    now = time.monotonic()
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                _entries.move_to_end(key)
+                return entry[1]
+            del _entries[key]
+    try:
+        value = _redis.get(_KEY.format(key))
+    except redis.RedisError as e:
+        logger.debug("LLM cache Redis get failed: %s", e)
+        return None
+    if value is None:
+        return None
+    text = value.decode("utf-8")
+    _remember(key, text)
+    return text
+
+
+def put(key: str, text: str):
+    _remember(key, text)
+    try:
+        _redis.set(_KEY.format(key), text.encode("utf-8"), ex=LLM_CACHE_TTL)
+    except redis.RedisError as e:
+        logger.debug("LLM cache Redis set failed: %s", e)
+
+
+def _remember(key: str, text: str):
+    with _lock:
+        _entries[key] = (time.monotonic() + LLM_CACHE_TTL, text)
+        _entries.move_to_end(key)
+        if len(_entries) > LLM_CACHE_MAX_ENTRIES:
+            _entries.popitem(last=False)
+
+
+def call(fn, *args, **kwargs) -> str:
+    """Return fn(*args, **kwargs), served from the cache when the same call was made within the TTL."""
+    if not enabled():
+        return fn(*args, **kwargs)
+    key = make_key(fn.__qualname__, *args, **kwargs)
+    text = get(key)
+    if text is not None:
+        _stats["hits"] += 1
+        return text
+    _stats["misses"] += 1
+    text = fn(*args, **kwargs)
+    if text:
+        put(key, text)
+    return text
+
+
+def stats() -> dict:
+    with _lock:
+        size = len(_entries)
+    return {"enabled": enabled(), "ttl": LLM_CACHE_TTL, "hits": _stats["hits"], "misses": _stats["misses"], "entries": size}
@@ -1,65 +1,200 @@
 """
 FastAPI backend for AI Video Creator workflow
 """
-from fastapi import FastAPI, HTTPException, Depends, File, UploadFile, Form, Body
+from fastapi import APIRouter, FastAPI, HTTPException, Depends, File, UploadFile, Form, Body, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi.routing import APIRoute
 from fastapi.staticfiles import StaticFiles
-from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from celery import group
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, configure_mappers
+from contextlib import asynccontextmanager
 from typing import Optional, List
+import errno
+import hashlib
+import logging
+import orjson
 import os
 import re
 import shutil
 import uuid
 from dotenv import load_dotenv
 
-from .database import SessionLocal, engine, Base
-from . import models, schemas, crud, ai_services
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from .database import SessionLocal, engine, Base, get_async_sessionmaker
+from . import models, schemas, crud, ai_services, llm_cache, render_progress, semantic_cache
+from .cache import NotModifiedMiddleware, cached, list_adapter
+from .fs_fast import ensure_dir, fast_copy
+from .tasks import (
+    create_video_task,
+    generate_image_task,
+    generate_scene_description_task,
+    generate_voiceover_task,
+    iterate_scene_description_task,
+    render_video_task,
+    segment_project_task,
+)
 
 load_dotenv()
 
-# Create database tables
-# Note: create_all() only creates missing tables, it doesn't alter existing ones
-# If you get schema errors, reset the database by running: python -m backend.reset_db --force
-Base.metadata.create_all(bind=engine)
+# Configure logging once for the API process (Celery workers set up their own handlers)
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Resolve all relationships now rather than on the first request (also surfaces mapping errors at boot)
+configure_mappers()
+
+
+# Written after a successful column/index backfill; holds a fingerprint of the database URL and the
+# models' tables, columns and indexes, so later boots skip the inspection until the models change
+SCHEMA_MARKER = os.path.join("storage", ".schema_ok")
+SCHEMA_LOCK = os.path.join("storage", ".migrate.lock")
+
+
+def _schema_fingerprint() -> str:
+    parts = [engine.url.render_as_string(hide_password=True)]
+    for table in sorted(Base.metadata.tables.values(), key=lambda t: t.name):
+        columns = ",".join(col.name for col in table.columns)
+        indexes = ",".join(sorted(index.name for index in table.indexes))
+        parts.append(f"{table.name}:{columns}:{indexes}")
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def _read_schema_marker() -> Optional[str]:
+    try:
+        with open(SCHEMA_MARKER) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def init_db():
+    """Create missing tables, then add columns/indexes that create_all() can't add to existing tables."""
+    # Note: create_all() only creates missing tables, it doesn't alter existing ones
+    # If you get schema errors, reset the database by running: python -m backend.reset_db --force
+    Base.metadata.create_all(bind=engine)
+
+    # Columns/indexes were already backfilled for these models (delete storage/.schema_ok to re-check)
+    fingerprint = _schema_fingerprint()
+    if _read_schema_marker() == fingerprint:
+        return
+
+    # Check for common schema issues and auto-migrate new columns
+    try:
+        from sqlalchemy import inspect, text as sa_text
+        inspector = inspect(engine)
+        tables = inspector.get_table_names()
+        if 'scenes' in tables:
+            columns = [col['name'] for col in inspector.get_columns('scenes')]
+            if 'project_id' not in columns:
+                logger.warning(
+                    "Database schema mismatch detected: the 'scenes' table is missing the 'project_id' column. "
+                    "To fix this, run: python -m backend.reset_db --force (WARNING: this deletes all existing data!)"
+                )
+        if 'videos' in tables:
+            vid_cols = [col['name'] for col in inspector.get_columns('videos')]
+            if 'voiceover_id' not in vid_cols:
+                with engine.begin() as conn:
+                    conn.execute(sa_text("ALTER TABLE videos ADD COLUMN voiceover_id INTEGER REFERENCES voiceovers(id)"))
+                logger.info("[MIGRATE] Added voiceover_id column to videos table")
+        if 'voiceovers' in tables:
+            vo_cols = [col['name'] for col in inspector.get_columns('voiceovers')]
+            if 'caption_groups' not in vo_cols:
+                with engine.begin() as conn:
+                    conn.execute(sa_text("ALTER TABLE voiceovers ADD COLUMN caption_groups TEXT"))
+                logger.info("[MIGRATE] Added caption_groups column to voiceovers table")
+        if 'visual_descriptions' in tables:
+            vd_cols = [col['name'] for col in inspector.get_columns('visual_descriptions')]
+            if 'status' not in vd_cols:
+                with engine.begin() as conn:
+                    conn.execute(sa_text("ALTER TABLE visual_descriptions ADD COLUMN status VARCHAR DEFAULT 'ready'"))
+                logger.info("[MIGRATE] Added status column to visual_descriptions table")
+        # create_all() skips indexes on tables that already exist; add any missing composite indexes
+        for table in Base.metadata.tables.values():
+            if table.name not in tables:
+                continue
+            existing_indexes = {ix['name'] for ix in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(bind=engine)
+                    logger.info("[MIGRATE] Added index %s on %s", index.name, table.name)
+    except Exception:
+        # Don't crash startup; without the marker the whole check runs again on the next boot
+        logger.exception("Schema backfill failed; will retry on next start")
+        return
+    with open(SCHEMA_MARKER, "w") as f:
+        f.write(fingerprint)
 
-# Check for common schema issues and auto-migrate new columns
-try:
-    from sqlalchemy import inspect, text as sa_text
-    inspector = inspect(engine)
-    tables = inspector.get_table_names()
-    if 'scenes' in tables:
-        columns = [col['name'] for col in inspector.get_columns('scenes')]
-        if 'project_id' not in columns:
-            print("\n" + "="*60)
-            print("WARNING: Database schema mismatch detected!")
-            print("The 'scenes' table is missing the 'project_id' column.")
-            print("\nTo fix this, run:")
-            print("  python -m backend.reset_db --force")
-            print("\nWARNING: This will delete all existing data!")
-            print("="*60 + "\n")
-    if 'videos' in tables:
-        vid_cols = [col['name'] for col in inspector.get_columns('videos')]
-        if 'voiceover_id' not in vid_cols:
-            with engine.begin() as conn:
-                conn.execute(sa_text("ALTER TABLE videos ADD COLUMN voiceover_id INTEGER REFERENCES voiceovers(id)"))
-            print("[MIGRATE] Added voiceover_id column to videos table")
-    if 'voiceovers' in tables:
-        vo_cols = [col['name'] for col in inspector.get_columns('voiceovers')]
-        if 'caption_groups' not in vo_cols:
-            with engine.begin() as conn:
-                conn.execute(sa_text("ALTER TABLE voiceovers ADD COLUMN caption_groups TEXT"))
-            print("[MIGRATE] Added caption_groups column to voiceovers table")
-except Exception:
-    pass  # Ignore inspection errors during startup
 
 # Create base storage directories
 os.makedirs("storage", exist_ok=True)
 os.makedirs("storage/image_references", exist_ok=True)
+os.makedirs("storage/removed", exist_ok=True)
+
+
+class CompactRoute(APIRoute):
+    """
+    Route whose response_model output leaves out None-valued fields: most Optional columns (approved
+    image, style ids, captions, ...) are null on most rows, so "field": null was a large share of each
+    payload. Clients read a missing key as undefined, which they already treat like null.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs["response_model_exclude_none"] = True
+        super().__init__(*args, **kwargs)
+
+
+# Schema bootstrap runs once per process at startup instead of at import. Set AUTO_CREATE_SCHEMA=false
+# when Alembic manages the schema (e.g. several production workers)
+AUTO_CREATE_SCHEMA = os.getenv("AUTO_CREATE_SCHEMA", "true").lower() in ("1", "true", "yes")
+
+
+def create_schema():
+    if not AUTO_CREATE_SCHEMA:
+        return
+    # Every worker runs this hook: serialize them so only one issues the ALTER TABLEs
+    with open(SCHEMA_LOCK, "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)  # released when the file is closed
+        init_db()
 
-app = FastAPI(title="AI Video Creator", version="1.0.0")
+# Sync endpoints run in AnyIO's worker threadpool (40 threads by default); size it with the DB pool
+API_THREADPOOL_SIZE = int(os.getenv("API_THREADPOOL_SIZE", "40"))
 
-# Serve static files (images and videos)
-app.mount("/storage", StaticFiles(directory="storage"), name="storage")
+
+def configure_threadpool():
+    from anyio import to_thread
+    to_thread.current_default_thread_limiter().total_tokens = API_THREADPOOL_SIZE
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    configure_threadpool()
+    # The schema check blocks on a file lock and DDL, so keep it off the event loop
+    await run_in_threadpool(create_schema)
+    yield
+
+
+app = FastAPI(
+    title="AI Video Creator", version="1.0.0", default_response_class=ORJSONResponse, lifespan=lifespan
+)
+app.router.route_class = CompactRoute
+
+# Serve static files (images and videos). In production set SERVE_STORAGE=false and let nginx/a CDN
+# serve /storage with sendfile so downloads don't occupy API workers (see README "Serving storage").
+SERVE_STORAGE = os.getenv("SERVE_STORAGE", "true").lower() in ("1", "true", "yes")
+if SERVE_STORAGE:
+    app.mount("/storage", StaticFiles(directory="storage"), name="storage")
 
 # CORS middleware for frontend
 app.add_middleware(
@@ -69,6 +204,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Cached GET endpoints send an ETag; answer a matching If-None-Match with an empty 304
+app.add_middleware(NotModifiedMiddleware)
 
 # Dependency to get DB session
 def get_db():
@@ -79,6 +216,70 @@ def get_db():
         db.close()
 
 
+# Async dependency for read endpoints declared `async def`: they run on the event loop instead of
+# taking a worker thread, so simple GETs don't queue behind slow sync handlers
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_MB", "25")) * 1024 * 1024
+UPLOAD_CHUNK_BYTES = 1 << 20
+ALLOWED_IMAGE_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".webp"})
+
+
+def save_upload(file: UploadFile, full_path: str):
+    """
+    Copy an upload to disk in 1 MiB chunks (constant memory, no full-file bytes object). Called from
+    sync endpoints, so the blocking I/O runs in the threadpool. Rejects files over MAX_UPLOAD_MB.
+    """
+    written = 0
+    try:
+        with open(full_path, "wb") as out:
+            while chunk := file.file.read(UPLOAD_CHUNK_BYTES):
+                written += len(chunk)
+                if written > MAX_UPLOAD_BYTES:
+                    raise HTTPException(status_code=413, detail=f"File exceeds {MAX_UPLOAD_BYTES // (1024 * 1024)} MB")
+                out.write(chunk)
+    except HTTPException:
+        os.remove(full_path)
+        raise
+    except Exception as e:
+        if os.path.exists(full_path):
+            os.remove(full_path)
+        raise HTTPException(status_code=500, detail=f"Failed to save file: {e}")
+
+
+STREAM_CHUNK_ROWS = 50
+
+
+def stream_json_array(stmt, schema) -> StreamingResponse:
+    """
+    Stream a SELECT's rows as a JSON array, STREAM_CHUNK_ROWS at a time (yield_per), so the first
+    bytes go out before the whole result is loaded. Uses its own session: the generator outlives
+    the request's get_db() session. stmt selects either one entity or the schema's columns.
+    """
+    by_columns = len(stmt.column_descriptions) > 1
+
+    def generate():
+        db = SessionLocal()
+        try:
+            yield b"["
+            sep = b""
+            result = db.execute(stmt.execution_options(yield_per=STREAM_CHUNK_ROWS))
+            result = result.mappings() if by_columns else result.scalars()
+            adapter = list_adapter(schema)
+            for rows in result.partitions():
+                # Validate and dump the whole chunk in pydantic-core; drop the chunk's own [ ]
+                yield sep + adapter.dump_json(adapter.validate_python(rows, from_attributes=True), exclude_none=True)[1:-1]
+                sep = b","
+            yield b"]"
+        finally:
+            db.close()
+
+    return StreamingResponse(generate(), media_type="application/json")
+
+
 # Project endpoints
 @app.post("/api/projects", response_model=schemas.Project)
 def create_project(project: schemas.ProjectCreate, db: Session = Depends(get_db)):
@@ -87,15 +288,27 @@ def create_project(project: schemas.ProjectCreate, db: Session = Depends(get_db)
 
 
 @app.get("/api/projects", response_model=list[schemas.Project])
-def list_projects(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """List all projects"""
-    return crud.get_projects(db=db, skip=skip, limit=limit)
+@cached(models.Project, schema=schemas.Project)
+def list_projects(skip: int = 0, limit: int = 100, before_id: Optional[int] = None, db: Session = Depends(get_db)):
+    """List all projects, newest first (next page: before_id=<last id>, cheaper than skip)"""
+    return crud.get_projects(db=db, skip=skip, limit=limit, before_id=before_id)
 
 
 @app.get("/api/projects/{project_id}", response_model=schemas.Project)
-def get_project(project_id: int, db: Session = Depends(get_db)):
+@cached(models.Project, schema=schemas.Project)
+async def get_project(project_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a specific project"""
-    project = crud.get_project(db=db, project_id=project_id)
+    project = await crud.aget(db, models.Project, project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return project
+
+
+@app.get("/api/projects/{project_id}/full", response_model=schemas.ProjectFull)
+@cached(models.Project, models.Scene, models.Image, schema=schemas.ProjectFull)
+def get_project_full(project_id: int, db: Session = Depends(get_db)):
+    """Get a project with all scenes and their images (replaces GET project + scenes + images per scene)"""
+    project = crud.get_project_full(db=db, project_id=project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     return project
@@ -110,31 +323,47 @@ def update_project(project_id: int, project: schemas.ProjectUpdate, db: Session
     return updated
 
 
-@app.delete("/api/projects/{project_id}")
-def delete_project(project_id: int, db: Session = Depends(get_db)):
-    """Delete a project and all associated data"""
-    deleted = crud.delete_project(db=db, project_id=project_id)
-    if not deleted:
-        raise HTTPException(status_code=404, detail="Project not found")
-    
-    # Move project's storage folder to removed directory
+def move_project_storage(project_id: int):
+    """Move a deleted project's storage folder to storage/removed (runs as a background task)."""
     project_storage_path = os.path.join("storage", f"project_{project_id}")
     removed_dir = os.path.join("storage", "removed")
     removed_project_path = os.path.join(removed_dir, f"project_{project_id}")
-    
-    if os.path.exists(project_storage_path):
+
+    try:
         try:
-            # Create removed directory if it doesn't exist
+            # Same filesystem: O(1) atomic rename, no matter how large the project is
+            os.replace(project_storage_path, removed_project_path)
+        except FileNotFoundError:
+            if not os.path.isdir(project_storage_path):
+                return  # Project never had any storage
+            # storage/removed (created at startup) has been deleted since
             os.makedirs(removed_dir, exist_ok=True)
-            # Move the folder to removed directory
-            if os.path.exists(removed_project_path):
-                # If destination already exists, remove it first
-                shutil.rmtree(removed_project_path)
-            shutil.move(project_storage_path, removed_project_path)
-        except Exception as e:
-            # Log error but don't fail the deletion
-            print(f"Warning: Could not move storage folder for project {project_id}: {e}")
-    
+            os.replace(project_storage_path, removed_project_path)
+        except OSError as e:
+            if e.errno in (errno.EEXIST, errno.ENOTEMPTY):
+                # An older removed copy is in the way: rename it aside, then delete it
+                stale_path = f"{removed_project_path}.stale_{uuid.uuid4().hex[:8]}"
+                os.replace(removed_project_path, stale_path)
+                os.replace(project_storage_path, removed_project_path)
+                shutil.rmtree(stale_path, ignore_errors=True)
+            elif e.errno == errno.EXDEV:
+                # Only a cross-device move falls back to copying
+                shutil.move(project_storage_path, removed_project_path)
+            else:
+                raise
+    except Exception as e:
+        # Log error but don't fail the deletion
+        logger.warning("Could not move storage folder for project %s: %s", project_id, e)
+
+
+@app.delete("/api/projects/{project_id}")
+def delete_project(project_id: int, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+    """Delete a project and all associated data"""
+    deleted = crud.delete_project(db=db, project_id=project_id)
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Project not found")
+    # The DB delete is committed; move the storage folder after the response, off the request path
+    background_tasks.add_task(move_project_storage, project_id)
     return {"message": "Project deleted successfully"}
 
 
@@ -145,7 +374,10 @@ def generate_script_endpoint(body: schemas.ScriptGenerationRequest, db: Session
     if not script_prompt:
         raise HTTPException(status_code=404, detail="Script prompt not found")
     try:
-        script_content = ai_services.generate_script(
+        script_content = semantic_cache.call(
+            ai_services.generate_script,
+            match_text=f"{body.title or ''}\n{body.description or ''}",
+            context={"model": body.model, "instructions": script_prompt.script_description},
             title=body.title or "",
             description=body.description,
             script_prompt_instructions=script_prompt.script_description,
@@ -169,7 +401,10 @@ def iterate_script(project_id: int, body: schemas.ScriptIterateRequest, db: Sess
         db=db, project_id=project_id, k=ai_services.SCRIPT_ITERATION_WINDOW_SIZE
     )
     try:
-        revised = ai_services.revise_script_with_feedback(
+        revised = semantic_cache.call(
+            ai_services.revise_script_with_feedback,
+            match_text=body.feedback.strip(),
+            context={"model": body.model, "script": current_script, "previous_feedback": previous_feedbacks},
             current_script=current_script,
             previous_feedback_list=previous_feedbacks,
             new_feedback=body.feedback.strip(),
@@ -178,26 +413,21 @@ def iterate_script(project_id: int, body: schemas.ScriptIterateRequest, db: Sess
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Script revision failed: {str(e)}")
     iteration = crud.create_script_iteration(
-        db=db, project_id=project_id, user_feedback=body.feedback.strip(), revised_script=revised
+        db=db, project_id=project_id, user_feedback=body.feedback.strip(), revised_script=revised, commit=False
     )
-    crud.update_project(db=db, project_id=project_id, project=schemas.ProjectUpdate(script_content=revised))
+    crud.update_project(db=db, project_id=project_id, project=schemas.ProjectUpdate(script_content=revised), commit=False)
+    db.commit()
     return schemas.ScriptIterateResponse(script_content=revised, round_number=iteration.round_number)
 
 
 @app.post("/api/projects/{project_id}/approve")
-def approve_project(project_id: int, db: Session = Depends(get_db)):
+def approve_project(project_id: int, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     """Approve project script and trigger scene segmentation"""
-    project = crud.get_project(db=db, project_id=project_id)
-    if not project:
+    if not crud.set_status(db, models.Project, project_id, models.Status.APPROVED.value):
         raise HTTPException(status_code=404, detail="Project not found")
     
-    # Update status
-    project.status = "approved"
-    db.commit()
-    
-    # Trigger scene segmentation
-    from .tasks import segment_project_task
-    segment_project_task.delay(project_id)
+    # Trigger scene segmentation (enqueued after the response is sent)
+    background_tasks.add_task(segment_project_task.delay, project_id)
     
     return {"message": "Project approved, scene segmentation started"}
 
@@ -212,9 +442,9 @@ def get_segmentation_preview(project_id: int, db: Session = Depends(get_db)):
     project = crud.get_project(db=db, project_id=project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    scenes = crud.get_scenes_by_project(db=db, project_id=project_id)
-    if scenes:
-        preview_text = SEGMENT_DELIMITER.join(s.text.strip() for s in scenes)
+    texts = crud.get_scene_texts(db=db, project_id=project_id)
+    if texts:
+        preview_text = SEGMENT_DELIMITER.join(t.strip() for t in texts)
     else:
         preview_text = (project.script_content or "").strip()
     return schemas.SegmentationPreviewResponse(preview_text=preview_text)
@@ -223,24 +453,28 @@ def get_segmentation_preview(project_id: int, db: Session = Depends(get_db)):
 @app.put("/api/projects/{project_id}/segmentation-preview", response_model=list[schemas.Scene])
 def update_segmentation_preview(project_id: int, body: schemas.SegmentationPreviewUpdate, db: Session = Depends(get_db)):
     """Parse preview text by '---' (on its own line), replace all scenes for this project."""
-    project = crud.get_project(db=db, project_id=project_id)
-    if not project:
+    if not crud.exists(db, models.Project, project_id):
         raise HTTPException(status_code=404, detail="Project not found")
     raw = (body.preview_text or "").strip()
-    segments = [s.strip() for s in re.split(r"\n---\n", raw) if s.strip()]
+    # Plain str.split: the delimiter has no regex metacharacters; strip each segment once
+    segments = [seg for seg in (part.strip() for part in raw.split(SEGMENT_DELIMITER)) if seg]
     if not segments:
         raise HTTPException(status_code=400, detail="At least one non-empty segment is required (use --- on its own line to separate scenes)")
-    crud.delete_scenes_by_project(db=db, project_id=project_id)
-    for i, text in enumerate(segments):
-        crud.create_scene(
-            db=db,
-            scene=schemas.SceneCreate(project_id=project_id, text=text, order=i + 1),
-        )
-    return crud.get_scenes_by_project(db=db, project_id=project_id)
+    # Replace scenes in a single transaction (one commit instead of one per scene)
+    crud.delete_scenes_by_project(db=db, project_id=project_id, commit=False)
+    scenes = crud.bulk_create_scenes(
+        db=db,
+        scenes=[schemas.SceneCreate(project_id=project_id, text=text, order=i + 1) for i, text in enumerate(segments)],
+        commit=False,
+    )
+    db.commit()
+    # INSERT ... RETURNING already gave us the rows in order; no need to SELECT them back
+    return scenes
 
 
 # Scene endpoints
 @app.get("/api/projects/{project_id}/scenes", response_model=list[schemas.Scene])
+@cached(models.Scene, schema=schemas.Scene)
 def get_scenes(project_id: int, db: Session = Depends(get_db)):
     """Get all scenes for a project"""
     return crud.get_scenes_by_project(db=db, project_id=project_id)
@@ -249,8 +483,7 @@ def get_scenes(project_id: int, db: Session = Depends(get_db)):
 @app.post("/api/projects/{project_id}/scenes/insert", response_model=schemas.Scene)
 def insert_scene(project_id: int, body: schemas.InsertSceneRequest, db: Session = Depends(get_db)):
     """Insert a new scene at a specific position (after_order=0 inserts at beginning)"""
-    project = crud.get_project(db=db, project_id=project_id)
-    if not project:
+    if not crud.exists(db, models.Project, project_id):
         raise HTTPException(status_code=404, detail="Project not found")
     new_scene = crud.insert_scene_at(db=db, project_id=project_id, after_order=body.after_order, text=body.text)
     return new_scene
@@ -276,63 +509,32 @@ def update_scene(scene_id: int, scene: schemas.SceneUpdate, db: Session = Depend
 
 
 @app.post("/api/scenes/{scene_id}/generate-visual-description")
-def generate_scene_visual_description(scene_id: int, continue_from_previous_scene: bool = False, body: Optional[schemas.GenerateVisualDescriptionRequest] = Body(default=None), db: Session = Depends(get_db)):
-    """Generate a scene description for a scene using AI"""
+def generate_scene_visual_description(scene_id: int, background_tasks: BackgroundTasks, continue_from_previous_scene: bool = False, body: Optional[schemas.GenerateVisualDescriptionRequest] = Body(default=None), db: Session = Depends(get_db)):
+    """Start generating a scene description with AI (poll the scene's visual descriptions for the result)"""
     scene = crud.get_scene(db=db, scene_id=scene_id)
     if not scene:
         raise HTTPException(status_code=404, detail="Scene not found")
     
     instruction = (body.instruction or "").strip() if body else None
     
-    # Get scene style if available
-    scene_style_description = None
-    scene_style_params = None
-    if scene.scene_style_id:
-        scene_style = crud.get_scene_style(db=db, style_id=scene.scene_style_id)
-        if scene_style:
-            scene_style_description = scene_style.description
-            scene_style_params = scene_style.parameters
-    
-    # Get previous scene description if continue_from_previous_scene
-    previous_scene_description = None
-    if continue_from_previous_scene:
-        scenes = crud.get_scenes_by_project(db=db, project_id=scene.project_id)
-        prev_scene = next((s for s in scenes if s.order == scene.order - 1), None)
-        if prev_scene and prev_scene.visual_description:
-            previous_scene_description = prev_scene.visual_description
-    
-    # Generate scene description using AI with scene style
-    from . import ai_services
-    visual_description = ai_services.generate_scene_description(
-        scene.text, 
-        scene_style_description=scene_style_description,
-        scene_style_params=scene_style_params,
-        previous_scene_description=previous_scene_description,
-        instruction=instruction
-    )
-    
-    # Save to visual descriptions history
+    # Pending history entry; the worker fills it in and makes it the scene's current description
     visual_desc = crud.create_visual_description(
         db=db,
         visual_description=schemas.VisualDescriptionCreate(
             scene_id=scene_id,
-            description=visual_description,
-            scene_style_id=scene.scene_style_id
+            description="",
+            scene_style_id=scene.scene_style_id,
+            status="pending"
         )
     )
+    background_tasks.add_task(generate_scene_description_task.delay, visual_desc.id, instruction, continue_from_previous_scene)
     
-    # Set as current visual description
-    scene.current_visual_description_id = visual_desc.id
-    scene.visual_description = visual_description  # Keep backward compatibility
-    db.commit()
-    db.refresh(scene)
-    
-    return {"message": "Scene description generated", "visual_description": visual_description, "visual_description_id": visual_desc.id}
+    return {"message": "Scene description generation started", "visual_description_id": visual_desc.id, "status": "pending"}
 
 
 @app.post("/api/scenes/{scene_id}/iterate-visual-description")
-def iterate_scene_visual_description(scene_id: int, body: schemas.VisualDescriptionIterateRequest, db: Session = Depends(get_db)):
-    """Iterate on the current scene description using user comments/feedback"""
+def iterate_scene_visual_description(scene_id: int, body: schemas.VisualDescriptionIterateRequest, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+    """Start revising the current scene description with user comments/feedback"""
     scene = crud.get_scene(db=db, scene_id=scene_id)
     if not scene:
         raise HTTPException(status_code=404, detail="Scene not found")
@@ -341,28 +543,24 @@ def iterate_scene_visual_description(scene_id: int, body: schemas.VisualDescript
         raise HTTPException(status_code=400, detail="No scene description to iterate on. Generate one first.")
     if not body.comments.strip():
         raise HTTPException(status_code=400, detail="Please provide comments for the update.")
-    from . import ai_services
-    updated_description = ai_services.iterate_scene_description(base_description, body.comments.strip())
     visual_desc = crud.create_visual_description(
         db=db,
         visual_description=schemas.VisualDescriptionCreate(
             scene_id=scene_id,
-            description=updated_description,
-            scene_style_id=scene.scene_style_id
+            description="",
+            scene_style_id=scene.scene_style_id,
+            status="pending"
         )
     )
-    scene.current_visual_description_id = visual_desc.id
-    scene.visual_description = updated_description
-    db.commit()
-    db.refresh(scene)
-    return {"message": "Scene description updated", "visual_description": updated_description, "visual_description_id": visual_desc.id}
+    background_tasks.add_task(iterate_scene_description_task.delay, visual_desc.id, base_description, body.comments.strip())
+    return {"message": "Scene description update started", "visual_description_id": visual_desc.id, "status": "pending"}
 
 
 @app.get("/api/scenes/{scene_id}/visual-descriptions", response_model=list[schemas.VisualDescription])
+@cached(models.Scene, models.VisualDescription, schema=schemas.VisualDescription)
 def get_scene_visual_descriptions(scene_id: int, db: Session = Depends(get_db)):
     """Get all scene descriptions for a scene"""
-    scene = crud.get_scene(db=db, scene_id=scene_id)
-    if not scene:
+    if not crud.exists(db, models.Scene, scene_id):
         raise HTTPException(status_code=404, detail="Scene not found")
     return crud.get_visual_descriptions_by_scene(db=db, scene_id=scene_id)
 
@@ -397,15 +595,15 @@ PROMPT_MAX_CHARS = 1500  # Leonardo API limit per docs
 
 
 @app.post("/api/scenes/{scene_id}/generate-image")
-def generate_scene_image(scene_id: int, visual_style_id: int = None, model_id: str = None, body: Optional[GenerateImageRequest] = Body(default=None), db: Session = Depends(get_db)):
+def generate_scene_image(scene_id: int, background_tasks: BackgroundTasks, visual_style_id: int = None, model_id: str = None, body: Optional[GenerateImageRequest] = Body(default=None), db: Session = Depends(get_db)):
     """Trigger image generation for a scene with optional model selection"""
-    print(f"[WORKFLOW] 8. API: generate-image received scene_id={scene_id} visual_style_id={visual_style_id} model_id={model_id} body={body}")
+    logger.debug("[WORKFLOW] 8. API: generate-image received scene_id=%s visual_style_id=%s model_id=%s body=%s", scene_id, visual_style_id, model_id, body)
     scene = crud.get_scene(db=db, scene_id=scene_id)
     if not scene:
         raise HTTPException(status_code=404, detail="Scene not found")
     
     scene_description = body.scene_description if body and body.scene_description else None
-    print(f"[WORKFLOW] 9. API: scene_description from body={scene_description is not None} (len={len(scene_description) if scene_description else 0})")
+    logger.debug("[WORKFLOW] 9. API: scene_description from body=%s (len=%d)", scene_description is not None, len(scene_description or ""))
     
     # Build prompt to validate length before queuing (Leonardo limit: 1500 chars)
     visual_style_description = None
@@ -424,22 +622,25 @@ def generate_scene_image(scene_id: int, visual_style_id: int = None, model_id: s
         )
     
     continue_from_previous_scene = bool(body and body.continue_from_previous_scene)
-    from .tasks import generate_image_task
-    generate_image_task.delay(scene_id, visual_style_id, model_id, scene_description, continue_from_previous_scene)
-    print(f"[WORKFLOW] 10. API: Task queued, returning")
+    background_tasks.add_task(
+        generate_image_task.delay, scene_id, visual_style_id, model_id, scene_description, continue_from_previous_scene,
+        prompt=prompt,  # already validated: the worker doesn't rebuild it
+    )
+    logger.debug("[WORKFLOW] 10. API: Task queued, returning")
     
     return {"message": "Image generation started"}
 
 
 # Image endpoints
 @app.get("/api/scenes/{scene_id}/images", response_model=list[schemas.Image])
+@cached(models.Image, schema=schemas.Image)
 def get_images(scene_id: int, db: Session = Depends(get_db)):
     """Get all images for a scene"""
     return crud.get_images_by_scene(db=db, scene_id=scene_id)
 
 
 @app.post("/api/scenes/{scene_id}/images/upload", response_model=schemas.Image)
-async def upload_scene_image(scene_id: int, file: UploadFile = File(...), db: Session = Depends(get_db)):
+def upload_scene_image(scene_id: int, file: UploadFile = File(...), db: Session = Depends(get_db)):
     """Add an image to a scene by uploading from device storage"""
     scene = crud.get_scene(db=db, scene_id=scene_id)
     if not scene:
@@ -447,25 +648,16 @@ async def upload_scene_image(scene_id: int, file: UploadFile = File(...), db: Se
     if not file.filename:
         raise HTTPException(status_code=400, detail="No file provided")
     ext = os.path.splitext(file.filename)[1].lower()
-    if ext not in (".jpg", ".jpeg", ".png", ".webp"):
+    if ext not in ALLOWED_IMAGE_EXTENSIONS or not (file.content_type or "image/").startswith("image/"):
         raise HTTPException(status_code=400, detail="File must be JPG, PNG, or WebP")
     project_id = scene.project_id
     output_dir = os.path.join("storage", f"project_{project_id}", "images", f"scene_{scene_id}")
-    os.makedirs(output_dir, exist_ok=True)
+    ensure_dir(output_dir)
     stored_name = f"uploaded_{uuid.uuid4().hex[:12]}{ext}"
     rel_path = f"project_{project_id}/images/scene_{scene_id}/{stored_name}"
     full_path = os.path.join("storage", rel_path)
-    try:
-        contents = await file.read()
-        with open(full_path, "wb") as f:
-            f.write(contents)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to save file: {e}")
-    image = crud.create_image(db=db, image=schemas.ImageCreate(scene_id=scene_id, prompt="Uploaded image"))
-    crud.update_image(db=db, image_id=image.id, file_path=rel_path.replace("\\", "/"), status="pending")
-    db.refresh(image)
-    image = crud.get_image(db=db, image_id=image.id)
-    return image
+    save_upload(file, full_path)
+    return crud.create_image(db=db, image=schemas.ImageCreate(scene_id=scene_id, prompt="Uploaded image"), file_path=rel_path.replace("\\", "/"))
 
 
 @app.post("/api/scenes/{scene_id}/images/from-reference", response_model=schemas.Image)
@@ -482,29 +674,24 @@ def add_image_from_reference(scene_id: int, body: schemas.AddImageFromReferenceR
         raise HTTPException(status_code=404, detail="Image reference file not found")
     project_id = scene.project_id
     output_dir = os.path.join("storage", f"project_{project_id}", "images", f"scene_{scene_id}")
-    os.makedirs(output_dir, exist_ok=True)
+    ensure_dir(output_dir)
     ext = os.path.splitext(ref.image_path)[1] or ".png"
     stored_name = f"from_ref_{ref.id}_{uuid.uuid4().hex[:8]}{ext}"
     rel_path = f"project_{project_id}/images/scene_{scene_id}/{stored_name}"
     full_path = os.path.join("storage", rel_path)
     try:
-        shutil.copy2(src_path, full_path)
+        fast_copy(src_path, full_path)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to copy file: {e}")
-    image = crud.create_image(db=db, image=schemas.ImageCreate(scene_id=scene_id, prompt=f"From library: {ref.name}"))
-    crud.update_image(db=db, image_id=image.id, file_path=rel_path.replace("\\", "/"), status="pending")
-    db.refresh(image)
-    image = crud.get_image(db=db, image_id=image.id)
-    return image
+    return crud.create_image(db=db, image=schemas.ImageCreate(scene_id=scene_id, prompt=f"From library: {ref.name}"), file_path=rel_path.replace("\\", "/"))
 
 
 @app.get("/api/projects/{project_id}/images", response_model=list[schemas.Image])
 def get_project_images(project_id: int, db: Session = Depends(get_db)):
     """Get all images from all scenes in a project"""
-    project = crud.get_project(db=db, project_id=project_id)
-    if not project:
+    if not crud.exists(db, models.Project, project_id):
         raise HTTPException(status_code=404, detail="Project not found")
-    return crud.get_images_by_project(db=db, project_id=project_id)
+    return stream_json_array(crud.images_by_project_stmt(project_id), schemas.Image)
 
 
 @app.post("/api/scenes/{scene_id}/images/from-project-image", response_model=schemas.Image)
@@ -526,61 +713,145 @@ def add_image_from_project(scene_id: int, body: schemas.AddImageFromProjectReque
         raise HTTPException(status_code=404, detail="Source image file not found")
     project_id = scene.project_id
     output_dir = os.path.join("storage", f"project_{project_id}", "images", f"scene_{scene_id}")
-    os.makedirs(output_dir, exist_ok=True)
+    ensure_dir(output_dir)
     ext = os.path.splitext(src_image.file_path)[1] or ".png"
     stored_name = f"from_project_{src_image.id}_{uuid.uuid4().hex[:8]}{ext}"
     rel_path = f"project_{project_id}/images/scene_{scene_id}/{stored_name}"
     full_path = os.path.join("storage", rel_path)
     try:
-        shutil.copy2(src_path, full_path)
+        fast_copy(src_path, full_path)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to copy file: {e}")
-    image = crud.create_image(db=db, image=schemas.ImageCreate(scene_id=scene_id, prompt=f"From project: Scene {src_scene.order}"))
-    crud.update_image(db=db, image_id=image.id, file_path=rel_path.replace("\\", "/"), status="pending")
-    db.refresh(image)
-    image = crud.get_image(db=db, image_id=image.id)
-    return image
+    return crud.create_image(db=db, image=schemas.ImageCreate(scene_id=scene_id, prompt=f"From project: Scene {src_scene.order}"), file_path=rel_path.replace("\\", "/"))
 
 
 @app.post("/api/images/{image_id}/approve")
 def approve_image(image_id: int, db: Session = Depends(get_db)):
     """Approve an image and save it as the scene's approved image (used when continuing from previous scene)"""
-    image = crud.get_image(db=db, image_id=image_id)
-    if not image:
+    row = crud.set_status(
+        db, models.Image, image_id, models.Status.APPROVED.value, models.Image.scene_id, commit=False
+    )
+    if not row:
         raise HTTPException(status_code=404, detail="Image not found")
     
-    image.status = "approved"
     # Save approved image to scene so it's used as reference when continuing from previous scene
-    scene = crud.get_scene(db=db, scene_id=image.scene_id)
-    if scene:
-        scene.approved_image_id = image_id
+    db.execute(
+        update(models.Scene).where(models.Scene.id == row.scene_id).values(approved_image_id=image_id),
+        execution_options={"synchronize_session": False},
+    )
     db.commit()
     
     return {"message": "Image approved"}
 
 
 @app.post("/api/images/{image_id}/reject")
-def reject_image(image_id: int, visual_style_id: int = None, db: Session = Depends(get_db)):
+def reject_image(image_id: int, background_tasks: BackgroundTasks, visual_style_id: int = None, db: Session = Depends(get_db)):
     """Reject an image and generate a new one"""
-    image = crud.get_image(db=db, image_id=image_id)
-    if not image:
+    row = crud.set_status(
+        db, models.Image, image_id, models.Status.REJECTED.value,
+        models.Image.scene_id, models.Image.visual_style_id,
+    )
+    if not row:
         raise HTTPException(status_code=404, detail="Image not found")
     
-    image.status = "rejected"
-    db.commit()
-    
     # Use the same visual style if not specified
-    style_id = visual_style_id if visual_style_id else image.visual_style_id
+    style_id = visual_style_id if visual_style_id else row.visual_style_id
     
     # Generate new image
-    from .tasks import generate_image_task
-    generate_image_task.delay(image.scene_id, style_id)
+    background_tasks.add_task(generate_image_task.delay, row.scene_id, style_id)
     
     return {"message": "Image rejected, generating new one"}
 
 
+@app.post("/api/images/bulk", response_model=List[schemas.Image])
+def bulk_create_images(body: schemas.ImageBulkCreate, db: Session = Depends(get_db)):
+    """Create many image rows (e.g. an import) with one INSERT and one commit"""
+    missing = crud.missing_ids(db, models.Scene, {image.scene_id for image in body.images})
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Scenes not found: {missing}")
+    return crud.bulk_create_images(db=db, images=body.images)
+
+
+@app.post("/api/images/bulk-approve", response_model=schemas.BulkStatusResponse)
+def bulk_approve_images(body: schemas.BulkIdsRequest, db: Session = Depends(get_db)):
+    """Approve many images at once; each scene's approved_image_id points at its (last) approved image"""
+    updated_ids = crud.bulk_approve_images(db=db, image_ids=body.ids)
+    return schemas.BulkStatusResponse(updated_ids=updated_ids)
+
+
+@app.post("/api/images/bulk-reject", response_model=schemas.BulkStatusResponse)
+def bulk_reject_images(body: schemas.BulkRejectImagesRequest, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+    """Reject many images at once and queue one replacement generation per rejected image"""
+    rows = crud.bulk_reject_images(db=db, image_ids=body.ids)
+    if rows:
+        regenerate = group([
+            generate_image_task.s(scene_id, body.visual_style_id or style_id)
+            for _, scene_id, style_id in rows
+        ])
+        background_tasks.add_task(regenerate.apply_async)
+    return schemas.BulkStatusResponse(updated_ids=[row[0] for row in rows])
+
+
+@app.post("/api/projects/{project_id}/approve-all-scenes", response_model=schemas.BulkStatusResponse)
+def approve_all_scenes(
+    project_id: int,
+    background_tasks: BackgroundTasks,
+    visual_style_id: int = None,
+    model_id: str = None,
+    db: Session = Depends(get_db),
+):
+    """Approve all scenes of a project and queue image generation for those without an approved image, as one Celery group"""
+    if not crud.exists(db, models.Project, project_id):
+        raise HTTPException(status_code=404, detail="Project not found")
+    rows = crud.approve_project_scenes(db=db, project_id=project_id)
+    pending_scene_ids = [scene_id for scene_id, approved_image_id in rows if approved_image_id is None]
+    if pending_scene_ids:
+        generate_all = group([
+            generate_image_task.s(scene_id, visual_style_id, model_id) for scene_id in pending_scene_ids
+        ])
+        background_tasks.add_task(generate_all.apply_async)
+    return schemas.BulkStatusResponse(updated_ids=[scene_id for scene_id, _ in rows])
+
+
+@app.post("/api/projects/{project_id}/scenes/generate-all-descriptions")
+def generate_all_scene_descriptions(project_id: int, background_tasks: BackgroundTasks, body: Optional[schemas.GenerateVisualDescriptionRequest] = Body(default=None), db: Session = Depends(get_db)):
+    """Start generating a new scene description for every scene of a project, as one Celery group (scenes run in parallel)"""
+    if not crud.exists(db, models.Project, project_id):
+        raise HTTPException(status_code=404, detail="Project not found")
+    instruction = (body.instruction or "").strip() if body else None
+    # continue_from_previous_scene isn't offered: the previous scene's description is being regenerated concurrently
+    descs = crud.create_pending_visual_descriptions(db=db, project_id=project_id)
+    if descs:
+        generate_all = group([generate_scene_description_task.s(desc.id, instruction) for desc in descs])
+        background_tasks.add_task(generate_all.apply_async)
+    return {
+        "message": "Scene description generation started",
+        "visual_descriptions": [{"scene_id": desc.scene_id, "visual_description_id": desc.id} for desc in descs],
+        "status": "pending",
+    }
+
+
+@app.post("/api/scenes/bulk", response_model=List[schemas.Scene])
+def bulk_create_scenes(body: schemas.SceneBulkCreate, db: Session = Depends(get_db)):
+    """Add many scenes with one INSERT and one commit (to replace all of a project's scenes, use segmentation-preview)"""
+    missing = crud.missing_ids(db, models.Project, {scene.project_id for scene in body.scenes})
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Projects not found: {missing}")
+    return crud.bulk_create_scenes(db=db, scenes=body.scenes)
+
+
+@app.post("/api/scenes/bulk-approve", response_model=schemas.BulkStatusResponse)
+def bulk_approve_scenes(body: schemas.BulkIdsRequest, db: Session = Depends(get_db)):
+    """Mark many scenes approved in a single UPDATE"""
+    updated_ids = crud.bulk_update_status(
+        db=db, model=models.Scene, statuses={scene_id: models.Status.APPROVED.value for scene_id in body.ids}
+    )
+    return schemas.BulkStatusResponse(updated_ids=updated_ids)
+
+
 # Voice endpoints (predefined ElevenLabs voices)
 @app.get("/api/voices", response_model=List[schemas.Voice])
+@cached(models.Voice, schema=schemas.Voice)
 def list_voices(db: Session = Depends(get_db)):
     return crud.get_voices(db=db)
 
@@ -606,33 +877,36 @@ def delete_voice(voice_id: int, db: Session = Depends(get_db)):
 
 
 # Video endpoints
+# Drop a queued render that no worker picked up within an hour (the user will have retried by then)
+RENDER_TASK_EXPIRES = 3600
+
+
 @app.post("/api/projects/{project_id}/create-video")
-def create_video(project_id: int, db: Session = Depends(get_db)):
+def create_video(project_id: int, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     """Create video from approved images"""
-    project = crud.get_project(db=db, project_id=project_id)
-    if not project:
+    if not crud.exists(db, models.Project, project_id):
         raise HTTPException(status_code=404, detail="Project not found")
     
     # Trigger video creation
-    from .tasks import create_video_task
-    create_video_task.delay(project_id)
+    background_tasks.add_task(create_video_task.apply_async, args=[project_id], expires=RENDER_TASK_EXPIRES)
     
     return {"message": "Video creation started"}
 
 
 @app.get("/api/videos/{video_id}", response_model=schemas.Video)
-def get_video(video_id: int, db: Session = Depends(get_db)):
+async def get_video(video_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a video"""
-    video = crud.get_video(db=db, video_id=video_id)
+    video = await crud.aget(db, models.Video, video_id)
     if not video:
         raise HTTPException(status_code=404, detail="Video not found")
     return video
 
 
 @app.get("/api/projects/{project_id}/video", response_model=schemas.Video)
-def get_project_video(project_id: int, db: Session = Depends(get_db)):
+@cached(models.Video, schema=schemas.Video)
+async def get_project_video(project_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get video for a project"""
-    video = crud.get_video_by_project(db=db, project_id=project_id)
+    video = await crud.aget_latest_by_project(db, models.Video, project_id)
     if not video:
         raise HTTPException(status_code=404, detail="Video not found")
     return video
@@ -640,12 +914,9 @@ def get_project_video(project_id: int, db: Session = Depends(get_db)):
 
 # Voiceover endpoints
 @app.post("/api/projects/{project_id}/generate-voiceover")
-def generate_voiceover(project_id: int, body: Optional[schemas.GenerateVoiceoverRequest] = Body(default=None), db: Session = Depends(get_db)):
+def generate_voiceover(project_id: int, background_tasks: BackgroundTasks, body: Optional[schemas.GenerateVoiceoverRequest] = Body(default=None), db: Session = Depends(get_db)):
     """Generate voiceover for the full project script with optional TTS settings"""
-    import json as _json
-
-    project = crud.get_project(db=db, project_id=project_id)
-    if not project:
+    if not crud.exists(db, models.Project, project_id):
         raise HTTPException(status_code=404, detail="Project not found")
 
     tts = {}
@@ -673,19 +944,19 @@ def generate_voiceover(project_id: int, body: Optional[schemas.GenerateVoiceover
     voiceover = crud.create_voiceover(
         db=db, project_id=project_id,
         voice_id=voice_db_id,
-        tts_settings=_json.dumps(tts) if tts else None,
+        tts_settings=orjson.dumps(tts).decode() if tts else None,
     )
 
-    from .tasks import generate_voiceover_task
-    generate_voiceover_task.delay(project_id, voiceover.id)
+    background_tasks.add_task(generate_voiceover_task.delay, project_id, voiceover.id)
 
     return {"message": "Voiceover generation started", "voiceover_id": voiceover.id}
 
 
 @app.get("/api/projects/{project_id}/voiceover", response_model=schemas.Voiceover)
-def get_project_voiceover(project_id: int, db: Session = Depends(get_db)):
+@cached(models.Voiceover, schema=schemas.Voiceover)
+async def get_project_voiceover(project_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get the latest voiceover for a project"""
-    voiceover = crud.get_voiceover_by_project(db=db, project_id=project_id)
+    voiceover = await crud.aget_latest_by_project(db, models.Voiceover, project_id)
     if not voiceover:
         raise HTTPException(status_code=404, detail="No voiceover found")
     return voiceover
@@ -693,12 +964,11 @@ def get_project_voiceover(project_id: int, db: Session = Depends(get_db)):
 
 def _get_words_and_boundaries(voiceover):
     """Helper: get alignment words and boundary indices from a voiceover record."""
-    import json as _json
     from .ai_services import _group_chars_into_words
-    alignment = _json.loads(voiceover.alignment_data)
+    alignment = orjson.loads(voiceover.alignment_data)
     words = _group_chars_into_words(alignment)
     if voiceover.caption_groups:
-        raw = _json.loads(voiceover.caption_groups)
+        raw = orjson.loads(voiceover.caption_groups)
         # Guard: old format was list of dicts; new format is list of ints
         if raw and isinstance(raw, list) and isinstance(raw[0], int):
             boundaries = raw
@@ -727,7 +997,6 @@ def _build_phrases(words, boundaries):
 @app.get("/api/projects/{project_id}/voiceover/words")
 def get_voiceover_words(project_id: int, db: Session = Depends(get_db)):
     """Return the full word list with indices and timing for the caption editor."""
-    import json as _json
     voiceover = crud.get_voiceover_by_project(db=db, project_id=project_id)
     if not voiceover:
         raise HTTPException(status_code=404, detail="No voiceover found")
@@ -760,7 +1029,6 @@ def get_caption_phrases(project_id: int, db: Session = Depends(get_db)):
 @app.put("/api/projects/{project_id}/voiceover/caption-boundaries")
 def save_caption_boundaries(project_id: int, body: dict, db: Session = Depends(get_db)):
     """Save caption group boundaries as an array of word indices."""
-    import json as _json
     voiceover = crud.get_voiceover_by_project(db=db, project_id=project_id)
     if not voiceover:
         raise HTTPException(status_code=404, detail="No voiceover found")
@@ -768,7 +1036,7 @@ def save_caption_boundaries(project_id: int, body: dict, db: Session = Depends(g
         raise HTTPException(status_code=400, detail="No alignment data")
 
     from .ai_services import _group_chars_into_words
-    alignment = _json.loads(voiceover.alignment_data)
+    alignment = orjson.loads(voiceover.alignment_data)
     words = _group_chars_into_words(alignment)
     total = len(words)
 
@@ -776,14 +1044,13 @@ def save_caption_boundaries(project_id: int, body: dict, db: Session = Depends(g
     boundaries = sorted(set(int(b) for b in raw if 0 < int(b) < total))
 
     crud.update_voiceover(db=db, voiceover_id=voiceover.id,
-                          caption_groups=_json.dumps(boundaries))
+                          caption_groups=orjson.dumps(boundaries).decode())
     return {"message": "Caption boundaries saved", "boundaries": boundaries}
 
 
 @app.post("/api/projects/{project_id}/voiceover/auto-group-captions")
 def auto_group_captions_endpoint(project_id: int, db: Session = Depends(get_db)):
     """Use LLM to intelligently group caption words into natural phrases."""
-    import json as _json
     voiceover = crud.get_voiceover_by_project(db=db, project_id=project_id)
     if not voiceover:
         raise HTTPException(status_code=404, detail="No voiceover found")
@@ -791,14 +1058,14 @@ def auto_group_captions_endpoint(project_id: int, db: Session = Depends(get_db))
         raise HTTPException(status_code=400, detail="No alignment data")
 
     from .ai_services import _group_chars_into_words, auto_group_captions
-    alignment = _json.loads(voiceover.alignment_data)
+    alignment = orjson.loads(voiceover.alignment_data)
     words = _group_chars_into_words(alignment)
     if not words:
         raise HTTPException(status_code=400, detail="No words in alignment")
 
     boundaries = auto_group_captions(words)
     crud.update_voiceover(db=db, voiceover_id=voiceover.id,
-                          caption_groups=_json.dumps(boundaries))
+                          caption_groups=orjson.dumps(boundaries).decode())
     return {"boundaries": boundaries}
 
 
@@ -809,12 +1076,12 @@ def update_voiceover_scene_timings(
     db: Session = Depends(get_db),
 ):
     """Update scene timings from the timeline editor"""
-    import json as _json
     voiceover = crud.get_voiceover_by_project(db=db, project_id=project_id)
     if not voiceover:
         raise HTTPException(status_code=404, detail="No voiceover found")
 
-    timings_json = _json.dumps([t.dict() for t in body.scene_timings])
+    # Validated models straight to JSON in pydantic-core, without a model_dump() dict per scene
+    timings_json = list_adapter(schemas.SceneTimingEntry).dump_json(body.scene_timings).decode()
     crud.update_voiceover(db=db, voiceover_id=voiceover.id, scene_timings=timings_json)
     return {"message": "Scene timings updated"}
 
@@ -826,10 +1093,6 @@ def update_voiceover_caption_settings(
     db: Session = Depends(get_db),
 ):
     """Update caption toggle and style"""
-    voiceover = crud.get_voiceover_by_project(db=db, project_id=project_id)
-    if not voiceover:
-        raise HTTPException(status_code=404, detail="No voiceover found")
-
     update_kw = {
         "captions_enabled": body.captions_enabled,
         "caption_style": body.caption_style,
@@ -838,150 +1101,116 @@ def update_voiceover_caption_settings(
         update_kw["caption_alignment"] = body.caption_alignment
     if body.caption_margin_v is not None:
         update_kw["caption_margin_v"] = body.caption_margin_v
-    crud.update_voiceover(db=db, voiceover_id=voiceover.id, **update_kw)
+    if crud.update_latest_voiceover(db=db, project_id=project_id, **update_kw) is None:
+        raise HTTPException(status_code=404, detail="No voiceover found")
     return {"message": "Caption settings updated"}
 
 
 @app.post("/api/projects/{project_id}/render-video")
-def render_video(project_id: int, body: schemas.RenderVideoRequest, db: Session = Depends(get_db)):
+def render_video(project_id: int, body: schemas.RenderVideoRequest, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     """Render final video using voiceover + scene timings + transitions"""
-    project = crud.get_project(db=db, project_id=project_id)
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-
-    voiceover = crud.get_voiceover(db=db, voiceover_id=body.voiceover_id)
-    if not voiceover or voiceover.project_id != project_id:
+    if not crud.voiceover_belongs_to_project(db, project_id, body.voiceover_id):
+        # Only the failure path pays a second query, to name what's missing
+        if not crud.exists(db, models.Project, project_id):
+            raise HTTPException(status_code=404, detail="Project not found")
         raise HTTPException(status_code=404, detail="Voiceover not found")
 
-    from .tasks import render_video_task
-    render_video_task.delay(project_id, voiceover.id)
-
-    return {"message": "Video render started"}
-
-
-# Visual Style endpoints
-@app.post("/api/visual-styles", response_model=schemas.VisualStyle)
-def create_visual_style(visual_style: schemas.VisualStyleCreate, db: Session = Depends(get_db)):
-    """Create a new visual style"""
-    return crud.create_visual_style(db=db, visual_style=visual_style)
-
-
-@app.get("/api/visual-styles", response_model=list[schemas.VisualStyle])
-def list_visual_styles(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """List all visual styles"""
-    return crud.get_visual_styles(db=db, skip=skip, limit=limit)
-
-
-@app.get("/api/visual-styles/{style_id}", response_model=schemas.VisualStyle)
-def get_visual_style(style_id: int, db: Session = Depends(get_db)):
-    """Get a specific visual style"""
-    style = crud.get_visual_style(db=db, style_id=style_id)
-    if not style:
-        raise HTTPException(status_code=404, detail="Visual style not found")
-    return style
-
-
-@app.put("/api/visual-styles/{style_id}", response_model=schemas.VisualStyle)
-def update_visual_style(style_id: int, visual_style: schemas.VisualStyleUpdate, db: Session = Depends(get_db)):
-    """Update a visual style"""
-    updated = crud.update_visual_style(db=db, style_id=style_id, visual_style=visual_style)
-    if not updated:
-        raise HTTPException(status_code=404, detail="Visual style not found")
-    return updated
-
-
-@app.delete("/api/visual-styles/{style_id}")
-def delete_visual_style(style_id: int, db: Session = Depends(get_db)):
-    """Delete a visual style"""
-    deleted = crud.delete_visual_style(db=db, style_id=style_id)
-    if not deleted:
-        raise HTTPException(status_code=404, detail="Visual style not found")
-    return {"message": "Visual style deleted successfully"}
-
-
-# Scene Style endpoints
-@app.post("/api/scene-styles", response_model=schemas.SceneStyle)
-def create_scene_style(scene_style: schemas.SceneStyleCreate, db: Session = Depends(get_db)):
-    """Create a new scene style"""
-    return crud.create_scene_style(db=db, scene_style=scene_style)
-
-
-@app.get("/api/scene-styles", response_model=list[schemas.SceneStyle])
-def list_scene_styles(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """List all scene styles"""
-    return crud.get_scene_styles(db=db, skip=skip, limit=limit)
-
-
-@app.get("/api/scene-styles/{style_id}", response_model=schemas.SceneStyle)
-def get_scene_style(style_id: int, db: Session = Depends(get_db)):
-    """Get a specific scene style"""
-    style = crud.get_scene_style(db=db, style_id=style_id)
-    if not style:
-        raise HTTPException(status_code=404, detail="Scene style not found")
-    return style
-
-
-@app.put("/api/scene-styles/{style_id}", response_model=schemas.SceneStyle)
-def update_scene_style(style_id: int, scene_style: schemas.SceneStyleUpdate, db: Session = Depends(get_db)):
-    """Update a scene style"""
-    updated = crud.update_scene_style(db=db, style_id=style_id, scene_style=scene_style)
-    if not updated:
-        raise HTTPException(status_code=404, detail="Scene style not found")
-    return updated
-
+    # Replace the previous render's final state now, so a stream opened right away doesn't replay it
+    task_id = uuid.uuid4().hex
+    render_progress.publish(project_id, "queued", 0, task_id=task_id)
+    background_tasks.add_task(
+        render_video_task.apply_async, args=[project_id, body.voiceover_id], task_id=task_id, expires=RENDER_TASK_EXPIRES
+    )
 
-@app.delete("/api/scene-styles/{style_id}")
-def delete_scene_style(style_id: int, db: Session = Depends(get_db)):
-    """Delete a scene style"""
-    deleted = crud.delete_scene_style(db=db, style_id=style_id)
-    if not deleted:
-        raise HTTPException(status_code=404, detail="Scene style not found")
-    return {"message": "Scene style deleted successfully"}
+    return {"message": "Video render started", "task_id": task_id}
 
 
-# Script Prompt endpoints
-@app.post("/api/script-prompts", response_model=schemas.ScriptPrompt)
-def create_script_prompt(script_prompt: schemas.ScriptPromptCreate, db: Session = Depends(get_db)):
-    """Create a new script prompt"""
-    return crud.create_script_prompt(db=db, script_prompt=script_prompt)
+@app.get("/api/projects/{project_id}/render/stream")
+async def stream_render_progress(project_id: int):
+    """Server-sent events with the project's render progress (stage, pct), ending on "done" or "error" """
+    return StreamingResponse(
+        render_progress.events(project_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
-@app.get("/api/script-prompts", response_model=list[schemas.ScriptPrompt])
-def list_script_prompts(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """List all script prompts"""
-    return crud.get_script_prompts(db=db, skip=skip, limit=limit)
+# Style/prompt library endpoints: the same five async routes for each table
+def make_library_router(prefix: str, model, read, create, update, label: str) -> APIRouter:
+    """
+    POST/GET list/GET/PUT/DELETE routes for a simple library table under `prefix`.
+    read/create/update: the response, create and update schemas; label: e.g. "Visual style" (for messages).
+    """
+    name = model.__tablename__
+    router = APIRouter(prefix=prefix, route_class=CompactRoute)
+    not_found = f"{label} not found"
+
+    async def create_item(body: create, db: AsyncSession = Depends(get_async_db)):
+        return await crud.acreate(db, model, body.model_dump())
+
+    async def list_items(skip: int = 0, limit: int = 100, before_id: Optional[int] = None, db: AsyncSession = Depends(get_async_db)):
+        return await crud.alist(db, model, read, skip=skip, limit=limit, before_id=before_id)
+
+    # The response cache keys on the function's qualname: keep it distinct per table
+    list_items.__qualname__ = f"list_{name}"
+
+    async def get_item(item_id: int, db: AsyncSession = Depends(get_async_db)):
+        item = await crud.aget(db, model, item_id)
+        if not item:
+            raise HTTPException(status_code=404, detail=not_found)
+        return item
+
+    async def update_item(item_id: int, body: update, db: AsyncSession = Depends(get_async_db)):
+        updated = await crud.aupdate(db, model, item_id, body.model_dump(exclude_unset=True))
+        if not updated:
+            raise HTTPException(status_code=404, detail=not_found)
+        return updated
+
+    async def delete_item(item_id: int, db: AsyncSession = Depends(get_async_db)):
+        deleted = await crud.adelete(db, model, item_id)
+        if not deleted:
+            raise HTTPException(status_code=404, detail=not_found)
+        return {"message": f"{label} deleted successfully"}
+
+    plural = label.lower() + "s"
+    router.add_api_route("", create_item, methods=["POST"], response_model=read, name=f"create_{name}", summary=f"Create a {label.lower()}")
+    router.add_api_route(
+        "", cached(model, schema=read)(list_items), methods=["GET"], response_model=list[read], name=f"list_{name}",
+        summary=f"List {plural}", description="Newest first (next page: before_id=<last id>, cheaper than skip)",
+    )
+    router.add_api_route("/{item_id}", get_item, methods=["GET"], response_model=read, name=f"get_{name}", summary=f"Get a {label.lower()}")
+    router.add_api_route("/{item_id}", update_item, methods=["PUT"], response_model=read, name=f"update_{name}", summary=f"Update a {label.lower()}")
+    router.add_api_route("/{item_id}", delete_item, methods=["DELETE"], name=f"delete_{name}", summary=f"Delete a {label.lower()}")
+    return router
 
 
-@app.get("/api/script-prompts/{prompt_id}", response_model=schemas.ScriptPrompt)
-def get_script_prompt(prompt_id: int, db: Session = Depends(get_db)):
-    """Get a specific script prompt"""
-    prompt = crud.get_script_prompt(db=db, prompt_id=prompt_id)
-    if not prompt:
-        raise HTTPException(status_code=404, detail="Script prompt not found")
-    return prompt
+app.include_router(make_library_router(
+    "/api/visual-styles", models.VisualStyle,
+    schemas.VisualStyle, schemas.VisualStyleCreate, schemas.VisualStyleUpdate, "Visual style",
+))
+app.include_router(make_library_router(
+    "/api/scene-styles", models.SceneStyle,
+    schemas.SceneStyle, schemas.SceneStyleCreate, schemas.SceneStyleUpdate, "Scene style",
+))
+app.include_router(make_library_router(
+    "/api/script-prompts", models.ScriptPrompt,
+    schemas.ScriptPrompt, schemas.ScriptPromptCreate, schemas.ScriptPromptUpdate, "Script prompt",
+))
 
 
-@app.put("/api/script-prompts/{prompt_id}", response_model=schemas.ScriptPrompt)
-def update_script_prompt(prompt_id: int, script_prompt: schemas.ScriptPromptUpdate, db: Session = Depends(get_db)):
-    """Update a script prompt"""
-    updated = crud.update_script_prompt(db=db, prompt_id=prompt_id, script_prompt=script_prompt)
-    if not updated:
-        raise HTTPException(status_code=404, detail="Script prompt not found")
-    return updated
+@app.get("/api/cache/stats")
+def llm_cache_stats():
+    """Hit/miss counters of the LLM generation caches in this worker"""
+    return {"exact": llm_cache.stats(), "semantic": semantic_cache.stats()}
 
 
-@app.delete("/api/script-prompts/{prompt_id}")
-def delete_script_prompt(prompt_id: int, db: Session = Depends(get_db)):
-    """Delete a script prompt"""
-    deleted = crud.delete_script_prompt(db=db, prompt_id=prompt_id)
-    if not deleted:
-        raise HTTPException(status_code=404, detail="Script prompt not found")
-    return {"message": "Script prompt deleted successfully"}
+# Image Reference endpoints
+# Characters dropped from uploaded reference filenames (one C-level regex pass instead of a per-char loop)
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9._-]+")
 
 
-# Image Reference endpoints
 @app.post("/api/image-references", response_model=schemas.ImageReference)
-async def create_image_reference(
+def create_image_reference(
     name: str = Form(...),
     description: Optional[str] = Form(None),
     file: UploadFile = File(...),
@@ -991,31 +1220,26 @@ async def create_image_reference(
     if not file.filename:
         raise HTTPException(status_code=400, detail="No file provided")
     ext = os.path.splitext(file.filename)[1].lower()
-    if ext not in (".jpg", ".jpeg", ".png", ".webp"):
+    if ext not in ALLOWED_IMAGE_EXTENSIONS or not (file.content_type or "image/").startswith("image/"):
         raise HTTPException(status_code=400, detail="File must be JPG, PNG, or WebP")
-    safe_name = "".join(c for c in file.filename if c.isalnum() or c in "._-") or "image"
+    safe_name = _UNSAFE_FILENAME_CHARS.sub("", file.filename) or "image"
     stored_name = f"ref_{uuid.uuid4().hex[:12]}_{safe_name}"
     rel_path = f"image_references/{stored_name}"
     full_path = os.path.join("storage", rel_path)
-    try:
-        contents = await file.read()
-        with open(full_path, "wb") as f:
-            f.write(contents)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to save file: {e}")
+    save_upload(file, full_path)
     ref = crud.create_image_reference(db=db, name=name, image_path=rel_path, description=description)
     return ref
 
 
 @app.get("/api/image-references", response_model=list[schemas.ImageReference])
-def list_image_references(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """List all image references"""
-    return crud.get_image_references(db=db, skip=skip, limit=limit)
+def list_image_references(skip: int = 0, limit: int = 100, before_id: Optional[int] = None, db: Session = Depends(get_db)):
+    """List all image references, newest first (next page: before_id=<last id>, cheaper than skip)"""
+    return stream_json_array(crud.image_references_stmt(skip, limit, before_id), schemas.ImageReference)
 
 
 @app.get("/api/image-references/{ref_id}", response_model=schemas.ImageReference)
-def get_image_reference(ref_id: int, db: Session = Depends(get_db)):
-    ref = crud.get_image_reference(db=db, ref_id=ref_id)
+async def get_image_reference(ref_id: int, db: AsyncSession = Depends(get_async_db)):
+    ref = await crud.aget(db, models.ImageReference, ref_id)
     if not ref:
         raise HTTPException(status_code=404, detail="Image reference not found")
     return ref
@@ -1033,18 +1257,25 @@ def update_image_reference(
     return updated
 
 
+def remove_storage_file(rel_path: str):
+    """Delete a file under storage/ (background task; a file that is already gone is fine)."""
+    try:
+        os.remove(os.path.join("storage", rel_path))
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning("Could not remove storage file %s: %s", rel_path, e)
+
+
 @app.delete("/api/image-references/{ref_id}")
-def delete_image_reference(ref_id: int, db: Session = Depends(get_db)):
+def delete_image_reference(ref_id: int, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     ref = crud.get_image_reference(db=db, ref_id=ref_id)
     if not ref:
         raise HTTPException(status_code=404, detail="Image reference not found")
-    full_path = os.path.join("storage", ref.image_path)
-    if os.path.isfile(full_path):
-        try:
-            os.remove(full_path)
-        except Exception:
-            pass
-    deleted = crud.delete_image_reference(db=db, ref_id=ref_id)
+    image_path = ref.image_path
+    crud.delete_image_reference(db=db, ref_id=ref_id)
+    # The row is gone; unlink the file after the response, off the request path
+    background_tasks.add_task(remove_storage_file, image_path)
     return {"message": "Image reference deleted successfully"}
 
 
@@ -1,19 +1,63 @@
 """
 Database models for the video creator workflow
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, ForeignKey, Index, Enum as SQLEnum
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from datetime import datetime, timezone
 import enum
 from .database import Base
 
 
+def _now() -> datetime:
+    """Timestamps are generated in Python and sent with the INSERT/UPDATE, so the ORM already has the
+    value afterwards instead of expiring it and SELECTing it back (server_default stays for raw SQL)."""
+    return datetime.now(timezone.utc)
+
+
+class UTCDateTime(TypeDecorator):
+    """
+    DateTime(timezone=True) that always reads back aware UTC datetimes. SQLite keeps no offset and
+    returns naive values (UTC: _now() and CURRENT_TIMESTAMP both are), PostgreSQL returns the session
+    time zone; either way a row read from the database now serializes like the same row fresh from
+    an INSERT, which still holds _now()'s value.
+    """
+    impl = DateTime(timezone=True)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+
+
 class Status(str, enum.Enum):
     DRAFT = "draft"
     REVIEWED = "reviewed"
     APPROVED = "approved"
     REJECTED = "rejected"
     PENDING = "pending"
+    READY = "ready"  # voiceovers, visual descriptions
+    ERROR = "error"
+
+
+def _status_column(default: Status) -> Column:
+    """
+    status as a Status enum: writes are validated against the enum and reads come back as members.
+    Stored as the value in a VARCHAR (native_enum=False), like before, so existing rows need no migration.
+    """
+    return Column(
+        SQLEnum(Status, native_enum=False, length=16, validate_strings=True, values_callable=lambda e: [m.value for m in e]),
+        default=default.value,
+    )
 
 
 class Project(Base):
@@ -22,11 +66,11 @@ class Project(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=True)
     script_content = Column(Text, nullable=False)  # Script is now a field within Project
-    status = Column(String, default=Status.DRAFT.value)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    status = _status_column(Status.DRAFT)
+    created_at = Column(UTCDateTime(), default=_now, server_default=func.now())
+    updated_at = Column(UTCDateTime(), onupdate=_now)
     
-    scenes = relationship("Scene", back_populates="project", cascade="all, delete-orphan")
+    scenes = relationship("Scene", back_populates="project", cascade="all, delete-orphan", order_by="Scene.order")
     videos = relationship("Video", back_populates="project", cascade="all, delete-orphan")
     voiceovers = relationship("Voiceover", back_populates="project", cascade="all, delete-orphan")
     script_iterations = relationship("ScriptIteration", back_populates="project", cascade="all, delete-orphan", order_by="ScriptIteration.round_number")
@@ -41,9 +85,12 @@ class ScriptIteration(Base):
     round_number = Column(Integer, nullable=False)  # 1-based
     user_feedback = Column(Text, nullable=False)
     revised_script = Column(Text, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(UTCDateTime(), default=_now, server_default=func.now())
     
     project = relationship("Project", back_populates="script_iterations")
+    
+    # Covers the sliding window / round count: WHERE project_id = ? ORDER BY round_number DESC
+    __table_args__ = (Index("ix_script_iterations_project_round", "project_id", "round_number"),)
 
 
 class ScriptPrompt(Base):
@@ -52,8 +99,8 @@ class ScriptPrompt(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     script_description = Column(Text, nullable=False)  # Description/instructions for script generation
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    created_at = Column(UTCDateTime(), default=_now, server_default=func.now())
+    updated_at = Column(UTCDateTime(), onupdate=_now)
 
 
 class SceneStyle(Base):
@@ -63,8 +110,8 @@ class SceneStyle(Base):
     name = Column(String, nullable=False)
     description = Column(Text, nullable=False)  # Description of the scene style (e.g., "cinematic", "documentary", "dramatic")
     parameters = Column(Text, nullable=True, default="{}")  # Optional JSON string with additional scene parameters
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    created_at = Column(UTCDateTime(), default=_now, server_default=func.now())
+    updated_at = Column(UTCDateTime(), onupdate=_now)
     
     scenes = relationship("Scene", back_populates="scene_style")
 
@@ -76,10 +123,14 @@ class VisualDescription(Base):
     scene_id = Column(Integer, ForeignKey("scenes.id"), nullable=False)
     description = Column(Text, nullable=False)  # The visual description text
     scene_style_id = Column(Integer, ForeignKey("scene_styles.id"), nullable=True)  # Scene style used when generating
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    status = _status_column(Status.READY)  # pending (worker generating), ready, error
+    created_at = Column(UTCDateTime(), default=_now, server_default=func.now())
     
     scene = relationship("Scene", back_populates="visual_descriptions", foreign_keys=[scene_id])
     scene_style = relationship("SceneStyle")
+    
+    # Covers get_visual_descriptions_by_scene: WHERE scene_id = ? ORDER BY created_at
+    __table_args__ = (Index("ix_visual_descriptions_scene_created", "scene_id", "created_at"),)
 
 
 class Scene(Base):
@@ -94,17 +145,24 @@ class Scene(Base):
     image_reference_id = Column(Integer, ForeignKey("image_references.id"), nullable=True)  # Optional reference image for Leonardo
     approved_image_id = Column(Integer, ForeignKey("images.id"), nullable=True)  # User-approved image for this scene (used as ref when continuing)
     order = Column(Integer, nullable=False)
-    status = Column(String, default=Status.PENDING.value)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    status = _status_column(Status.PENDING)
+    created_at = Column(UTCDateTime(), default=_now, server_default=func.now())
+    updated_at = Column(UTCDateTime(), onupdate=_now)
     
     project = relationship("Project", back_populates="scenes")
     scene_style = relationship("SceneStyle", back_populates="scenes")
     image_reference = relationship("ImageReference")
-    images = relationship("Image", back_populates="scene", foreign_keys="Image.scene_id", cascade="all, delete-orphan")
+    images = relationship("Image", back_populates="scene", foreign_keys="Image.scene_id", cascade="all, delete-orphan", order_by="desc(Image.created_at)")
     approved_image = relationship("Image", foreign_keys=[approved_image_id])
     visual_descriptions = relationship("VisualDescription", back_populates="scene", foreign_keys="VisualDescription.scene_id", cascade="all, delete-orphan", order_by="VisualDescription.created_at")
     current_visual_description = relationship("VisualDescription", foreign_keys=[current_visual_description_id], post_update=True, remote_side="VisualDescription.id")
+    
+    # Covers get_scenes_by_project: WHERE project_id = ? ORDER BY order; the scene_style_id index serves
+    # the FK lookup when a scene style is deleted
+    __table_args__ = (
+        Index("ix_scenes_project_order", "project_id", "order"),
+        Index("ix_scenes_scene_style_id", "scene_style_id"),
+    )
 
 
 class VisualStyle(Base):
@@ -114,8 +172,8 @@ class VisualStyle(Base):
     name = Column(String, nullable=False)
     description = Column(Text, nullable=False)  # Rich narrative description of the visual style
     parameters = Column(Text, nullable=True, default="{}")  # Optional JSON string with additional visual parameters
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    created_at = Column(UTCDateTime(), default=_now, server_default=func.now())
+    updated_at = Column(UTCDateTime(), onupdate=_now)
     
     images = relationship("Image", back_populates="visual_style")
 
@@ -129,11 +187,18 @@ class Image(Base):
     prompt = Column(Text, nullable=False)
     file_path = Column(String, nullable=True)
     url = Column(String, nullable=True)
-    status = Column(String, default=Status.PENDING.value)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    status = _status_column(Status.PENDING)
+    created_at = Column(UTCDateTime(), default=_now, server_default=func.now())
     
     scene = relationship("Scene", back_populates="images", foreign_keys=[scene_id])
     visual_style = relationship("VisualStyle", back_populates="images")
+    
+    # Covers get_images_by_scene: WHERE scene_id = ? ORDER BY created_at DESC; the visual_style_id index
+    # serves the FK lookup when a visual style is deleted
+    __table_args__ = (
+        Index("ix_images_scene_created", "scene_id", "created_at"),
+        Index("ix_images_visual_style_id", "visual_style_id"),
+    )
 
 
 class ImageReference(Base):
@@ -143,8 +208,8 @@ class ImageReference(Base):
     name = Column(String, nullable=False)  # Short label (e.g. "Main character", "Location ref")
     description = Column(Text, nullable=True)  # Optional general description of what this reference is for
     image_path = Column(String, nullable=False)  # Path relative to storage/ (e.g. image_references/ref_1.jpg)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    created_at = Column(UTCDateTime(), default=_now, server_default=func.now())
+    updated_at = Column(UTCDateTime(), onupdate=_now)
 
 
 class Video(Base):
@@ -155,11 +220,14 @@ class Video(Base):
     voiceover_id = Column(Integer, ForeignKey("voiceovers.id"), nullable=True)
     file_path = Column(String, nullable=True)
     url = Column(String, nullable=True)
-    status = Column(String, default=Status.PENDING.value)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    status = _status_column(Status.PENDING)
+    created_at = Column(UTCDateTime(), default=_now, server_default=func.now())
     
     project = relationship("Project", back_populates="videos")
     voiceover = relationship("Voiceover", back_populates="videos")
+    
+    # Covers get_video_by_project: latest video per project
+    __table_args__ = (Index("ix_videos_project_created", "project_id", "created_at"),)
 
 
 class Voice(Base):
@@ -175,8 +243,8 @@ class Voice(Base):
     speed = Column(Float, default=1.0)
     use_speaker_boost = Column(Boolean, default=True)
     language_code = Column(String, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    created_at = Column(UTCDateTime(), default=_now, server_default=func.now())
+    updated_at = Column(UTCDateTime(), onupdate=_now)
 
 
 class Voiceover(Base):
@@ -195,10 +263,13 @@ class Voiceover(Base):
     caption_alignment = Column(Integer, default=2)  # ASS alignment 1-9 (2=bottom center)
     caption_margin_v = Column(Integer, default=60)   # vertical margin in pixels
     caption_groups = Column(Text, nullable=True)
-    status = Column(String, default=Status.PENDING.value)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    status = _status_column(Status.PENDING)
+    created_at = Column(UTCDateTime(), default=_now, server_default=func.now())
     
     project = relationship("Project", back_populates="voiceovers")
     voice = relationship("Voice")
     videos = relationship("Video", back_populates="voiceover")
+    
+    # Covers get_voiceover_by_project: latest voiceover per project
+    __table_args__ = (Index("ix_voiceovers_project_created", "project_id", "created_at"),)
 
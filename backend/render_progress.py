@@ -0,0 +1,74 @@
+"""
+Progress of final-video renders, pushed to the browser instead of polled.
+
+render_video_task publishes each stage on the Redis pub/sub channel render:<project_id> and also
+keeps the latest message under render:<project_id>:last, so a client that connects mid-render (or
+just after it finished) still gets the current state. GET /api/projects/{id}/render/stream relays
+the channel as server-sent events until a "done" or "error" message.
+
+Messages are JSON: {"stage": ..., "pct": 0-100 or null, "task_id": ...} plus stage-specific fields
+(video_id on "done", error on "error").
+"""
+import logging
+import os
+from typing import AsyncIterator, Optional
+
+import orjson
+import redis
+import redis.asyncio as aioredis
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+_CHANNEL = "render:{}"
+_LAST_KEY = "render:{}:last"
+_LAST_TTL_SECONDS = 3600
+HEARTBEAT_SECONDS = 15
+FINAL_STAGES = frozenset({"done", "error"})
+
+_redis = redis.Redis.from_url(REDIS_URL, socket_timeout=1, socket_connect_timeout=1)
+
+
+def publish(project_id: int, stage: str, pct: Optional[float] = None, **fields):
+    """Report a render stage. Best effort: a render never fails because its progress couldn't be sent."""
+    message = orjson.dumps({"stage": stage, "pct": pct, **fields})
+    try:
+        pipe = _redis.pipeline()
+        pipe.set(_LAST_KEY.format(project_id), message, ex=_LAST_TTL_SECONDS)
+        pipe.publish(_CHANNEL.format(project_id), message)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning("Could not publish render progress for project %s: %s", project_id, e)
+
+
+def _event(message: bytes) -> bytes:
+    return b"data: " + message + b"\n\n"
+
+
+def _is_final(message: bytes) -> bool:
+    return orjson.loads(message).get("stage") in FINAL_STAGES
+
+
+async def events(project_id: int) -> AsyncIterator[bytes]:
+    """SSE frames for a project's render: the latest known state, then every update until it finishes."""
+    client = aioredis.Redis.from_url(REDIS_URL)
+    pubsub = client.pubsub()
+    try:
+        # Subscribe before reading the last state so nothing published in between is missed
+        await pubsub.subscribe(_CHANNEL.format(project_id))
+        last = await client.get(_LAST_KEY.format(project_id))
+        if last is not None:
+            yield _event(last)
+            if _is_final(last):
+                return
+        while True:
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=HEARTBEAT_SECONDS)
+            if message is None:
+                yield b": keep-alive\n\n"  # comment frame; keeps proxies from closing an idle stream
+                continue
+            yield _event(message["data"])
+            if _is_final(message["data"]):
+                return
+    finally:
+        await pubsub.aclose()
+        await client.aclose()
@@ -1,10 +1,16 @@
 """
 Pydantic schemas for API request/response validation
+
+Response (ORM) schemas use defer_build: their validators/serializers are built on first use rather
+than at import, so processes that import this module without serving routes (Celery workers,
+reset_db) don't pay for all of them. The API builds the ones it needs when routes are registered.
 """
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, List
 from datetime import datetime
 
+from .models import Status
+
 
 class ProjectBase(BaseModel):
     title: Optional[str] = None
@@ -18,17 +24,16 @@ class ProjectCreate(ProjectBase):
 class ProjectUpdate(BaseModel):
     title: Optional[str] = None
     script_content: Optional[str] = None
-    status: Optional[str] = None
+    status: Optional[Status] = None
 
 
 class Project(ProjectBase):
     id: int
-    status: str
+    status: Status
     created_at: datetime
     updated_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class ScriptGenerationRequest(BaseModel):
@@ -61,8 +66,7 @@ class ScriptIteration(BaseModel):
     revised_script: str
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class InsertSceneRequest(BaseModel):
@@ -96,7 +100,7 @@ class SceneUpdate(BaseModel):
     image_reference_id: Optional[int] = None
     approved_image_id: Optional[int] = None
     order: Optional[int] = None
-    status: Optional[str] = None
+    status: Optional[Status] = None
 
 
 class Scene(SceneBase):
@@ -107,12 +111,11 @@ class Scene(SceneBase):
     scene_style_id: Optional[int] = None
     image_reference_id: Optional[int] = None
     approved_image_id: Optional[int] = None
-    status: str
+    status: Status
     created_at: datetime
     updated_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class VisualDescriptionBase(BaseModel):
@@ -122,6 +125,7 @@ class VisualDescriptionBase(BaseModel):
 
 class VisualDescriptionCreate(VisualDescriptionBase):
     scene_id: int
+    status: Status = Status.READY
 
 
 class VisualDescriptionUpdate(BaseModel):
@@ -131,10 +135,10 @@ class VisualDescriptionUpdate(BaseModel):
 class VisualDescription(VisualDescriptionBase):
     id: int
     scene_id: int
+    status: Optional[Status] = Status.READY
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class VisualDescriptionIterateRequest(BaseModel):
@@ -167,8 +171,7 @@ class ScriptPrompt(ScriptPromptBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class SceneStyleBase(BaseModel):
@@ -192,8 +195,7 @@ class SceneStyle(SceneStyleBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class VisualStyleBase(BaseModel):
@@ -217,8 +219,7 @@ class VisualStyle(VisualStyleBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class ImageBase(BaseModel):
@@ -246,11 +247,42 @@ class Image(ImageBase):
     visual_style_id: Optional[int] = None
     file_path: Optional[str] = None
     url: Optional[str] = None
-    status: str
+    status: Status
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
+
+
+class BulkIdsRequest(BaseModel):
+    """Request body for bulk status endpoints"""
+    ids: List[int]
+
+
+class BulkRejectImagesRequest(BulkIdsRequest):
+    visual_style_id: Optional[int] = None  # if omitted, each replacement reuses the rejected image's style
+
+
+class BulkStatusResponse(BaseModel):
+    updated_ids: List[int]
+
+
+class SceneBulkCreate(BaseModel):
+    """Request body for creating many scenes in one transaction"""
+    scenes: List[SceneCreate]
+
+
+class ImageBulkCreate(BaseModel):
+    """Request body for creating many image rows in one transaction"""
+    images: List[ImageCreate]
+
+
+class SceneWithImages(Scene):
+    images: List[Image] = []
+
+
+class ProjectFull(Project):
+    """Project with nested scenes and their images, for loading a whole project in one request"""
+    scenes: List[SceneWithImages] = []
 
 
 class ImageReferenceBase(BaseModel):
@@ -274,8 +306,7 @@ class ImageReference(ImageReferenceBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class VideoBase(BaseModel):
@@ -288,11 +319,10 @@ class Video(VideoBase):
     voiceover_id: Optional[int] = None
     file_path: Optional[str] = None
     url: Optional[str] = None
-    status: str
+    status: Status
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 # Voice schemas (predefined ElevenLabs voices)
@@ -330,8 +360,7 @@ class Voice(VoiceBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 # Voiceover schemas
@@ -374,11 +403,10 @@ class Voiceover(VoiceoverBase):
     caption_style: str = "word_highlight"
     caption_alignment: int = 2
     caption_margin_v: int = 60
-    status: str
+    status: Status
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class UpdateSceneTimings(BaseModel):
@@ -0,0 +1,104 @@
+"""
+Semantic cache in front of the exact LLM cache (llm_cache) for script generation and revision.
+
+Each call has a context that must match exactly (function, model, script prompt, current script...)
+and a short free-text part that users keep rewording (title + description, or the new feedback).
+The free text is embedded with OpenAI embeddings; when a previous call with the same context has a
+cosine similarity >= SEMANTIC_CACHE_THRESHOLD, its response is returned instead of calling the LLM.
+
+Off unless SEMANTIC_CACHE_THRESHOLD is set (0.95 is a reasonable start). Entries are per process,
+bounded by SEMANTIC_CACHE_MAX_ENTRIES (LRU); the exact cache still applies when this one misses.
+"""
+import hashlib
+import json
+import logging
+import math
+import operator
+import os
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+from . import llm_cache
+from .ai_services import get_openai_client
+
+logger = logging.getLogger(__name__)
+
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0"))
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "1000"))
+EMBEDDING_MODEL = os.getenv("SEMANTIC_CACHE_EMBEDDING_MODEL", "text-embedding-3-small")
+
+_entries: "OrderedDict[int, tuple]" = OrderedDict()  # id -> (context key, unit vector, response)
+_next_id = 0
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def enabled() -> bool:
+    return SEMANTIC_CACHE_THRESHOLD > 0
+
+
+def _context_key(fn_name: str, context: dict) -> str:
+    payload = json.dumps({"fn": fn_name, "context": context}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _embed(text: str) -> List[float]:
+    response = get_openai_client().embeddings.create(model=EMBEDDING_MODEL, input=" ".join(text.split()).lower())
+    vector = response.data[0].embedding
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return [x / norm for x in vector]
+
+
+def _lookup(context_key: str, vector: List[float]) -> Optional[str]:
+    best_id, best_sim = None, SEMANTIC_CACHE_THRESHOLD
+    with _lock:
+        for entry_id, (key, other, _) in _entries.items():
+            if key != context_key:
+                continue
+            sim = sum(map(operator.mul, vector, other))
+            if sim >= best_sim:
+                best_id, best_sim = entry_id, sim
+        if best_id is None:
+            return None
+        _entries.move_to_end(best_id)
+        return _entries[best_id][2]
+
+
+def _store(context_key: str, vector: List[float], response: str):
+    global _next_id
+    with _lock:
+        _entries[_next_id] = (context_key, vector, response)
+        _next_id += 1
+        if len(_entries) > SEMANTIC_CACHE_MAX_ENTRIES:
+            _entries.popitem(last=False)
+
+
+def call(fn, *, match_text: str, context: dict, **kwargs) -> str:
+    """
+    fn(**kwargs) through the semantic cache. context: inputs that must be identical for a hit;
+    match_text: the user-worded part compared by embedding similarity.
+    """
+    if not enabled() or not (match_text or "").strip():
+        return llm_cache.call(fn, **kwargs)
+    context_key = _context_key(fn.__qualname__, context)
+    try:
+        vector = _embed(match_text)
+    except Exception as e:
+        logger.warning("Semantic cache embedding failed, calling %s directly: %s", fn.__qualname__, e)
+        return llm_cache.call(fn, **kwargs)
+    response = _lookup(context_key, vector)
+    if response is not None:
+        _stats["hits"] += 1
+        return response
+    _stats["misses"] += 1
+    response = llm_cache.call(fn, **kwargs)
+    if response:
+        _store(context_key, vector, response)
+    return response
+
+
+def stats() -> dict:
+    with _lock:
+        size = len(_entries)
+    return {"enabled": enabled(), "threshold": SEMANTIC_CACHE_THRESHOLD, "hits": _stats["hits"], "misses": _stats["misses"], "entries": size}
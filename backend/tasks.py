@@ -2,13 +2,33 @@
 Celery tasks for async AI operations
 """
 from celery import Celery
+from celery.signals import worker_process_init
+import functools
+import inspect
+import logging
+import orjson
 import os
 from dotenv import load_dotenv
-from .database import SessionLocal
-from . import crud, ai_services, models, schemas
+from sqlalchemy import text
+from .database import SessionLocal, engine
+from . import crud, ai_services, llm_cache, models, render_progress, schemas
+from .fs_fast import ensure_dir
+from . import cache  # also registers commit listeners so worker writes invalidate API response caches
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Stored file paths (Image.file_path, Video.file_path, ...) are relative to this folder, with "/" separators
+STORAGE_DIR = "storage"
+
+# Redis re-delivers unacked tasks after this long; video renders can take close to it
+VISIBILITY_TIMEOUT = 3600
+# ffmpeg renders are stopped before Redis would hand them to a second worker: the soft limit raises in
+# the task (the video is marked rejected and ffmpeg is killed), the hard limit kills the process
+RENDER_SOFT_TIME_LIMIT = VISIBILITY_TIMEOUT - 300
+RENDER_TIME_LIMIT = VISIBILITY_TIMEOUT - 120
+
 # Celery configuration
 celery_app = Celery(
     "video_creator",
@@ -17,214 +37,367 @@ celery_app = Celery(
 )
 
 celery_app.conf.update(
-    task_serializer="json",
-    accept_content=["json"],
-    result_serializer="json",
+    # Task args are ids and short strings: msgpack encodes them faster and smaller than json.
+    # json stays accepted so messages queued by an older API process still run
+    task_serializer="msgpack",
+    accept_content=["msgpack", "json"],
+    result_serializer="msgpack",
     timezone="UTC",
     enable_utc=True,
     broker_connection_retry_on_startup=True,
+    # The API publishes from many threads: keep a pool of broker connections instead of reconnecting
+    broker_pool_limit=int(os.getenv("CELERY_BROKER_POOL_LIMIT", "20")),
+    broker_transport_options={"visibility_timeout": VISIBILITY_TIMEOUT},
+    # ffmpeg renders go to their own queue so they can get dedicated workers and can't hold up AI tasks
+    # (a worker started without -Q celery,render won't pick them up)
+    task_routes={
+        "backend.tasks.render_video_task": {"queue": "render"},
+        "backend.tasks.create_video_task": {"queue": "render"},
+    },
+    # Reserve one task at a time: a worker busy with a long render doesn't sit on queued jobs
+    worker_prefetch_multiplier=1,
+    # Ack when a task finishes, not when it's received: a task held by a worker that restarts or loses
+    # its connection goes back to the queue instead of being lost (a process killed mid-task, e.g.
+    # ffmpeg OOM, is still acked so it can't loop)
+    task_acks_late=True,
+    # Recycle pool processes now and then; image/video tasks hold large PIL/ffmpeg buffers
+    worker_max_tasks_per_child=int(os.getenv("CELERY_MAX_TASKS_PER_CHILD", "50")),
+    # Nothing reads task return values (outcomes land in the DB, render progress goes over pub/sub),
+    # so don't write a result key to Redis per task; opt in per task with ignore_result=False
+    task_ignore_result=True,
 )
 
 
-@celery_app.task
-def segment_project_task(project_id: int):
-    """Segment a project's script content into scenes"""
+@worker_process_init.connect
+def _init_worker_db_pool(**kwargs):
+    """
+    Per forked worker process: drop pooled connections inherited from the parent (a socket shared
+    across processes corrupts both sides) and open one fresh connection, so the first task doesn't pay
+    the connect. Each task still gets its own Session (with_db); its connection goes back to this process' pool.
+    """
+    engine.dispose(close=False)
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except Exception as e:
+        logger.warning("Could not pre-open a database connection: %s", e)
+
+
+@functools.lru_cache(maxsize=512)
+def _cached_row_fields(model, pk: int, fields: tuple, table_version: bytes):
     db = SessionLocal()
     try:
-        project = crud.get_project(db=db, project_id=project_id)
-        if not project:
-            return {"error": "Project not found"}
-        
-        # Remove any existing scenes so we don't get duplicates (e.g. if task runs twice or user re-approves)
-        crud.delete_scenes_by_project(db=db, project_id=project_id)
-        
-        # Segment project's script content
-        scenes_data = ai_services.segment_script(project.script_content)
-        
-        # Deduplicate by (text, order) in case the AI returns duplicates
-        seen = set()
-        unique_scenes_data = []
-        for s in scenes_data:
-            key = (s.get("text", "").strip(), s.get("order"))
-            if key in seen:
-                continue
-            seen.add(key)
-            unique_scenes_data.append(s)
-        
-        # Create scenes in database
-        for scene_data in unique_scenes_data:
-            crud.create_scene(
-                db=db,
-                scene=schemas.SceneCreate(
-                    project_id=project_id,
-                    text=scene_data["text"],
-                    order=scene_data["order"]
-                )
-            )
-        
-        return {"message": f"Created {len(unique_scenes_data)} scenes", "project_id": project_id}
+        row = db.get(model, pk)
+        return tuple(getattr(row, f) for f in fields) if row else None
     finally:
         db.close()
 
 
+def _row_fields(db, model, pk: int, *fields):
+    """
+    `fields` of one library row (visual style, image reference), or None. Memoized per worker process
+    and keyed on the table's response-cache version, so any committed write to the table (from the
+    API or a worker) makes the next call read it again. Without Redis it's a plain db.get().
+    """
+    versions = cache.table_versions((model.__tablename__,))
+    if versions is None:
+        row = db.get(model, pk)
+        return tuple(getattr(row, f) for f in fields) if row else None
+    return _cached_row_fields(model, pk, fields, versions[0])
+
+
+def _reference_file(image_path: str) -> str:
+    """Storage path of an image reference's file, or None if the file is missing."""
+    path = os.path.join(STORAGE_DIR, image_path)
+    return path if os.path.isfile(path) else None
+
+
+@functools.lru_cache(maxsize=512)
+def _cached_reference_image_path(image_reference_id: int, table_version: bytes):
+    fields = _cached_row_fields(models.ImageReference, image_reference_id, ("image_path",), table_version)
+    return _reference_file(fields[0]) if fields and fields[0] else None
+
+
+def _reference_image_path(db, image_reference_id: int):
+    """
+    File of an image reference, or None if the row or its file is gone. Memoized like _row_fields,
+    existence check included: a reference's file is only removed by deleting its row, which bumps the
+    image_references version, so scenes sharing a reference don't stat() it once each.
+    """
+    versions = cache.table_versions((models.ImageReference.__tablename__,))
+    if versions is None:
+        ref = db.get(models.ImageReference, image_reference_id)
+        return _reference_file(ref.image_path) if ref and ref.image_path else None
+    return _cached_reference_image_path(image_reference_id, versions[0])
+
+
+def with_db(fn):
+    """
+    Run a task body with a fresh Session passed as db=..., closed afterwards even if the body raises.
+    The wrapper advertises fn's signature minus db, so Celery still checks .delay() arguments.
+    """
+    signature = inspect.signature(fn)
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        db = SessionLocal()
+        try:
+            return fn(*args, db=db, **kwargs)
+        finally:
+            db.close()
+
+    wrapper.__signature__ = signature.replace(parameters=[p for p in signature.parameters.values() if p.name != "db"])
+    return wrapper
+
+
 @celery_app.task
-def generate_image_task(scene_id: int, visual_style_id: int = None, model_id: str = None, scene_description: str = None, continue_from_previous_scene: bool = False):
-    """Generate image for a scene with optional visual style and model selection"""
-    print(f"[WORKFLOW] 11. Task: started scene_id={scene_id} visual_style_id={visual_style_id} model_id={model_id} scene_description={'present' if scene_description else 'None'} (len={len(scene_description or '')})")
-    db = SessionLocal()
-    try:
-        scene = crud.get_scene(db=db, scene_id=scene_id)
-        if not scene:
-            print(f"[WORKFLOW] Task ERROR: Scene not found")
-            return {"error": "Scene not found"}
-        
-        # Get project_id from scene
-        project_id = scene.project_id
-        print(f"[WORKFLOW] 12. Task: scene loaded project_id={project_id} scene.visual_description len={len(scene.visual_description or '')} scene.text len={len(scene.text or '')}")
-        
+@with_db
+def segment_project_task(project_id: int, *, db):
+    """Segment a project's script content into scenes"""
+    project = crud.get_project(db=db, project_id=project_id)
+    if not project:
+        return {"error": "Project not found"}
+    
+    # Segment project's script content
+    scenes_data = ai_services.segment_script(project.script_content)
+    
+    # Deduplicate by (text, order) in case the AI returns duplicates (first one wins, order kept)
+    unique_by_key = {}
+    for s in scenes_data:
+        unique_by_key.setdefault((s.get("text", "").strip(), s.get("order")), s)
+    unique_scenes_data = list(unique_by_key.values())
+    
+    # Replace any existing scenes so we don't get duplicates (e.g. if task runs twice or user re-approves).
+    # Delete and inserts share one transaction, opened only after the AI call has returned.
+    crud.delete_scenes_by_project(db=db, project_id=project_id, commit=False)
+    crud.bulk_create_scenes(
+        db=db,
+        scenes=[
+            schemas.SceneCreate(project_id=project_id, text=scene_data["text"], order=scene_data["order"])
+            for scene_data in unique_scenes_data
+        ],
+        commit=False,
+    )
+    db.commit()
+    
+    return {"message": f"Created {len(unique_scenes_data)} scenes", "project_id": project_id}
+
+
+@celery_app.task
+@with_db
+def generate_image_task(scene_id: int, visual_style_id: int = None, model_id: str = None, scene_description: str = None, continue_from_previous_scene: bool = False, prompt: str = None, *, db):
+    """Generate image for a scene with optional visual style and model selection.
+    prompt: image prompt already built (and length-checked) by the API; rebuilt here when omitted."""
+    logger.debug(
+        "[WORKFLOW] 11. Task: started scene_id=%s visual_style_id=%s model_id=%s scene_description=%s (len=%d)",
+        scene_id, visual_style_id, model_id, "present" if scene_description else "None", len(scene_description or ""),
+    )
+    scene = crud.get_scene(db=db, scene_id=scene_id)
+    if not scene:
+        logger.warning("[WORKFLOW] Task ERROR: scene %s not found", scene_id)
+        return {"error": "Scene not found"}
+    
+    # Get project_id from scene
+    project_id = scene.project_id
+    logger.debug(
+        "[WORKFLOW] 12. Task: scene loaded project_id=%s scene.visual_description len=%d scene.text len=%d",
+        project_id, len(scene.visual_description or ""), len(scene.text or ""),
+    )
+    
+    if prompt is None:
         # Get visual style description and parameters if provided
         visual_style_description = None
         visual_style_params = None
         if visual_style_id:
-            visual_style = crud.get_visual_style(db=db, style_id=visual_style_id)
-            if visual_style:
-                visual_style_description = visual_style.description
-                visual_style_params = visual_style.parameters
-        print(f"[WORKFLOW] 13. Task: visual_style_description={visual_style_description is not None} visual_style_params={visual_style_params is not None}")
+            style_fields = _row_fields(db, models.VisualStyle, visual_style_id, "description", "parameters")
+            if style_fields:
+                visual_style_description, visual_style_params = style_fields
+        logger.debug(
+            "[WORKFLOW] 13. Task: visual_style_description=%s visual_style_params=%s",
+            visual_style_description is not None, visual_style_params is not None,
+        )
         
         # Generate image prompt: use provided scene_description (currently displayed) or fall back to scene's current
         desc = scene_description or scene.visual_description or scene.text
-        print(f"[WORKFLOW] 14. Task: desc source={'scene_description param' if scene_description else 'scene.visual_description' if scene.visual_description else 'scene.text'} len={len(desc or '')}")
+        logger.debug(
+            "[WORKFLOW] 14. Task: desc source=%s len=%d",
+            "scene_description param" if scene_description else "scene.visual_description" if scene.visual_description else "scene.text",
+            len(desc or ""),
+        )
         prompt = ai_services.generate_image_prompt(desc, visual_style_description, visual_style_params)
-        print(f"[WORKFLOW] 15. Task: prompt built len={len(prompt)}")
-        
-        # Create image record
-        image = crud.create_image(
-            db=db,
-            image=schemas.ImageCreate(
-                scene_id=scene_id,
-                visual_style_id=visual_style_id,
-                prompt=prompt
-            )
+    logger.debug("[WORKFLOW] 15. Task: prompt ready len=%d", len(prompt))
+    
+    # Create image record
+    image = crud.create_image(
+        db=db,
+        # Task-internal values (ids and the prompt we just built): no need to run the validator
+        image=schemas.ImageCreate.model_construct(
+            scene_id=scene_id,
+            visual_style_id=visual_style_id,
+            prompt=prompt
         )
-        
-        # Reference image: when continue_from_previous_scene, use previous scene's approved image; else use Ref dropdown (Image References)
-        reference_image_path = None
-        if continue_from_previous_scene:
-            scenes = crud.get_scenes_by_project(db=db, project_id=project_id)
-            prev_scene = next((s for s in scenes if s.order == scene.order - 1), None)
-            if prev_scene and getattr(prev_scene, "approved_image_id", None):
-                approved_img = crud.get_image(db=db, image_id=prev_scene.approved_image_id)
-                if approved_img and approved_img.file_path:
-                    reference_image_path = os.path.join("storage", approved_img.file_path.replace("\\", "/"))
-                    if not os.path.isfile(reference_image_path):
-                        reference_image_path = None
-        if not reference_image_path and getattr(scene, 'image_reference_id', None):
-            ref = crud.get_image_reference(db=db, ref_id=scene.image_reference_id)
-            if ref and ref.image_path:
-                reference_image_path = os.path.join("storage", ref.image_path)
+    )
+    
+    # Reference image: when continue_from_previous_scene, use previous scene's approved image; else use Ref dropdown (Image References)
+    reference_image_path = None
+    if continue_from_previous_scene:
+        prev_scene = crud.get_scene_by_order(db=db, project_id=project_id, order=scene.order - 1)
+        if prev_scene and getattr(prev_scene, "approved_image_id", None):
+            approved_img = crud.get_image(db=db, image_id=prev_scene.approved_image_id)
+            if approved_img and approved_img.file_path:
+                reference_image_path = os.path.join(STORAGE_DIR, approved_img.file_path.replace("\\", "/"))
                 if not os.path.isfile(reference_image_path):
                     reference_image_path = None
-        
-        # Generate image in project-specific folder
-        output_dir = os.path.join("storage", f"project_{project_id}", "images", f"scene_{scene_id}")
-        os.makedirs(output_dir, exist_ok=True)
-        output_path = os.path.join(output_dir, f"image_{image.id}.png")
-        
-        try:
-            print(f"[WORKFLOW] 16. Task: calling generate_image_with_leonardo output_path={output_path}")
-            file_path = ai_services.generate_image_with_leonardo(prompt, output_path, reference_image_path=reference_image_path, model_id=model_id)
-            # Store relative path from storage directory
-            relative_path = file_path.replace("storage/", "").replace("storage\\", "")
-            crud.update_image(db=db, image_id=image.id, file_path=relative_path, status="pending")
-            print(f"[WORKFLOW] 17. Task: SUCCESS image_id={image.id} file_path={relative_path}")
-        except Exception as e:
-            print(f"[WORKFLOW] Task ERROR: {e}")
-            crud.update_image(db=db, image_id=image.id, status="rejected")
-            return {"error": str(e)}
-        
-        return {"message": "Image generated", "image_id": image.id, "scene_id": scene_id}
-    finally:
-        db.close()
+    if not reference_image_path and getattr(scene, 'image_reference_id', None):
+        reference_image_path = _reference_image_path(db, scene.image_reference_id)
+    
+    # Generate image in project-specific folder
+    relative_path = f"project_{project_id}/images/scene_{scene_id}/image_{image.id}.png"
+    output_path = os.path.join(STORAGE_DIR, relative_path)
+    ensure_dir(os.path.dirname(output_path))
+    
+    try:
+        logger.debug("[WORKFLOW] 16. Task: calling generate_image_with_leonardo output_path=%s", output_path)
+        ai_services.generate_image_with_leonardo(prompt, output_path, reference_image_path=reference_image_path, model_id=model_id)
+        crud.update_image(db=db, image_id=image.id, file_path=relative_path, status="pending")
+        logger.debug("[WORKFLOW] 17. Task: SUCCESS image_id=%s file_path=%s", image.id, relative_path)
+    except Exception as e:
+        logger.error("[WORKFLOW] Task ERROR: image %s for scene %s failed: %s", image.id, scene_id, e)
+        crud.update_image(db=db, image_id=image.id, status="rejected")
+        return {"error": str(e)}
+    
+    return {"message": "Image generated", "image_id": image.id, "scene_id": scene_id}
 
 
 @celery_app.task
-def create_video_task(project_id: int):
+@with_db
+def generate_scene_description_task(visual_description_id: int, instruction: str = None, continue_from_previous_scene: bool = False, *, db):
+    """Generate the text of a pending visual description and make it the scene's current one"""
+    visual_desc = crud.get_visual_description(db=db, desc_id=visual_description_id)
+    if not visual_desc:
+        return {"error": "Scene description not found"}
+    scene = crud.get_scene_with_style(db=db, scene_id=visual_desc.scene_id)
+    if not scene:
+        return {"error": "Scene not found"}
+
+    # Get scene style if available (loaded with the scene)
+    scene_style_description = None
+    scene_style_params = None
+    if scene.scene_style:
+        scene_style_description = scene.scene_style.description
+        scene_style_params = scene.scene_style.parameters
+
+    # Get previous scene description if continue_from_previous_scene
+    previous_scene_description = None
+    if continue_from_previous_scene:
+        prev_scene = crud.get_scene_by_order(db=db, project_id=scene.project_id, order=scene.order - 1)
+        if prev_scene and prev_scene.visual_description:
+            previous_scene_description = prev_scene.visual_description
+    scene_text = scene.text
+    # Release the connection before the LLM call. rollback() expires every loaded row, so nothing after
+    # this point may read an ORM attribute (that would check a connection out again for the whole call)
+    db.rollback()
+
+    try:
+        description = llm_cache.call(
+            ai_services.generate_scene_description,
+            scene_text,
+            scene_style_description=scene_style_description,
+            scene_style_params=scene_style_params,
+            previous_scene_description=previous_scene_description,
+            instruction=instruction
+        )
+    except Exception as e:
+        logger.error("[SCENE DESCRIPTION] Generation failed for %s: %s", visual_description_id, e)
+        crud.set_status(db, models.VisualDescription, visual_description_id, "error")
+        return {"error": str(e)}
+
+    crud.complete_visual_description(db=db, visual_description_id=visual_description_id, description=description)
+    return {"message": "Scene description generated", "visual_description_id": visual_description_id}
+
+
+@celery_app.task
+@with_db
+def iterate_scene_description_task(visual_description_id: int, base_description: str, comments: str, *, db):
+    """Revise a scene description with user comments into a pending visual description"""
+    try:
+        description = llm_cache.call(ai_services.iterate_scene_description, base_description, comments)
+    except Exception as e:
+        logger.error("[SCENE DESCRIPTION] Iteration failed for %s: %s", visual_description_id, e)
+        crud.set_status(db, models.VisualDescription, visual_description_id, "error")
+        return {"error": str(e)}
+
+    if not crud.complete_visual_description(db=db, visual_description_id=visual_description_id, description=description):
+        return {"error": "Scene description not found"}
+    return {"message": "Scene description updated", "visual_description_id": visual_description_id}
+
+
+@celery_app.task(soft_time_limit=RENDER_SOFT_TIME_LIMIT, time_limit=RENDER_TIME_LIMIT)
+@with_db
+def create_video_task(project_id: int, *, db):
     """Legacy: Create video from scene images (fixed duration, no voiceover)"""
-    db = SessionLocal()
+    if not crud.exists(db, models.Project, project_id):
+        return {"error": "Project not found"}
+    
+    # Only each scene's newest image path is needed, not the scenes' full image lists
+    image_paths = [
+        os.path.join(STORAGE_DIR, file_path)
+        for file_path in crud.get_latest_image_paths(db=db, project_id=project_id)
+        if file_path
+    ]
+    
+    if not image_paths:
+        return {"error": "No images found for scenes"}
+    
+    video = crud.create_video(db=db, project_id=project_id)
+    
+    relative_path = f"project_{project_id}/videos/video_{video.id}.mp4"
+    output_path = os.path.join(STORAGE_DIR, relative_path)
+    ensure_dir(os.path.dirname(output_path))
+    
     try:
-        project = crud.get_project(db=db, project_id=project_id)
-        if not project:
-            return {"error": "Project not found"}
-        
-        scenes = crud.get_scenes_by_project(db=db, project_id=project_id)
-        image_paths = []
-        
-        for scene in scenes:
-            images = crud.get_images_by_scene(db=db, scene_id=scene.id)
-            latest_image = images[0] if images else None
-            if latest_image and latest_image.file_path:
-                full_path = os.path.join("storage", latest_image.file_path)
-                image_paths.append(full_path)
-        
-        if not image_paths:
-            return {"error": "No images found for scenes"}
-        
-        video = crud.create_video(db=db, project_id=project_id)
-        
-        output_dir = os.path.join("storage", f"project_{project_id}", "videos")
-        os.makedirs(output_dir, exist_ok=True)
-        output_path = os.path.join(output_dir, f"video_{video.id}.mp4")
-        
-        try:
-            file_path = ai_services.create_video_from_images(image_paths, output_path)
-            relative_path = file_path.replace("storage/", "").replace("storage\\", "")
-            video.file_path = relative_path
-            video.status = "approved"
-            db.commit()
-        except Exception as e:
-            video.status = "rejected"
-            db.commit()
-            return {"error": str(e)}
-        
-        return {"message": "Video created", "video_id": video.id, "project_id": project_id}
-    finally:
-        db.close()
+        ai_services.create_video_from_images(image_paths, output_path)
+        video.file_path = relative_path
+        video.status = "approved"
+        db.commit()
+    except Exception as e:
+        video.status = "rejected"
+        db.commit()
+        return {"error": str(e)}
+    
+    return {"message": "Video created", "video_id": video.id, "project_id": project_id}
 
 
 @celery_app.task
-def generate_voiceover_task(project_id: int, voiceover_id: int):
+@with_db
+def generate_voiceover_task(project_id: int, voiceover_id: int, *, db):
     """Generate voiceover for the full project script using ElevenLabs TTS with timestamps."""
-    import json as _json
-    db = SessionLocal()
     try:
         voiceover = crud.get_voiceover(db=db, voiceover_id=voiceover_id)
         if not voiceover:
             return {"error": "Voiceover record not found"}
 
-        scenes = crud.get_scenes_by_project(db=db, project_id=project_id)
-        if not scenes:
+        scene_rows = crud.get_scene_ids_and_texts(db=db, project_id=project_id)
+        if not scene_rows:
             crud.update_voiceover(db=db, voiceover_id=voiceover_id, status="error")
             return {"error": "No scenes found"}
 
-        scene_texts = [s.text for s in scenes]
-        scene_ids = [s.id for s in scenes]
-
+        scene_ids, scene_texts = zip(*scene_rows)
         full_text = " ".join(scene_texts)
 
-        audio_dir = os.path.join("storage", f"project_{project_id}", "voiceovers")
-        os.makedirs(audio_dir, exist_ok=True)
-        audio_path = os.path.join(audio_dir, f"voiceover_{voiceover_id}.mp3")
+        relative_audio = f"project_{project_id}/voiceovers/voiceover_{voiceover_id}.mp3"
+        audio_path = os.path.join(STORAGE_DIR, relative_audio)
+        ensure_dir(os.path.dirname(audio_path))
 
         tts_kwargs = {}
         if voiceover.tts_settings:
-            tts_kwargs = _json.loads(voiceover.tts_settings)
+            tts_kwargs = orjson.loads(voiceover.tts_settings)
             tts_kwargs = {k: v for k, v in tts_kwargs.items() if v is not None}
 
         try:
             alignment = ai_services.generate_full_script_speech(full_text, audio_path, **tts_kwargs)
         except Exception as e:
-            print(f"[VOICEOVER] TTS failed: {e}")
+            logger.error("[VOICEOVER] TTS failed for voiceover %s: %s", voiceover_id, e)
             crud.update_voiceover(db=db, voiceover_id=voiceover_id, status="error")
             return {"error": str(e)}
 
@@ -233,14 +406,12 @@ def generate_voiceover_task(project_id: int, voiceover_id: int):
         end_times = alignment.get("character_end_times_seconds", [])
         total_duration = max(end_times) if end_times else 0.0
 
-        relative_audio = audio_path.replace("storage/", "").replace("storage\\", "")
-
         crud.update_voiceover(
             db=db,
             voiceover_id=voiceover_id,
             audio_file_path=relative_audio,
-            alignment_data=_json.dumps(alignment),
-            scene_timings=_json.dumps(scene_timings),
+            alignment_data=orjson.dumps(alignment).decode(),
+            scene_timings=orjson.dumps(scene_timings).decode(),
             total_duration=round(total_duration, 3),
             status="ready",
         )
@@ -251,34 +422,42 @@ def generate_voiceover_task(project_id: int, voiceover_id: int):
             "total_duration": total_duration,
         }
     except Exception as e:
-        print(f"[VOICEOVER] Task error: {e}")
+        logger.error("[VOICEOVER] Task error for voiceover %s: %s", voiceover_id, e)
         try:
             crud.update_voiceover(db=db, voiceover_id=voiceover_id, status="error")
         except Exception:
             pass
         return {"error": str(e)}
-    finally:
-        db.close()
 
 
-@celery_app.task
-def render_video_task(project_id: int, voiceover_id: int):
+@celery_app.task(bind=True, soft_time_limit=RENDER_SOFT_TIME_LIMIT, time_limit=RENDER_TIME_LIMIT)
+@with_db
+def render_video_task(self, project_id: int, voiceover_id: int, *, db):
     """Render final video from voiceover + scene timings + transitions + optional captions."""
-    import json as _json
-    db = SessionLocal()
+    task_id = self.request.id
+
+    def fail(error: str):
+        render_progress.publish(project_id, "error", error=error, task_id=task_id)
+        return {"error": error}
+
+    render_progress.publish(project_id, "started", 0, task_id=task_id)
     try:
         voiceover = crud.get_voiceover(db=db, voiceover_id=voiceover_id)
         if not voiceover or voiceover.status != "ready":
-            return {"error": "Voiceover not ready"}
+            return fail("Voiceover not ready")
 
-        scenes = crud.get_scenes_by_project(db=db, project_id=project_id)
+        scenes = crud.get_scenes_with_images_by_project(db=db, project_id=project_id)
         if not scenes:
-            return {"error": "No scenes found"}
+            return fail("No scenes found")
 
         scene_map = {s.id: s for s in scenes}
-        timings = _json.loads(voiceover.scene_timings) if voiceover.scene_timings else []
+        # Approved images are normally among their scene's loaded images; any that aren't come in one query
+        images_by_id = {i.id: i for s in scenes for i in s.images}
+        missing_approved = {s.approved_image_id for s in scenes if s.approved_image_id and s.approved_image_id not in images_by_id}
+        images_by_id.update((i.id, i) for i in crud.get_images_by_ids(db=db, image_ids=list(missing_approved)))
+        timings = orjson.loads(voiceover.scene_timings) if voiceover.scene_timings else []
         if not timings:
-            return {"error": "No scene timings found"}
+            return fail("No scene timings found")
 
         scene_entries = []
         for t in timings:
@@ -287,15 +466,14 @@ def render_video_task(project_id: int, voiceover_id: int):
                 continue
 
             if scene.approved_image_id:
-                img = crud.get_image(db=db, image_id=scene.approved_image_id)
+                img = images_by_id.get(scene.approved_image_id)
             else:
-                imgs = crud.get_images_by_scene(db=db, scene_id=scene.id)
-                img = imgs[0] if imgs else None
+                img = scene.images[0] if scene.images else None
 
             if not img or not img.file_path:
                 continue
 
-            image_path = os.path.join("storage", img.file_path)
+            image_path = os.path.join(STORAGE_DIR, img.file_path)
             if not os.path.isfile(image_path):
                 continue
 
@@ -313,15 +491,14 @@ def render_video_task(project_id: int, voiceover_id: int):
             })
 
         if not scene_entries:
-            return {"error": "No valid scene images found"}
+            return fail("No valid scene images found")
 
-        audio_path = os.path.join("storage", voiceover.audio_file_path)
+        audio_path = os.path.join(STORAGE_DIR, voiceover.audio_file_path)
 
         ass_path = None
         if voiceover.captions_enabled and voiceover.alignment_data:
-            alignment = _json.loads(voiceover.alignment_data)
-            ass_dir = os.path.join("storage", f"project_{project_id}", "voiceovers")
-            ass_path = os.path.join(ass_dir, f"captions_{voiceover_id}.ass")
+            alignment = orjson.loads(voiceover.alignment_data)
+            ass_path = os.path.join(STORAGE_DIR, f"project_{project_id}", "voiceovers", f"captions_{voiceover_id}.ass")
             align = getattr(voiceover, "caption_alignment", 2)
             margin_v = getattr(voiceover, "caption_margin_v", 60)
             ai_services.generate_captions_ass(
@@ -330,9 +507,9 @@ def render_video_task(project_id: int, voiceover_id: int):
             )
 
         video = crud.create_video(db=db, project_id=project_id, voiceover_id=voiceover_id)
-        output_dir = os.path.join("storage", f"project_{project_id}", "videos")
-        os.makedirs(output_dir, exist_ok=True)
-        output_path = os.path.join(output_dir, f"video_{video.id}.mp4")
+        relative_path = f"project_{project_id}/videos/video_{video.id}.mp4"
+        output_path = os.path.join(STORAGE_DIR, relative_path)
+        ensure_dir(os.path.dirname(output_path))
 
         try:
             ai_services.create_video_with_transitions(
@@ -340,21 +517,20 @@ def render_video_task(project_id: int, voiceover_id: int):
                 audio_path=audio_path,
                 output_path=output_path,
                 ass_path=ass_path,
+                progress=lambda stage, pct: render_progress.publish(project_id, stage, pct, task_id=task_id),
             )
-            relative_path = output_path.replace("storage/", "").replace("storage\\", "")
             video.file_path = relative_path
             video.status = "approved"
             db.commit()
         except Exception as e:
-            print(f"[RENDER] Error: {e}")
+            logger.error("[RENDER] Error rendering project %s: %s", project_id, e)
             video.status = "rejected"
             db.commit()
-            return {"error": str(e)}
+            return fail(str(e))
 
+        render_progress.publish(project_id, "done", 100, video_id=video.id, task_id=task_id)
         return {"message": "Video rendered", "video_id": video.id}
     except Exception as e:
-        print(f"[RENDER] Task error: {e}")
-        return {"error": str(e)}
-    finally:
-        db.close()
+        logger.error("[RENDER] Task error for project %s: %s", project_id, e)
+        return fail(str(e))
 
@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from 'react'
 import axios from 'axios'
+import { isReadyDescription, waitForVisualDescription } from '../visualDescriptions'
 
 const API_BASE = '/api'
 
@@ -144,8 +145,9 @@ function SceneDetail({ scriptId, sceneId, onBack, onNextScene, onPrevScene, hasN
   const loadVisualDescriptions = async (sid) => {
     try {
       const response = await axios.get(`${API_BASE}/scenes/${sid}/visual-descriptions`)
-      setVisualDescriptions(response.data)
-      setCurrentDescriptionIndex(Math.max(0, response.data.length - 1))
+      const descriptions = response.data.filter(isReadyDescription)
+      setVisualDescriptions(descriptions)
+      setCurrentDescriptionIndex(Math.max(0, descriptions.length - 1))
     } catch (error) {
       console.error('Error loading visual descriptions:', error)
       setVisualDescriptions([])
@@ -235,10 +237,11 @@ function SceneDetail({ scriptId, sceneId, onBack, onNextScene, onPrevScene, hasN
     if (!scene || !iterateComments.trim()) return
     setIteratingDescription(true)
     try {
-      await axios.post(`${API_BASE}/scenes/${scene.id}/iterate-visual-description`, {
+      const response = await axios.post(`${API_BASE}/scenes/${scene.id}/iterate-visual-description`, {
         comments: iterateComments.trim(),
         current_description: editedDescription
       })
+      await waitForVisualDescription(scene.id, response.data.visual_description_id)
       setIterateComments('')
       await loadVisualDescriptions(scene.id)
       await loadData()
@@ -283,11 +286,12 @@ function SceneDetail({ scriptId, sceneId, onBack, onNextScene, onPrevScene, hasN
     if (!scene) return
     setGeneratingDescription(true)
     try {
-      await axios.post(`${API_BASE}/scenes/${scene.id}/generate-visual-description`, {
+      const response = await axios.post(`${API_BASE}/scenes/${scene.id}/generate-visual-description`, {
         instruction: descriptionInstruction.trim() || undefined
       }, {
         params: continueFromPreviousScene ? { continue_from_previous_scene: true } : {}
       })
+      await waitForVisualDescription(scene.id, response.data.visual_description_id)
       await loadVisualDescriptions(scene.id)
     } catch (error) {
       console.error('Error generating visual description:', error)
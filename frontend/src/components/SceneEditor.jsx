@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from 'react'
 import axios from 'axios'
+import { isReadyDescription, waitForVisualDescription } from '../visualDescriptions'
 
 const API_BASE = '/api'
 
@@ -92,12 +93,13 @@ function SceneEditor({ scriptId, onBack, onNext, onOpenScene }) {
   const loadVisualDescriptions = async (sceneId) => {
     try {
       const response = await axios.get(`${API_BASE}/scenes/${sceneId}/visual-descriptions`)
-      setVisualDescriptions(prev => ({ ...prev, [sceneId]: response.data }))
+      const descriptions = response.data.filter(isReadyDescription)
+      setVisualDescriptions(prev => ({ ...prev, [sceneId]: descriptions }))
       // If we have descriptions and no current index set, default to newest (last in list)
-      if (response.data.length > 0 && currentDescriptionIndex[sceneId] === undefined) {
-        setCurrentDescriptionIndex(prev => ({ ...prev, [sceneId]: response.data.length - 1 }))
+      if (descriptions.length > 0 && currentDescriptionIndex[sceneId] === undefined) {
+        setCurrentDescriptionIndex(prev => ({ ...prev, [sceneId]: descriptions.length - 1 }))
       }
-      return response.data
+      return descriptions
     } catch (error) {
       console.error('Error loading scene descriptions:', error)
       setVisualDescriptions(prev => ({ ...prev, [sceneId]: [] }))
@@ -233,11 +235,12 @@ function SceneEditor({ scriptId, onBack, onNext, onOpenScene }) {
   const handleGenerateVisualDescription = async (sceneId) => {
     try {
       setGeneratingDescriptions({ ...generatingDescriptions, [sceneId]: true })
-      await axios.post(`${API_BASE}/scenes/${sceneId}/generate-visual-description`, {
+      const response = await axios.post(`${API_BASE}/scenes/${sceneId}/generate-visual-description`, {
         instruction: descriptionInstruction.trim() || undefined
       }, {
         params: continueFromPreviousScene ? { continue_from_previous_scene: true } : {}
       })
+      await waitForVisualDescription(sceneId, response.data.visual_description_id)
       // Reload scenes and visual descriptions
       await loadScenes()
       const descriptions = await loadVisualDescriptions(sceneId)
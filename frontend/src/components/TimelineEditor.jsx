@@ -10,6 +10,7 @@ const PX_PER_SECOND_MIN = 40
 const PX_PER_SECOND_MAX = 300
 const IMAGE_ROW_HEIGHT = 140
 const CAPTION_ROW_HEIGHT = 52
+const CAPTION_SAVE_DELAY_MS = 300
 
 function TimelineEditor({
   projectId,
@@ -277,7 +278,21 @@ function TimelineEditor({
     setTimeout(() => saveTimings(), 0)
   }
 
-  const saveCaptionSettings = async (overrides = {}) => {
+  // Rapid toggles/drags within CAPTION_SAVE_DELAY_MS are merged into one PUT with the latest values
+  const pendingCaptionOverridesRef = useRef({})
+  const captionSaveTimerRef = useRef(null)
+
+  const saveCaptionSettings = (overrides = {}) => {
+    pendingCaptionOverridesRef.current = { ...pendingCaptionOverridesRef.current, ...overrides }
+    clearTimeout(captionSaveTimerRef.current)
+    captionSaveTimerRef.current = setTimeout(() => {
+      const merged = pendingCaptionOverridesRef.current
+      pendingCaptionOverridesRef.current = {}
+      sendCaptionSettings(merged)
+    }, CAPTION_SAVE_DELAY_MS)
+  }
+
+  const sendCaptionSettings = async (overrides) => {
     setSavingCaptions(true)
     try {
       const payload = {
@@ -295,20 +310,20 @@ function TimelineEditor({
     }
   }
 
-  const handleCaptionsToggle = async (enabled) => {
+  const handleCaptionsToggle = (enabled) => {
     setCaptionsEnabled(enabled)
-    await saveCaptionSettings({ captions_enabled: enabled })
+    saveCaptionSettings({ captions_enabled: enabled })
   }
 
-  const handleCaptionStyleChange = async (style) => {
+  const handleCaptionStyleChange = (style) => {
     setCaptionStyle(style)
-    await saveCaptionSettings({ caption_style: style })
+    saveCaptionSettings({ caption_style: style })
   }
 
-  const handleCaptionPositionChange = async (alignment, marginV) => {
+  const handleCaptionPositionChange = (alignment, marginV) => {
     if (alignment != null) setCaptionAlignment(alignment)
     if (marginV != null) setCaptionMarginV(marginV)
-    await saveCaptionSettings({
+    saveCaptionSettings({
       ...(alignment != null && { caption_alignment: alignment }),
       ...(marginV != null && { caption_margin_v: marginV }),
     })
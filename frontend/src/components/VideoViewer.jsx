@@ -9,13 +9,16 @@ function VideoViewer({ scriptId, onBack }) {
   const [video, setVideo] = useState(null)
   const [error, setError] = useState(null)
   const [playbackSpeed, setPlaybackSpeed] = useState(1.0)
+  const [renderProgress, setRenderProgress] = useState(null)
   const pollRef = useRef(null)
+  const streamRef = useRef(null)
   const videoRef = useRef(null)
 
   useEffect(() => {
     loadInitialState()
     return () => {
       if (pollRef.current) clearInterval(pollRef.current)
+      if (streamRef.current) streamRef.current.close()
     }
   }, [scriptId])
 
@@ -56,11 +59,12 @@ function VideoViewer({ scriptId, onBack }) {
     if (!voiceover) return
     setError(null)
     setStep('rendering')
+    setRenderProgress(null)
     try {
-      await axios.post(`${API_BASE}/projects/${scriptId}/render-video`, {
+      const resp = await axios.post(`${API_BASE}/projects/${scriptId}/render-video`, {
         voiceover_id: voiceover.id,
       })
-      startPollingVideo()
+      followRenderProgress(resp.data.task_id)
     } catch (err) {
       console.error('Error starting render:', err)
       setError('Failed to start video render')
@@ -68,6 +72,39 @@ function VideoViewer({ scriptId, onBack }) {
     }
   }
 
+  // Progress pushed over server-sent events; falls back to polling if the stream can't be opened
+  const followRenderProgress = (taskId) => {
+    if (streamRef.current) streamRef.current.close()
+    const source = new EventSource(`${API_BASE}/projects/${scriptId}/render/stream`)
+    streamRef.current = source
+    source.onmessage = async (event) => {
+      const msg = JSON.parse(event.data)
+      if (taskId && msg.task_id && msg.task_id !== taskId) return
+      setRenderProgress(msg)
+      if (msg.stage === 'done') {
+        source.close()
+        streamRef.current = null
+        try {
+          const resp = await axios.get(`${API_BASE}/projects/${scriptId}/video`)
+          setVideo(resp.data)
+          setStep('video_ready')
+        } catch {
+          startPollingVideo()
+        }
+      } else if (msg.stage === 'error') {
+        source.close()
+        streamRef.current = null
+        setError(`Video render failed: ${msg.error || 'unknown error'}`)
+        setStep('ready_to_render')
+      }
+    }
+    source.onerror = () => {
+      source.close()
+      streamRef.current = null
+      startPollingVideo()
+    }
+  }
+
   const startPollingVideo = () => {
     if (pollRef.current) clearInterval(pollRef.current)
     pollRef.current = setInterval(async () => {
@@ -191,6 +228,11 @@ function VideoViewer({ scriptId, onBack }) {
           <p style={{ color: 'var(--text-muted)', fontSize: '13px' }}>
             Assembling slideshow with voiceover, transitions, and captions. This may take a few minutes.
           </p>
+          {renderProgress && renderProgress.pct != null && (
+            <p style={{ color: 'var(--text-muted)', fontSize: '13px', marginTop: '8px' }}>
+              {renderProgress.stage} — {Math.round(renderProgress.pct)}%
+            </p>
+          )}
           <style>{`@keyframes spin { to { transform: rotate(360deg); } }`}</style>
         </div>
       )}
@@ -0,0 +1,18 @@
+import axios from 'axios'
+
+const API_BASE = '/api'
+
+// Scene descriptions are written by a Celery worker: poll until the pending entry is ready or has failed
+export const waitForVisualDescription = async (sceneId, visualDescriptionId) => {
+  const deadline = Date.now() + 300000
+  while (Date.now() < deadline) {
+    await new Promise(resolve => setTimeout(resolve, 2000))
+    const response = await axios.get(`${API_BASE}/scenes/${sceneId}/visual-descriptions`)
+    const desc = response.data.find(d => d.id === visualDescriptionId)
+    if (!desc || desc.status === 'error') throw new Error('Scene description generation failed')
+    if (desc.status !== 'pending') return desc
+  }
+  throw new Error('Scene description generation is taking longer than expected. Refresh to check status.')
+}
+
+export const isReadyDescription = (d) => d.status !== 'pending' && d.status !== 'error'
@@ -35,7 +35,7 @@ echo Starting FastAPI backend...
 start "Backend" cmd /k "uvicorn backend.main:app --reload --port 8000"
 
 echo Starting Celery worker...
-start "Celery Worker" cmd /k "celery -A backend.celery_worker worker --loglevel=info --pool=solo"
+start "Celery Worker" cmd /k "celery -A backend.celery_worker worker -Q celery,render --loglevel=info --pool=solo"
 
 echo Starting React frontend...
 start "Frontend" cmd /k "cd frontend && npm run dev"
@@ -78,10 +78,10 @@ fi
 
 if [[ "$IS_WINDOWS" == "true" ]]; then
     echo "Detected Windows - using solo pool (Windows doesn't support prefork)"
-    python -m celery -A backend.celery_worker worker --loglevel=info --pool=solo &
+    python -m celery -A backend.celery_worker worker -Q celery,render --loglevel=info --pool=solo &
 else
     echo "Detected Unix-like system - using prefork pool with concurrency=2"
-    python -m celery -A backend.celery_worker worker --loglevel=info --concurrency=2 &
+    python -m celery -A backend.celery_worker worker -Q celery,render --loglevel=info --concurrency=2 &
 fi
 CELERY_PID=$!
 
@@ -0,0 +1,30 @@
+"""
+Test environment: a throwaway working directory (storage/ is created relative to it), a SQLite file
+database, and a Redis URL nothing listens on, so the response cache runs in its fallback mode.
+Set in pytest_configure, before test modules import the backend: database.py and cache.py read
+them at import.
+"""
+import os
+import tempfile
+
+import pytest
+
+
+def pytest_configure(config):
+    workdir = tempfile.mkdtemp(prefix="video_creator_tests_")
+    os.chdir(workdir)
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'test.db')}"
+    os.environ["REDIS_URL"] = "redis://127.0.0.1:1/0"
+    os.environ["LLM_CACHE_TTL"] = "0"
+    os.environ["SEMANTIC_CACHE_THRESHOLD"] = "0"
+
+
+@pytest.fixture
+def db():
+    """A Session on the test database, with all tables created."""
+    from backend.database import Base, SessionLocal, engine
+
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    yield session
+    session.close()
@@ -0,0 +1,15 @@
+from fastapi.testclient import TestClient
+
+from backend import main
+
+
+def test_created_at_serializes_the_same_on_create_and_read(db):
+    client = TestClient(main.app)
+
+    created = client.post("/api/projects", json={"title": "Timestamps", "script_content": "One scene."}).json()
+    fetched = client.get(f"/api/projects/{created['id']}").json()
+    listed = next(p for p in client.get("/api/projects").json() if p["id"] == created["id"])
+
+    assert created["created_at"].endswith("Z")
+    assert fetched["created_at"] == created["created_at"]
+    assert listed["created_at"] == created["created_at"]
@@ -0,0 +1,85 @@
+from fastapi.testclient import TestClient
+
+from backend import main, models
+
+
+def _scene_with_images(db, count, visual_style_id=None):
+    project = models.Project(script_content="One scene.")
+    db.add(project)
+    db.flush()
+    scene = models.Scene(project_id=project.id, text="One scene.", order=1)
+    db.add(scene)
+    db.flush()
+    images = [
+        models.Image(scene_id=scene.id, prompt=f"take {i}", visual_style_id=visual_style_id) for i in range(count)
+    ]
+    db.add_all(images)
+    db.commit()
+    return scene, images
+
+
+def test_bulk_approve_returns_only_matched_ids_and_last_image_wins(db):
+    scene, (first, second) = _scene_with_images(db, 2)
+    other_scene, (other,) = _scene_with_images(db, 1)
+    unknown_id = other.id + 1000
+
+    response = TestClient(main.app).post(
+        "/api/images/bulk-approve", json={"ids": [second.id, unknown_id, other.id, first.id]}
+    )
+
+    assert response.status_code == 200
+    assert sorted(response.json()["updated_ids"]) == sorted([first.id, second.id, other.id])
+    db.expire_all()
+    assert {image.status for image in (first, second, other)} == {models.Status.APPROVED.value}
+    assert scene.approved_image_id == first.id  # listed after second, so it wins
+    assert other_scene.approved_image_id == other.id
+
+
+def test_bulk_approve_with_only_unknown_ids_changes_nothing(db):
+    response = TestClient(main.app).post("/api/images/bulk-approve", json={"ids": [987654]})
+
+    assert response.status_code == 200
+    assert response.json() == {"updated_ids": []}
+
+
+def test_bulk_reject_dispatches_one_group_for_matched_images(db, monkeypatch):
+    style = models.VisualStyle(name="ink", description="Ink wash")
+    override = models.VisualStyle(name="pastel", description="Soft pastel")
+    db.add_all([style, override])
+    db.commit()
+    scene, (first, second) = _scene_with_images(db, 2, visual_style_id=style.id)
+    unknown_id = second.id + 1000
+
+    groups = []
+
+    class FakeGroup:
+        def __init__(self, signatures):
+            self.signatures = list(signatures)
+            self.applied = False
+            groups.append(self)
+
+        def apply_async(self):
+            self.applied = True
+
+    monkeypatch.setattr(main, "group", FakeGroup)
+    client = TestClient(main.app)
+
+    response = client.post("/api/images/bulk-reject", json={"ids": [first.id, unknown_id, second.id]})
+
+    assert response.status_code == 200
+    assert sorted(response.json()["updated_ids"]) == sorted([first.id, second.id])
+    [dispatched] = groups
+    assert dispatched.applied
+    assert sorted(sig.args for sig in dispatched.signatures) == [(scene.id, style.id), (scene.id, style.id)]
+    db.expire_all()
+    assert {first.status, second.status} == {models.Status.REJECTED.value}
+
+    groups.clear()
+    client.post("/api/images/bulk-reject", json={"ids": [first.id], "visual_style_id": override.id})
+    [dispatched] = groups
+    assert [sig.args for sig in dispatched.signatures] == [(scene.id, override.id)]
+
+    groups.clear()
+    response = client.post("/api/images/bulk-reject", json={"ids": [unknown_id]})
+    assert response.json() == {"updated_ids": []}
+    assert groups == []
@@ -0,0 +1,32 @@
+import asyncio
+import threading
+
+from backend import cache, crud, models
+from backend.database import get_async_sessionmaker
+
+
+def test_async_commit_bumps_written_tables_off_the_event_loop(db, monkeypatch):
+    bumps = []
+    monkeypatch.setattr(cache, "bump", lambda *tables: bumps.append((set(tables), threading.get_ident())))
+
+    async def create_prompt():
+        async with get_async_sessionmaker()() as session:
+            prompt = await crud.acreate(session, models.ScriptPrompt, {"name": "Calm", "script_description": "Slow"})
+            return prompt, threading.get_ident()
+
+    prompt, loop_thread = asyncio.run(create_prompt())
+
+    assert prompt.id is not None
+    [(tables, bump_thread)] = bumps
+    assert tables == {"script_prompts"}
+    assert bump_thread != loop_thread
+
+
+def test_sync_commit_still_bumps_inline(db, monkeypatch):
+    bumps = []
+    monkeypatch.setattr(cache, "bump", lambda *tables: bumps.append(set(tables)))
+
+    db.add(models.ScriptPrompt(name="Bold", script_description="Fast"))
+    db.commit()
+
+    assert bumps == [{"script_prompts"}]
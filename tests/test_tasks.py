@@ -0,0 +1,32 @@
+from backend import ai_services, models, tasks
+from backend.database import engine
+
+
+def test_scene_description_task_holds_no_connection_during_llm_call(db, monkeypatch):
+    style = models.SceneStyle(name="noir", description="Film noir", parameters='{"lighting": "low-key"}')
+    project = models.Project(script_content="First. Second.")
+    db.add_all([style, project])
+    db.flush()
+    previous = models.Scene(project_id=project.id, text="First.", order=1, visual_description="A dark alley")
+    scene = models.Scene(project_id=project.id, text="Second.", order=2, scene_style_id=style.id)
+    db.add_all([previous, scene])
+    db.flush()
+    pending = models.VisualDescription(scene_id=scene.id, description="", status="pending")
+    db.add(pending)
+    db.commit()
+
+    calls = []
+
+    def fake_generate(scene_text, **kwargs):
+        calls.append((engine.pool.checkedout(), scene_text, kwargs))
+        return "A rainy street"
+
+    monkeypatch.setattr(ai_services, "generate_scene_description", fake_generate)
+    result = tasks.generate_scene_description_task(pending.id, continue_from_previous_scene=True)
+
+    assert result["visual_description_id"] == pending.id
+    [(checked_out, scene_text, kwargs)] = calls
+    assert checked_out == 0
+    assert scene_text == "Second."
+    assert kwargs["scene_style_description"] == "Film noir"
+    assert kwargs["previous_scene_description"] == "A dark alley"